@@ -76,6 +76,8 @@ from datalad.support.extensions import register_config  # noqa: E402
 from datalad_next.constraints import (  # noqa: E402
     EnsureBool,
     EnsureChoice,
+    EnsureFloat,
+    EnsureInt,
 )
 
 register_config(
@@ -112,6 +114,135 @@ register_config(
     default='raise-early',
     dialog='question',
 )
+register_config(
+    'datalad.annexremote.async-jobs',
+    'Maximum number of concurrent jobs of a special remote process',
+    description='DataLad special remotes whose implementation declares '
+    'support for concurrent requests use the ASYNC extension of '
+    'the git-annex external special remote protocol. With it, a single '
+    'special remote process handles all concurrent jobs (e.g., '
+    '`git annex get -J8`). This setting limits the number of jobs that are '
+    'processed concurrently, additional jobs are queued. A value of 0 '
+    'disables the ASYNC extension, and git-annex will start one special '
+    'remote process per job.',
+    type=EnsureInt(),
+    default=8,
+)
+register_config(
+    'datalad.download.jobs-per-host',
+    'Maximum number of concurrent downloads from the same host',
+    description='With concurrent downloads (e.g., `datalad download -J8`), '
+    'no more than this number of downloads from the same host are '
+    'performed at the same time.',
+    type=EnsureInt(),
+    default=4,
+)
+register_config(
+    'datalad.http.pool-maxsize',
+    'Number of connections kept alive per host for HTTP(S) access',
+    description='HTTP(S) URL operations reuse established connections for '
+    'subsequent requests to the same host. This setting limits the number '
+    'of connections per host that are kept for reuse.',
+    type=EnsureInt(),
+    default=10,
+)
+register_config(
+    'datalad.http.retries',
+    'Number of retries for failed HTTP(S) requests',
+    description='HTTP(S) requests that fail due to connection errors, or '
+    'temporary server-side issues (status 429, 502, 503, 504), are retried '
+    'up to this number of times. A value of 0 disables retries.',
+    type=EnsureInt(),
+    default=3,
+)
+register_config(
+    'datalad.http.retry-backoff',
+    'Backoff factor for retrying failed HTTP(S) requests',
+    description='Retries of failed HTTP(S) requests are delayed '
+    'exponentially, by this factor times 2 to the power of the number of '
+    'preceding retries (in seconds). A `Retry-After` header reported by a '
+    'server takes precedence.',
+    type=EnsureFloat(),
+    default=0.5,
+)
+register_config(
+    'datalad.http.download-segments',
+    'Number of concurrent segments for large HTTP(S) downloads',
+    description='Downloads from servers that support range requests are '
+    'split into this number of segments, which are downloaded concurrently '
+    'via separate connections. This only applies to downloads of at least '
+    '`datalad.http.segment-threshold` bytes. A value of 1 disables '
+    'segmented downloads.',
+    type=EnsureInt(),
+    default=4,
+)
+register_config(
+    'datalad.http.segment-threshold',
+    'Minimum size of HTTP(S) downloads to split into segments',
+    description='Downloads smaller than this size (in bytes) are always '
+    'performed via a single connection. See '
+    '`datalad.http.download-segments`.',
+    type=EnsureInt(),
+    default=64 * 1024 ** 2,
+)
+register_config(
+    'datalad.http.async-connections-per-host',
+    'Maximum number of concurrent connections per host for asynchronous '
+    'HTTP(S) access',
+    description='Asynchronous HTTP(S) URL operations (see '
+    '`datalad_next.url_operations.aio`) open no more than this number of '
+    'connections to the same host. Additional operations wait for a '
+    'connection to become available.',
+    type=EnsureInt(),
+    default=16,
+)
+register_config(
+    'datalad.ssh.shells-per-host',
+    'Maximum number of concurrent SSH connections per host',
+    description='SSH URL operations keep persistent remote shells open for '
+    'reuse by subsequent operations. Concurrent operations on the same host '
+    '(e.g., with `datalad download -J8`) each use a separate shell. This '
+    'setting limits the number of shells per host, additional operations '
+    'wait for a shell to become idle.',
+    type=EnsureInt(),
+    default=4,
+)
+register_config(
+    'datalad.ssh.hash-jobs',
+    'Number of parallel hashing processes on SSH hosts',
+    description='Content hashes of files on SSH-accessible hosts (e.g., '
+    'with `datalad ls-file-collection --hash md5 ssh-directory ...`) are '
+    'computed on the remote host. This setting determines how many files '
+    'are hashed in parallel.',
+    type=EnsureInt(),
+    default=1,
+)
+register_config(
+    'datalad.ssh.compression',
+    'Compression of SSH transfers',
+    description='If enabled, content downloaded or uploaded via SSH URL '
+    'operations is compressed on the sending side, and decompressed on the '
+    'receiving side. This can increase throughput for compressible data on '
+    'slow connections. `auto` selects the best method supported by the '
+    'remote host. `zstd` requires the `zstandard` Python package (install '
+    'with the `zstdsupport` extra). A '
+    'setting for a particular host can be made with '
+    '`datalad.ssh.<hostname>.compression`, which takes precedence.',
+    type=EnsureChoice('none', 'auto', 'zstd', 'gzip'),
+    default='none',
+)
+register_config(
+    'datalad.ssh.delta-upload',
+    'Upload only changed parts of files via SSH',
+    description='If enabled, an upload via SSH URL operations that replaces '
+    'an existing file compares the file with the existing one blockwise, '
+    'and only transfers blocks that differ. The remote host must provide '
+    'GNU `split` and `md5sum`, otherwise the whole file is transferred. A '
+    'setting for a particular host can be made with '
+    '`datalad.ssh.<hostname>.delta-upload`, which takes precedence.',
+    type=EnsureBool(),
+    default=False,
+)
 register_config(
     'datalad.archivist.legacy-mode',
     'Fall back on legacy ``datalad-archives`` special remote implementation?',
@@ -127,3 +258,44 @@ register_config(
     default=False,
     dialog='yesno',
 )
+register_config(
+    'datalad.archivist.staging-size',
+    'Storage budget for staging archive members during bulk extraction',
+    description='Maximum amount of storage (in bytes) the `archivist` '
+    'special remote may use for staging archive members that are '
+    'extracted during a sequential pass through a TAR archive, in order '
+    'to serve subsequent requests without another pass. A value of 0 '
+    'disables staging.',
+    type=EnsureInt(),
+    default=1024 ** 3,
+)
+register_config(
+    'datalad.archivist.cache-size',
+    'Storage budget for archives downloaded by the `archivist` special remote',
+    description='Maximum amount of storage (in bytes) occupied by archives '
+    'that the `archivist` special remote had to download in order to '
+    'extract members from them. When exceeded, downloaded archives are '
+    'dropped again according to `datalad.archivist.cache-policy`. Archives '
+    'that were present locally before are never dropped. If not set, '
+    'downloaded archives are kept.',
+    type=EnsureInt(),
+)
+register_config(
+    'datalad.archivist.cache-policy',
+    'Eviction policy for archives downloaded by the `archivist` special remote',
+    description='Order in which downloaded archives are dropped when '
+    '`datalad.archivist.cache-size` is exceeded. `lru` drops the least '
+    'recently used archives first, `lfu` the least frequently used ones.',
+    type=EnsureChoice('lru', 'lfu'),
+    default='lru',
+)
+register_config(
+    'datalad.archivist.presence-ttl',
+    'Time to reuse archive presence checks of the `archivist` special remote',
+    description='Time (in seconds) for which the `archivist` special remote '
+    'reuses the outcome of a presence check for an archive key, when '
+    'checking the presence of other keys contained in the same archive. '
+    'A value of 0 disables reuse.',
+    type=EnsureInt(),
+    default=300,
+)
@@ -10,13 +10,26 @@ from datalad.customremotes import (
     RemoteError,
     SpecialRemote as _SpecialRemote,
 )
-from datalad.customremotes.main import main as super_main
 
 from datalad_next.datasets import LeanAnnexRepo
 
+from .asyncmaster import main as super_main
+
 
 class SpecialRemote(_SpecialRemote):
-    """Base class of all datalad-next git-annex special remotes"""
+    """Base class of all datalad-next git-annex special remotes
+
+    Special remotes run via ``super_main()`` can support the ``ASYNC``
+    extension of the git-annex external special remote protocol. Requests of
+    concurrent git-annex jobs are then processed in a thread pool within a
+    single special remote process (see
+    :mod:`~datalad_next.annexremotes.asyncmaster`). Only implementations
+    whose request handlers are safe to run concurrently may opt in, by
+    setting ``supports_async = True``.
+    """
+    supports_async = False
+    """Whether requests can be processed concurrently"""
+
     def __init__(self, annex):
         super(SpecialRemote, self).__init__(annex=annex)
 
@@ -14,27 +14,32 @@ from __future__ import annotations
 #     placed at its standard location in the local annex. Any archive member
 #     will be extracted from this local copy.
 #
-# Some ideas on optional additional cache modes related to dropping as much as
-# possible after the special remote is done. However, these modes also come
-# with potential issues re parallel access (what if another remote process
-# is still using a particular archive... Think about that when there is a
-# real need
-#
-#  ``keep-downloads``
-#    No caching will be performed per se. However, when archive member access
-#    happens to require a full archive download, a downloaded archive will
-#    not be removed after member extraction. In such cases, this mode will
-#    behave like ``persistent-whole``.
-#
-#  ``none``
-#    This is behaving like ``keep-downloads``, but any downloaded archive
-#    will be dropped again after extraction is complete.
-
+# Retention of archives that had to be downloaded is controlled via
+# `datalad.archivist.cache-size` (see `_ArchiveCache`). An unset budget
+# corresponds to a ``keep-downloads`` mode, a budget of zero drops any
+# downloaded archive as soon as it is no longer needed.
+
+import json
+import logging
+import os
+import socket
+import tarfile
+import time
+from collections import Counter
 from collections.abc import Iterable
+from contextlib import contextmanager
 from dataclasses import dataclass
 
-from pathlib import Path
-from shutil import copyfileobj
+from pathlib import (
+    Path,
+    PurePosixPath,
+)
+from shutil import (
+    copyfileobj,
+    move,
+    rmtree,
+)
+from tempfile import mkdtemp
 from typing import (
     Dict,
     Generator,
@@ -42,7 +47,10 @@ from typing import (
     Tuple,
 )
 
+from fasteners import InterProcessLock
+
 from datalad_next.archive_operations import ArchiveOperations
+from datalad_next.consts import on_windows
 
 # we intentionally limit ourselves to the most basic interface
 # and even that we only need to get a `ConfigManager` instance.
@@ -50,7 +58,11 @@ from datalad_next.archive_operations import ArchiveOperations
 # avoid it entirely
 from datalad_next.datasets import LegacyAnnexRepo
 
-from datalad_next.exceptions import CommandError
+from datalad_next.exceptions import (
+    CapturedException,
+    CommandError,
+)
+from datalad_next.runners import call_git_lines
 from datalad_next.types import (
     AnnexKey,
     ArchivistLocator,
@@ -64,6 +76,8 @@ from . import (
     super_main
 )
 
+lgr = logging.getLogger('datalad.ext.next.annexremotes.archivist')
+
 
 class ArchivistRemote(SpecialRemote):
     """git-annex special remote *archivist* for obtaining files from archives
@@ -97,6 +111,32 @@ class ArchivistRemote(SpecialRemote):
       can be prohibitive for datasets tracking large amount of data
       (in archive files).
 
+    `datalad.archivist.staging-size=<bytes>`
+      Maximum amount of storage (in bytes) that may be used for staging
+      extracted archive members during a bulk extraction pass (see
+      *TRANSFER RETRIEVE* below). Default: 1 GiB. A value of ``0`` disables
+      staging, sequential passes will then only serve requests that arrive
+      in archive order.
+
+    `datalad.archivist.cache-size=<bytes>`
+      Maximum amount of storage (in bytes) occupied by archives that had to
+      be downloaded to extract members from them. Whenever this budget is
+      exceeded, downloaded archives are dropped from the local annex again,
+      least recently used archives first. Archives with pending requests
+      are never dropped, and archives that were already present locally
+      are never considered. Bookkeeping is shared across all invocations of
+      the special remote in a repository. Default: no limit.
+
+    `datalad.archivist.cache-policy=[lru]|lfu`
+      Eviction policy for downloaded archives. ``lru`` drops the least
+      recently used archives first, ``lfu`` drops the least frequently used
+      archives first.
+
+    `datalad.archivist.presence-ttl=<seconds>`
+      Time (in seconds) for which the outcome of an archive presence check
+      (see *CHECKPRESENT* below) is reused for other keys contained in the
+      same archive. Default: 300. A value of ``0`` disables reuse.
+
 
     Implementation details
     ----------------------
@@ -118,11 +158,44 @@ class ArchivistRemote(SpecialRemote):
     completely in order to verify a matching archive member.  Moreover, an
     archive might also reference another archive as a source, leading to a
     multiplication of transfer demands.
+
+    Presence checks for archive keys are cached for the lifetime of the
+    special remote process (limited by ``datalad.archivist.presence-ttl``).
+    Any archive keys that need checking are queried with a single batched
+    git-annex call. Checking a large number of keys contained in a small
+    number of archives (e.g., ``git annex fsck --fast --from archivist``)
+    therefore only requires a few actual presence checks.
+
+
+    *TRANSFER RETRIEVE*
+
+    Archives that are available locally are always used first. A ZIP archive
+    that is not available locally, but has a registered ``http(s)://`` URL
+    on a server supporting HTTP range requests, is accessed directly on
+    that server. Only the archive's central directory and the requested
+    member are transferred in this case. Any other archive is downloaded
+    completely (via ``git annex get``) before member extraction.
+
+    Random access to members of compressed TAR archives is expensive, each
+    extraction requires decompressing the archive up to the member
+    location. When consecutive requests target the same (locally available)
+    TAR archive, as is typical for ``git annex get <directory>``, a single
+    sequential pass through the archive is started instead. Any member that
+    is passed on the way to a requested one is extracted into a staging area
+    (bounded by ``datalad.archivist.staging-size``), and subsequent requests
+    are served from there, or by continuing the same pass. The staging
+    area is removed when the special remote process ends.
     """
     def __init__(self, annex):
         super().__init__(annex)
         # central archive handler cache, initialized on-prepare
         self._ahandlers = None
+        # planner for sequential bulk extraction, initialized on-prepare
+        self._bulk = None
+        # retention of downloaded archives, initialized on-prepare
+        self._acache = None
+        # archive key presence cache, initialized on-prepare
+        self._apresence = None
         # a potential instance of the legacy datalad-archives implementation
         self._legacy_special_remote = None
 
@@ -145,6 +218,19 @@ class ArchivistRemote(SpecialRemote):
 
         return getattr(lsr, name)
 
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        bulk = SpecialRemote.__getattribute__(self, '_bulk')
+        if bulk is not None:
+            bulk.close()
+            self._bulk = None
+        acache = SpecialRemote.__getattribute__(self, '_acache')
+        if acache is not None:
+            acache.close()
+            self._acache = None
+
     def initremote(self):
         """This method does nothing, because the special remote requires no
         particular setup.
@@ -182,13 +268,25 @@ class ArchivistRemote(SpecialRemote):
             self._legacy_special_remote = lsr
             return
 
-        # central archive key handler coordination
-        self._ahandlers = _ArchiveHandlers(
+        cache_size = self.get_remote_gitcfg('archivist', 'cache-size')
+        self._acache = _ArchiveCache(
+            self.repo,
+            budget=None if cache_size is None else int(cache_size),
+            policy=self.get_remote_gitcfg(
+                'archivist', 'cache-policy', default='lru').lower(),
+        )
+        self._apresence = _ArchivePresence(
             self.repo,
-            # TODO
-            #cache_mode=self._getcfg(
-            #    'archive-cache-mode',
-            #    default='').lower(),
+            ttl=int(self.get_remote_gitcfg(
+                'archivist', 'presence-ttl', default=300)),
+        )
+        # central archive key handler coordination
+        self._ahandlers = _ArchiveHandlers(self.repo, cache=self._acache)
+        self._bulk = _BulkExtractionPlanner(
+            self.repo.dot_git / 'annex' / 'tmp',
+            budget=int(self.get_remote_gitcfg(
+                'archivist', 'staging-size', default=1024 ** 3)),
+            cache=self._acache,
         )
 
     def claimurl(self, url: str) -> bool:
@@ -262,34 +360,18 @@ class ArchivistRemote(SpecialRemote):
             str(ArchivistLocator.from_str(url).akey)
             for url in self._get_key_dlarchive_urls(key)
         )
-        # As with transfer_retrieve blindly checking akeys in arbitrary
-        # order is stupid. We should again sort by (local) availability.
-        # if we have an archive locally we can check faster, we could check
-        # more precisely (actually look into it).
-        # We only need to find one archive with a hit, if we search clever
-        # we can exit earlier.
-        # So let's do a two-pass approach, first check local availability
-        # for any archive key, and only if that does not find us an archive
-        # go for the remotes
-        if any(_get_key_contentpath(self.repo, akey) for akey in akeys):
-            # any one is good enough
+        # any archive key (local or remote) is good enough. The presence
+        # cache reuses outcomes, such that members of the same archive
+        # do not trigger repeated checks
+        if self._apresence.any_present(akeys):
             # TODO here we could actually look into the archive and
             # verify member presence without relatively little cost
             return True
 
-        for akey in akeys:
-            # we leave all checking logic to git-annex
-            try:
-                # if it exits clean, the key is still present at at least one
-                # remote
-                self.repo.call_annex(['checkpresentkey', akey])
-                return True
-            except CommandError:
-                self.message(
-                    f'Archive key candidate {akey} for key {key} '
-                    'not present in any known remote or here',
-                    type='debug')
-
+        self.message(
+            f'No archive key candidate {sorted(akeys)} for key {key} '
+            'present in any known remote or here',
+            type='debug')
         # when we end up here, we have tried all known archives keys and
         # found none to be present in any known location
         return False
@@ -305,15 +387,57 @@ class ArchivistRemote(SpecialRemote):
         Depending on the archive availability and type, archives may need
         to be retrieved from remote sources.
         """
+        all_locs = [
+            ArchivistLocator.from_str(url)
+            for url in self._get_key_dlarchive_urls(key)
+        ]
+        akeys = set(loc.akey for loc in all_locs)
+        # archives with a pending request must not be evicted
+        for akey in akeys:
+            self._acache.pin(akey)
+        try:
+            self._retrieve_member(key, all_locs, Path(localfilename))
+        finally:
+            for akey in akeys:
+                self._acache.unpin(akey)
+            for akey in self._acache.evict():
+                self._ahandlers.forget(akey)
+
+    def transfer_store(self, key: str, filename: str):
+        """Raises ``UnsupportedRequest``. This operation is not supported."""
+        raise UnsupportedRequest('This remote cannot store content')
+
+    def remove(self, key: str):
+        """Raises ``UnsupportedRequest``. This operation is not supported."""
+        raise UnsupportedRequest('This remote cannot remove content')
+
+    #
+    # Helpers
+    #
+
+    def _retrieve_member(
+            self,
+            key: str,
+            all_locs: List[ArchivistLocator],
+            localfilename: Path,
+    ):
         # rely on from_locators() to bring the candidate archives
         # in some intelligent order to try one after the other.
         # break ASAP to prevent unnecessary processing
         msgs = []
+        # during a burst of requests against a single archive, requests
+        # are served from a sequential extraction pass
+        try:
+            if self._bulk.retrieve(all_locs, localfilename):
+                self._acache.touch(self._bulk.akey)
+                return
+        except Exception as e:
+            msg = f'Failed to extract {key!r} via sequential pass: {e}'
+            self.message(msg, type='debug')
+            msgs.append(msg)
         try:
-            for handler, locs in self._ahandlers.from_locators([
-                    ArchivistLocator.from_str(url)
-                    for url in self._get_key_dlarchive_urls(key)]):
-                with Path(localfilename).open('wb') as dst_fp:
+            for handler, locs in self._ahandlers.from_locators(all_locs):
+                with localfilename.open('wb') as dst_fp:
                     for loc in locs:
                         try:
                             with handler.open(loc.member) as fp:
@@ -322,6 +446,9 @@ class ArchivistRemote(SpecialRemote):
                                 # may just be one part, there could also
                                 # be file retrieval
                                 copyfileobj(fp, dst_fp)
+                            self._bulk.observe(
+                                loc.akey, self._ahandlers.get_info(loc.akey))
+                            self._acache.touch(loc.akey)
                             return
                         except Exception as e:
                             msg = f'Failed to extract {key!r} from ' \
@@ -333,18 +460,6 @@ class ArchivistRemote(SpecialRemote):
 
         raise RemoteError(f'Could not obtain {key!r} from any archive')
 
-    def transfer_store(self, key: str, filename: str):
-        """Raises ``UnsupportedRequest``. This operation is not supported."""
-        raise UnsupportedRequest('This remote cannot store content')
-
-    def remove(self, key: str):
-        """Raises ``UnsupportedRequest``. This operation is not supported."""
-        raise UnsupportedRequest('This remote cannot remove content')
-
-    #
-    # Helpers
-    #
-
     def _get_key_dlarchive_urls(self, key):
         return self.annex.geturls(key, prefix='dl+archive:')
 
@@ -376,12 +491,13 @@ class _ArchiveHandlers:
 
     The main functionality is provided by ``from_locators()``.
     """
-    # TODO make archive access caching behavior configurable from the outside
-    def __init__(self, repo):
+    def __init__(self, repo, cache: _ArchiveCache | None = None):
         # mapping of archive keys to an info dict
         self._db: Dict[AnnexKey, _ArchiveInfo] = {}
         # for running git-annex queries against the repo
         self._repo = repo
+        # retention of downloaded archives
+        self._cache = cache
 
     def from_locators(
             self, locs: List[ArchivistLocator]
@@ -491,6 +607,16 @@ class _ArchiveHandlers:
             e.errors = exc
             raise e
 
+    def get_info(self, akey: AnnexKey) -> _ArchiveInfo | None:
+        """Return the information record for an archive key, if known"""
+        return self._db.get(akey)
+
+    def forget(self, akey: AnnexKey) -> None:
+        """Discard all information on an archive key, e.g. after a drop"""
+        ainfo = self._db.pop(akey, None)
+        if ainfo is not None and ainfo.handler is not None:
+            ainfo.handler.close()
+
     def _get_archive_info(
             self,
             akey: AnnexKey,
@@ -542,10 +668,31 @@ class _ArchiveHandlers:
             akey: AnnexKey,
             ainfo: _ArchiveInfo,
     ) -> ArchiveOperations:
-        # right now we have no remote handlers available
-        # TODO: use akey to ask the repo for URLs from which the key
-        # would be available and select a remote handler to work
-        # with that URL
+        # ZIP archives on HTTP servers can be accessed directly, without
+        # downloading them. Only the central directory and the requested
+        # members are transferred via range requests
+        if ainfo.type == ArchiveType.zip:
+            for url in _get_key_urls(self._repo, str(akey)):
+                if not url.startswith(('http://', 'https://')):
+                    continue
+                from datalad_next.archive_operations import \
+                    RemoteZipArchiveOperations
+                handler = RemoteZipArchiveOperations(
+                    url,
+                    cfg=self._repo.config,
+                )
+                try:
+                    # probe access, reads the central directory
+                    handler.zipfile
+                    return handler
+                except Exception as e:
+                    CapturedException(e)
+                    lgr.debug(
+                        'Cannot access remote archive %s at %s, '
+                        'trying alternatives', akey, url)
+                    handler.close()
+        # TODO: support remote access for other archive types, in
+        # particular tarballs on servers supporting range requests
         # instead we retrieve the archive
         res = self._repo.get(str(akey), key=True)
         # if the akey was already around, `res` could be an empty list.
@@ -557,9 +704,471 @@ class _ArchiveHandlers:
             raise RuntimeError(f'Failed to download archive key: {res!r}')
         # now we have the akey locally
         ainfo.local_path = _get_key_contentpath(self._repo, str(akey))
+        if self._cache is not None:
+            self._cache.add(akey, ainfo.local_path)
         return self._get_local_handler(ainfo)
 
 
+class _SequentialTarPass:
+    """Single forward-only pass through a (compressed) TAR archive
+
+    Members are extracted in archive order. Any member that is passed on the
+    way to a requested member is extracted into a staging directory, as long
+    as the total size of all staged members stays within a given budget.
+    """
+    def __init__(
+            self,
+            akey: AnnexKey,
+            path: Path,
+            staging_dir: Path,
+            budget: int,
+    ):
+        self.akey = akey
+        self._tar = tarfile.open(path, mode='r|*')
+        self._members = iter(self._tar)
+        self._staging_dir = staging_dir
+        self._budget = budget
+        # mapping of member names to their staged file
+        self._staged: Dict[PurePosixPath, Path] = {}
+        self._staged_size = 0
+        # counter for unique staging file names
+        self._nstaged = 0
+        # members that are behind the pass position, but were not staged
+        self._passed: set[PurePosixPath] = set()
+
+    def extract(self, member: PurePosixPath, dst: Path) -> bool:
+        """Place the content of an archive member at ``dst``
+
+        Returns ``False``, if the member cannot be provided by this pass,
+        because it was passed without being staged, or because it is not
+        contained in the archive.
+        """
+        staged = self._staged.pop(member, None)
+        if staged is not None:
+            self._staged_size -= staged.stat().st_size
+            move(staged, dst)
+            self._passed.add(member)
+            return True
+        if member in self._passed:
+            return False
+        for tinfo in self._members:
+            if not tinfo.isfile():
+                continue
+            name = PurePosixPath(tinfo.name)
+            fp = self._tar.extractfile(tinfo)
+            if fp is None:
+                # should not happen for a regular file
+                raise RuntimeError(
+                    f'Could not extract {tinfo.name!r} from archive')
+            if name == member:
+                with dst.open('wb') as dst_fp:
+                    copyfileobj(fp, dst_fp)
+                self._passed.add(member)
+                return True
+            if self._staged_size + tinfo.size > self._budget:
+                self._passed.add(name)
+                continue
+            staged = self._staging_dir / str(self._nstaged)
+            self._nstaged += 1
+            with staged.open('wb') as staged_fp:
+                copyfileobj(fp, staged_fp)
+            self._staged[name] = staged
+            self._staged_size += tinfo.size
+        return False
+
+    def has_passed(self, member: PurePosixPath) -> bool:
+        """Whether a member is behind the pass position and not staged"""
+        return member in self._passed
+
+    def close(self) -> None:
+        self._tar.close()
+        for staged in self._staged.values():
+            staged.unlink()
+        self._staged.clear()
+        self._staged_size = 0
+
+
+class _BulkExtractionPlanner:
+    """Serve bursts of requests against one TAR archive sequentially
+
+    Successful member extractions are reported via ``observe()``. Once
+    ``burst_threshold`` consecutive requests targeted the same, locally
+    available TAR archive, ``retrieve()`` serves requests for members of this
+    archive from a :class:`_SequentialTarPass`. A pass is restarted, when
+    a request targets a member that was passed, but could not be staged.
+    """
+    def __init__(
+            self,
+            tmp_root: Path,
+            budget: int,
+            burst_threshold: int = 2,
+            cache: _ArchiveCache | None = None,
+    ):
+        self._tmp_root = tmp_root
+        self._cache = cache
+        self._budget = budget
+        self._burst_threshold = burst_threshold
+        self._staging_dir: Path | None = None
+        # archive of the last successful request, and burst length
+        self._akey: AnnexKey | None = None
+        self._ainfo: _ArchiveInfo | None = None
+        self._count = 0
+        self._pass: _SequentialTarPass | None = None
+
+    @property
+    def akey(self) -> AnnexKey | None:
+        """Key of the archive targeted by the last successful request"""
+        return self._akey
+
+    def observe(self, akey: AnnexKey, ainfo: _ArchiveInfo | None) -> None:
+        """Record a successful member extraction from an archive"""
+        if akey == self._akey:
+            self._count += 1
+            return
+        self._close_pass()
+        self._akey = akey
+        self._ainfo = ainfo
+        self._count = 1
+
+    def retrieve(self, locs: Iterable[ArchivistLocator], dst: Path) -> bool:
+        """Place a requested member at ``dst`` via a sequential pass
+
+        Returns ``False``, if no pass is planned for any of the locators'
+        archives, or the member could not be extracted in this way.
+        """
+        if self._count < self._burst_threshold \
+                or self._ainfo is None \
+                or self._ainfo.type != ArchiveType.tar \
+                or self._ainfo.local_path is None:
+            return False
+        for loc in locs:
+            if loc.akey != self._akey:
+                continue
+            if self._pass is not None and self._pass.has_passed(loc.member):
+                # the member is behind the current pass position and
+                # was not staged, start over
+                self._close_pass()
+            if self._pass is None:
+                if self._cache is not None:
+                    # a burst indicates pending requests, keep the archive
+                    self._cache.pin(self._akey)
+                self._pass = _SequentialTarPass(
+                    self._akey,
+                    self._ainfo.local_path,
+                    self._get_staging_dir(),
+                    self._budget,
+                )
+            if self._pass.extract(loc.member, dst):
+                self._count += 1
+                return True
+        return False
+
+    def close(self) -> None:
+        self._close_pass()
+        if self._staging_dir is not None:
+            rmtree(self._staging_dir, ignore_errors=True)
+            self._staging_dir = None
+
+    def _close_pass(self) -> None:
+        if self._pass is not None:
+            self._pass.close()
+            if self._cache is not None:
+                self._cache.unpin(self._pass.akey)
+            self._pass = None
+
+    def _get_staging_dir(self) -> Path:
+        if self._staging_dir is None:
+            self._tmp_root.mkdir(parents=True, exist_ok=True)
+            self._staging_dir = Path(mkdtemp(
+                prefix='archivist-staging-', dir=self._tmp_root))
+        return self._staging_dir
+
+
+class _ArchiveCache:
+    """Size-bounded retention of archives downloaded by the special remote
+
+    Only archives that had to be downloaded (``add()``) are tracked. The
+    bookkeeping is stored in ``<dotgit>/datalad/archivist/cache.json``,
+    and is shared by all special remote processes operating on a repository.
+    Usage statistics are collected in memory (``touch()``) and merged into
+    the stored records when archives need to be evicted, or on ``close()``.
+
+    Eviction drops archives from the local annex (via ``git annex drop``),
+    in the order given by the eviction policy, until the total size of all
+    tracked archives no longer exceeds the budget. Archives pinned by any
+    process are never dropped. Pins are recorded in the shared bookkeeping
+    with the host name and PID of the pinning process. Pins of processes
+    that no longer run are ignored, and removed. Where this cannot be
+    determined (Windows), pins expire after ``pin_lease`` seconds.
+
+    Without a budget nothing is ever evicted, and no bookkeeping is done.
+    """
+    pin_lease = 24 * 3600
+
+    def __init__(
+            self,
+            repo: LegacyAnnexRepo,
+            budget: int | None,
+            policy: str = 'lru',
+    ):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f'Unsupported cache eviction policy {policy!r}')
+        self._repo = repo
+        self._budget = budget
+        self._policy = policy
+        cache_dir = repo.dot_git / 'datalad' / 'archivist'
+        self._state_path = cache_dir / 'cache.json'
+        self._lock_path = cache_dir / 'cache.lck'
+        # pins of this process. only the first pin and the last unpin of an
+        # archive need to be recorded in the shared bookkeeping
+        self._pins: Counter[str] = Counter()
+        self._pin_owner = \
+            f'{socket.gethostname()}:{os.getpid()}:{id(self):x}'
+        # usage statistics not yet merged into the stored records.
+        # archive key -> (last access time, number of accesses)
+        self._usage: Dict[str, Tuple[float, int]] = {}
+
+    def pin(self, akey: AnnexKey) -> None:
+        """Protect an archive from eviction, until a matching ``unpin()``"""
+        if self._budget is None:
+            return
+        self._pins[str(akey)] += 1
+        if self._pins[str(akey)] > 1:
+            return
+        with self._locked_state() as state:
+            state['pins'].setdefault(str(akey), {})[self._pin_owner] = \
+                time.time()
+
+    def unpin(self, akey: AnnexKey) -> None:
+        if self._budget is None:
+            return
+        self._pins[str(akey)] -= 1
+        if self._pins[str(akey)] > 0:
+            return
+        del self._pins[str(akey)]
+        with self._locked_state() as state:
+            self._remove_pin(state, str(akey), self._pin_owner)
+
+    def add(self, akey: AnnexKey, path: Path) -> None:
+        """Start tracking a downloaded archive"""
+        if self._budget is None:
+            return
+        size = int(akey.size) if akey.size else path.stat().st_size
+        with self._locked_state() as state:
+            state['archives'][str(akey)] = dict(
+                size=size, atime=time.time(), hits=0)
+
+    def touch(self, akey: AnnexKey | None) -> None:
+        """Record an access to an archive"""
+        if akey is None or self._budget is None:
+            return
+        _, hits = self._usage.get(str(akey), (0.0, 0))
+        self._usage[str(akey)] = (time.time(), hits + 1)
+
+    def evict(self) -> List[AnnexKey]:
+        """Drop archives until the budget is met, return the dropped keys
+
+        Nothing is done, unless the budget is exceeded.
+        """
+        if self._budget is None:
+            return []
+        dropped: List[AnnexKey] = []
+        with self._locked_state() as state:
+            archives = state['archives']
+            total = sum(rec['size'] for rec in archives.values())
+            if total <= self._budget:
+                # keep the stored state untouched
+                return dropped
+            self._merge_usage(archives)
+            pinned = self._get_pinned(state)
+            for akey in sorted(
+                    (k for k in archives if k not in pinned),
+                    key=(lambda k: archives[k]['atime'])
+                    if self._policy == 'lru'
+                    else (lambda k: (archives[k]['hits'],
+                                     archives[k]['atime'])),
+            ):
+                if total <= self._budget:
+                    break
+                try:
+                    self._repo.call_annex(['drop', '--key', akey])
+                except CommandError as e:
+                    CapturedException(e)
+                    if _get_key_contentpath(self._repo, akey):
+                        # still around, try again next time
+                        lgr.debug('Failed to drop cached archive %s', akey)
+                        continue
+                total -= archives.pop(akey)['size']
+                dropped.append(AnnexKey.from_str(akey))
+        return dropped
+
+    def close(self) -> None:
+        if self._pins or self._usage:
+            with self._locked_state() as state:
+                for akey in self._pins:
+                    self._remove_pin(state, akey, self._pin_owner)
+                self._merge_usage(state['archives'])
+            self._pins.clear()
+        self.evict()
+
+    def _merge_usage(self, archives: Dict[str, Dict]) -> None:
+        for akey, (atime, hits) in self._usage.items():
+            if akey not in archives:
+                continue
+            rec = archives[akey]
+            rec['atime'] = max(rec['atime'], atime)
+            rec['hits'] += hits
+        self._usage.clear()
+
+    def _get_pinned(self, state: Dict[str, Dict]) -> set[str]:
+        """Return archive keys with a pin of any running process
+
+        Stale pins are removed from the state.
+        """
+        hostname = socket.gethostname()
+        now = time.time()
+        pinned = set()
+        for akey, owners in list(state['pins'].items()):
+            for owner, ptime in list(owners.items()):
+                host, pid, _ = owner.rsplit(':', 2)
+                if now - ptime > self.pin_lease or (
+                        host == hostname and not _pid_exists(int(pid))):
+                    lgr.debug('Ignoring stale pin of %s by %s', akey, owner)
+                    self._remove_pin(state, akey, owner)
+                else:
+                    pinned.add(akey)
+        return pinned
+
+    @staticmethod
+    def _remove_pin(state: Dict[str, Dict], akey: str, owner: str) -> None:
+        owners = state['pins'].get(akey, {})
+        owners.pop(owner, None)
+        if not owners:
+            state['pins'].pop(akey, None)
+
+    @contextmanager
+    def _locked_state(self) -> Generator[Dict[str, Dict], None, None]:
+        """Yield the shared state, for reading and modification
+
+        The state is only written back, if it was modified.
+        """
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        with InterProcessLock(str(self._lock_path)):
+            try:
+                text = self._state_path.read_text()
+                state = json.loads(text)
+            except (FileNotFoundError, ValueError):
+                text = None
+                state = {}
+            state.setdefault('archives', {})
+            state.setdefault('pins', {})
+            yield state
+            new_text = json.dumps(state)
+            if new_text == text:
+                return
+            tmp_path = self._state_path.with_name(
+                f'{self._state_path.name}.{os.getpid()}')
+            tmp_path.write_text(new_text)
+            tmp_path.replace(self._state_path)
+
+
+class _ArchivePresence:
+    """Per-process cache of archive key presence
+
+    Local availability is checked first, and availability on any remote
+    second. Archive keys without a (still valid) cached outcome are
+    checked with one batched git-annex query per request.
+    """
+    def __init__(self, repo: LegacyAnnexRepo, ttl: int):
+        self._repo = repo
+        self._ttl = ttl
+        # archive key -> (presence, time of check)
+        self._db: Dict[str, Tuple[bool, float]] = {}
+
+    def any_present(self, akeys: Iterable[str]) -> bool:
+        """Whether any of the given archive keys is present anywhere"""
+        now = time.monotonic()
+        pending = []
+        for akey in akeys:
+            present, checked = self._db.get(akey, (False, None))
+            if checked is None or now - checked >= self._ttl:
+                pending.append(akey)
+            elif present:
+                return True
+        if not pending:
+            return False
+        presence = self._query(pending)
+        now = time.monotonic()
+        self._db.update(
+            (akey, (present, now)) for akey, present in presence.items())
+        return any(presence.values())
+
+    def _query(self, akeys: List[str]) -> Dict[str, bool]:
+        presence = dict(zip(
+            akeys,
+            (bool(loc) for loc in self._batch(['contentlocation'], akeys)),
+        ))
+        remote = [akey for akey in akeys if not presence[akey]]
+        if remote:
+            presence.update(zip(
+                remote,
+                (r == '1' for r in self._batch(['checkpresentkey'], remote)),
+            ))
+        return presence
+
+    def _batch(self, cmd: List[str], akeys: List[str]) -> List[str]:
+        try:
+            res = call_git_lines(
+                ['annex', *cmd, '--batch'],
+                cwd=self._repo.pathobj,
+                input=''.join(f'{akey}\n' for akey in akeys),
+            )
+            if len(res) == len(akeys):
+                return res
+        except CommandError as e:
+            CapturedException(e)
+        # fall back on individual queries
+        lgr.debug('Batched %s query failed, checking keys individually', cmd)
+        res = []
+        for akey in akeys:
+            try:
+                out = self._repo.call_annex_oneline([*cmd, akey])
+                # checkpresentkey has no output, exiting clean is success
+                res.append(out or '1')
+            except CommandError:
+                res.append('')
+        return res
+
+
+def _get_key_urls(repo: LegacyAnnexRepo, key: str) -> list[str]:
+    """Return all URLs git-annex knows for a key, across all remotes"""
+    try:
+        records = repo.call_annex_records(['whereis', '--key', key])
+    except CommandError:
+        return []
+    return [
+        url
+        for rec in records
+        for loc in rec.get('whereis', [])
+        for url in loc.get('urls', [])
+    ]
+
+
+def _pid_exists(pid: int) -> bool:
+    """Whether a process with the given PID exists on this host"""
+    if on_windows:
+        # no harmless signal to probe with, rely on pin leases
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # exists, but owned by somebody else
+        return True
+    return True
+
+
 def _get_key_contentpath(repo: LegacyAnnexRepo, key: str):
     """Return ``Path`` to a locally present annex key, or ``None``
 
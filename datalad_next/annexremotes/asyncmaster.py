@@ -0,0 +1,249 @@
+"""Support for git-annex's ``ASYNC`` external special remote protocol extension
+
+With ``ASYNC``, git-annex runs a single special remote process, and
+multiplexes any number of concurrent jobs (e.g., ``git annex get -J8``)
+over a single connection. Any message of a job is prefixed with ``J <n>``,
+where ``<n>`` is the job number.
+
+:class:`AsyncMaster` is a drop-in replacement for ``annexremote.Master``
+that processes jobs in a thread pool. Messages sent by a job's thread (e.g.,
+``PROGRESS``, ``DEBUG``, or requests to git-annex like ``GETCONFIG``) are
+prefixed with the job number, and git-annex replies are routed back to the
+requesting job.
+
+The extension is only announced to git-annex, if the linked special remote
+declares ``supports_async = True``, and the maximum number of concurrently
+processed jobs (configuration ``datalad.annexremote.async-jobs``) is larger
+than zero.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from typing import TextIO
+
+from annexremote import (
+    Master,
+    Protocol,
+    UnsupportedRequest,
+)
+
+lgr = logging.getLogger('datalad.ext.next.annexremotes.asyncmaster')
+
+
+class AsyncProtocol(Protocol):
+    """``annexremote.Protocol`` variant that can announce ``ASYNC``
+
+    With ``ASYNC`` every job starts with its own ``PREPARE`` request. The
+    remote's ``prepare()`` is only executed once, and its outcome is
+    reported for all subsequent requests.
+    """
+    def __init__(self, remote, *, supports_async: bool = False):
+        super().__init__(remote)
+        self.supports_async = supports_async
+        self._prepare_lock = threading.Lock()
+        self._prepare_reply: str | None = None
+
+    def do_EXTENSIONS(self, param):
+        reply = super().do_EXTENSIONS(param)
+        return f'{reply} ASYNC' if self.supports_async else reply
+
+    def do_PREPARE(self):
+        with self._prepare_lock:
+            if self._prepare_reply is None:
+                self._prepare_reply = super().do_PREPARE()
+            return self._prepare_reply
+
+
+class AsyncMaster(Master):
+    """``annexremote.Master`` with support for the ``ASYNC`` extension
+
+    Parameters
+    ----------
+    output: io.TextIOBase
+      Where to send replies and special remote messages.
+    max_jobs: int
+      Maximum number of jobs processed concurrently. Additional jobs are
+      queued. A value of zero disables the ``ASYNC`` extension.
+    """
+    def __init__(self, output=sys.stdout, *, max_jobs: int = 1):
+        super().__init__(output=output)
+        self.max_jobs = max_jobs
+        # job number of the executing thread
+        self._local = threading.local()
+        # reply queues of all jobs in progress
+        self._jobs: dict[str, Queue] = {}
+        self._jobs_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._main_input: TextIO | None = None
+        # whether the ASYNC protocol is in use
+        self._async = False
+
+    def LinkRemote(self, remote):
+        self.remote = remote
+        self.protocol = AsyncProtocol(
+            remote,
+            supports_async=self.max_jobs > 0
+            and getattr(remote, 'supports_async', False),
+        )
+
+    def Listen(self, input=sys.stdin):
+        if not self.protocol.supports_async:
+            return super().Listen(input=input)
+
+        self._main_input = input
+        self._async = True
+        # any reads for replies to requests of a job are served from the
+        # job's queue
+        self.input = _JobInput(self)
+        self._send(self.protocol.version)
+        with ThreadPoolExecutor(
+                max_workers=self.max_jobs,
+                thread_name_prefix='annexremote-job',
+        ) as executor:
+            while True:
+                line = input.readline()
+                if not line:
+                    # git-annex is gone, unblock any job waiting for a reply
+                    with self._jobs_lock:
+                        for replies in self._jobs.values():
+                            replies.put(None)
+                    break
+                line = line.rstrip()
+                if not line.startswith('J '):
+                    # a regular request, not part of a job
+                    self._process(line)
+                    continue
+                _, job, line = line.split(' ', 2)
+                with self._jobs_lock:
+                    replies = self._jobs.get(job)
+                    if replies is None:
+                        # a new job
+                        self._jobs[job] = Queue()
+                if replies is not None:
+                    # a reply to a request made by a running job
+                    replies.put(line)
+                    continue
+                executor.submit(self._run_job, job, line)
+
+    def _run_job(self, job: str, line: str) -> None:
+        self._local.job = job
+        try:
+            self._process(line, finalize=self._end_job)
+        finally:
+            # make sure to not route any further messages to this job,
+            # in case processing did not finalize it
+            self._end_job()
+            self._local.job = None
+
+    def _end_job(self) -> None:
+        with self._jobs_lock:
+            self._jobs.pop(self._local.job, None)
+
+    def _process(self, line: str, finalize=None) -> None:
+        try:
+            reply = self.protocol.command(line)
+        except UnsupportedRequest:
+            reply = 'UNSUPPORTED-REQUEST'
+        except Exception as e:
+            for tbline in traceback.format_exc().splitlines():
+                self.debug(tbline)
+            if finalize:
+                finalize()
+            self.error(e)
+            return
+        # a job is complete before its final reply. git-annex may send the
+        # next request for the same job number immediately after
+        if finalize:
+            finalize()
+        if reply:
+            self._send(reply)
+
+    def _send(self, *args, **kwargs):
+        job = getattr(self._local, 'job', None)
+        if job is not None:
+            args = ('J', job) + args
+        elif self._async \
+                and threading.current_thread() is not threading.main_thread():
+            # a helper thread without a job association. Any unprefixed
+            # message would break the protocol, log locally instead
+            lgr.debug('Not relaying message outside a job: %r', args)
+            return
+        with self._send_lock:
+            super()._send(*args, **kwargs)
+
+
+class _JobInput:
+    """Input proxy that serves a job's replies from its queue"""
+    def __init__(self, master: AsyncMaster):
+        self._master = master
+
+    def readline(self) -> str:
+        job = getattr(self._master._local, 'job', None)
+        if job is None:
+            assert self._master._main_input is not None
+            return self._master._main_input.readline()
+        with self._master._jobs_lock:
+            replies = self._master._jobs[job]
+        line = replies.get()
+        # None signals the end of input
+        return '' if line is None else f'{line}\n'
+
+
+def main(args=None, cls=None, remote_name=None, description=None):
+    """CLI entry point for special remotes, with ``ASYNC`` support
+
+    This is the equivalent of ``datalad.customremotes.main.main()``, with
+    the special remote linked to an :class:`AsyncMaster` instead of an
+    ``annexremote.Master``. The command line parser of the original entry
+    point is used.
+    """
+    from datalad.customremotes.main import setup_parser
+    from datalad.support.entrypoints import load_extensions
+    from datalad.ui import ui
+
+    # load extensions requested by configuration, prior to parser
+    # construction, like the original entry point
+    load_extensions()
+    parser = setup_parser(remote_name, description)
+    args = parser.parse_args(args)
+
+    # stdin/stdout will be used for interactions with annex
+    ui.set_backend('annex')
+
+    if args.common_debug:
+        from datalad.cli.utils import setup_exceptionhook
+
+        # stop at the point of failure
+        setup_exceptionhook()
+        _main(args, cls)
+        return
+    try:
+        _main(args, cls)
+    except Exception as exc:
+        lgr.debug('%s (%s) - passing ERROR to git-annex and exiting',
+                  str(exc), exc.__class__.__name__)
+        # any failure outside of `Listen()` must be reported to git-annex
+        # as an ERROR message, rather than a log message
+        print(f'ERROR {exc} ({exc.__class__.__name__})')
+        sys.exit(1)
+
+
+def _main(args, cls):
+    import datalad
+
+    assert cls is not None
+    master = AsyncMaster(
+        max_jobs=datalad.cfg.obtain('datalad.annexremote.async-jobs'),
+    )
+    remote = cls(master)
+    master.LinkRemote(remote)
+    master.Listen()
+    # cleanup
+    if hasattr(remote, 'stop'):
+        remote.stop()
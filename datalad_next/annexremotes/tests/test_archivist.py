@@ -1,15 +1,34 @@
+import json
 from pathlib import (
     Path,
     PurePosixPath,
 )
+import socket
+import subprocess
+import sys
+import time
 import pytest
 
 from .. import UnsupportedRequest
-from ..archivist import ArchivistRemote
+from ..archivist import (
+    ArchivistRemote,
+    _ArchiveCache,
+    _ArchiveInfo,
+    _ArchivePresence,
+    _BulkExtractionPlanner,
+)
+from datalad_next.types import (
+    AnnexKey,
+    ArchivistLocator,
+    ArchiveType,
+)
 from datalad_next.datasets import Dataset
 from datalad_next.runners import CommandError
 
-from datalad_next.tests import assert_result_count
+from datalad_next.tests import (
+    assert_result_count,
+    skip_if_on_windows,
+)
 
 
 @pytest.fixture(autouse=False, scope="function")
@@ -259,3 +278,196 @@ def test_archivist_unsupported():
         ar.transfer_store('mykey', 'myfile')
     with pytest.raises(UnsupportedRequest):
         ar.remove('mykey')
+
+
+def test_bulk_extraction_planner(tmp_path):
+    import tarfile
+    members = {f'dir/file{i}.txt': f'content{i}' * (i + 1) for i in range(5)}
+    src = tmp_path / 'src'
+    for name, content in members.items():
+        (src / name).parent.mkdir(parents=True, exist_ok=True)
+        (src / name).write_text(content)
+    archive_path = tmp_path / 'archive.tar.gz'
+    with tarfile.open(archive_path, 'w:gz') as tf:
+        for name in members:
+            tf.add(src / name, arcname=name)
+    akey = AnnexKey.from_str('MD5E-s1--e9f624eb778e6f945771c543b6e9c7b2.tar.gz')
+    ainfo = _ArchiveInfo(local_path=archive_path, type=ArchiveType.tar)
+
+    def locs(name):
+        return [ArchivistLocator(akey=akey, member=PurePosixPath(name))]
+
+    planner = _BulkExtractionPlanner(tmp_path / 'tmp', budget=1024 ** 2)
+    dst = tmp_path / 'dst'
+    # no burst yet, nothing is served
+    assert planner.retrieve(locs('dir/file0.txt'), dst) is False
+    planner.observe(akey, ainfo)
+    assert planner.retrieve(locs('dir/file1.txt'), dst) is False
+    planner.observe(akey, ainfo)
+    # burst detected, request in reverse archive order, all but the first
+    # are served from staging
+    for name in ('dir/file4.txt', 'dir/file3.txt', 'dir/file2.txt'):
+        assert planner.retrieve(locs(name), dst) is True
+        assert dst.read_text() == members[name]
+    # members that were served already require a new pass
+    assert planner.retrieve(locs('dir/file4.txt'), dst) is True
+    assert dst.read_text() == members['dir/file4.txt']
+    # unknown members are reported as such
+    assert planner.retrieve(locs('dir/nothere'), dst) is False
+    staging_dir = planner._staging_dir
+    assert staging_dir.exists()
+    planner.close()
+    assert not staging_dir.exists()
+
+    # without a staging budget, out-of-order requests restart the pass
+    planner = _BulkExtractionPlanner(tmp_path / 'tmp', budget=0)
+    planner.observe(akey, ainfo)
+    planner.observe(akey, ainfo)
+    for name in ('dir/file4.txt', 'dir/file0.txt', 'dir/file3.txt'):
+        assert planner.retrieve(locs(name), dst) is True
+        assert dst.read_text() == members[name]
+    assert not list(planner._staging_dir.iterdir())
+    planner.close()
+
+
+def test_archive_cache(tmp_path):
+    class DummyRepo:
+        dot_git = tmp_path
+        dropped = []
+
+        def call_annex(self, args):
+            assert args[:2] == ['drop', '--key']
+            self.dropped.append(args[2])
+
+    repo = DummyRepo()
+    akeys = [
+        AnnexKey.from_str(f'MD5E-s100--e9f624eb778e6f945771c543b6e9c7b{i}.tar')
+        for i in range(3)
+    ]
+    cache = _ArchiveCache(repo, budget=250)
+    for akey in akeys:
+        cache.add(akey, tmp_path)
+    # access the first archive, it becomes the most recently used
+    cache.touch(akeys[0])
+    cache.pin(akeys[2])
+    assert cache.evict() == [akeys[1]]
+    assert repo.dropped == [str(akeys[1])]
+    # within the budget, the stored state is not rewritten
+    state_path = tmp_path / 'datalad' / 'archivist' / 'cache.json'
+    state_mtime = state_path.stat().st_mtime_ns
+    cache.touch(akeys[0])
+    assert cache.evict() == []
+    assert state_path.stat().st_mtime_ns == state_mtime
+    # bookkeeping and pins are shared with other instances (i.e., processes)
+    other = _ArchiveCache(repo, budget=0)
+    assert other.evict() == [akeys[0]]
+    # closing releases all pins
+    cache.close()
+    assert other.evict() == [akeys[2]]
+    assert repo.dropped == [str(k) for k in (akeys[1], akeys[0], akeys[2])]
+
+    # LFU ordering
+    repo.dropped.clear()
+    cache = _ArchiveCache(repo, budget=100, policy='lfu')
+    for akey in akeys[:2]:
+        cache.add(akey, tmp_path)
+    cache.touch(akeys[1])
+    cache.touch(akeys[0])
+    cache.touch(akeys[1])
+    assert cache.evict() == [akeys[0]]
+
+    with pytest.raises(ValueError):
+        _ArchiveCache(repo, budget=0, policy='fifo')
+
+
+def test_archive_cache_no_budget(tmp_path):
+    class DummyRepo:
+        dot_git = tmp_path
+
+    akey = AnnexKey.from_str(
+        'MD5E-s100--e9f624eb778e6f945771c543b6e9c7b0.tar')
+    cache = _ArchiveCache(DummyRepo(), budget=None)
+    # without a budget there is no bookkeeping at all
+    cache.add(akey, tmp_path)
+    cache.pin(akey)
+    cache.touch(akey)
+    cache.unpin(akey)
+    assert cache.evict() == []
+    cache.close()
+    assert not (tmp_path / 'datalad').exists()
+
+
+@skip_if_on_windows
+def test_archive_cache_stale_pins(tmp_path):
+    class DummyRepo:
+        dot_git = tmp_path
+        dropped = []
+
+        def call_annex(self, args):
+            self.dropped.append(args[2])
+
+    repo = DummyRepo()
+    akeys = [
+        AnnexKey.from_str(f'MD5E-s100--e9f624eb778e6f945771c543b6e9c7b{i}.tar')
+        for i in range(2)
+    ]
+    cache = _ArchiveCache(repo, budget=0)
+    for akey in akeys:
+        cache.add(akey, tmp_path)
+    # a process that pinned the first archive, and is gone
+    proc = subprocess.Popen([sys.executable, '-c', ''])
+    proc.wait()
+    state_path = tmp_path / 'datalad' / 'archivist' / 'cache.json'
+    state = json.loads(state_path.read_text())
+    state['pins'][str(akeys[0])] = {
+        f'{socket.gethostname()}:{proc.pid}:0': time.time(),
+    }
+    # and a pin of a process on another host
+    state['pins'][str(akeys[1])] = {'otherhost:1:0': 0.0}
+    state_path.write_text(json.dumps(state))
+    # a pin of another host is only ignored after the lease expired
+    cache.pin_lease = 10 ** 12
+    assert cache.evict() == [akeys[0]]
+    assert str(akeys[0]) not in json.loads(state_path.read_text())['pins']
+    cache.pin_lease = 10
+    assert cache.evict() == [akeys[1]]
+    assert json.loads(state_path.read_text())['pins'] == {}
+
+
+def test_archive_presence(monkeypatch):
+    queries = []
+
+    def fake_call_git_lines(args, cwd=None, input=None):
+        akeys = input.splitlines()
+        queries.append((args[1], akeys))
+        if args[1] == 'contentlocation':
+            return [f'annex/objects/{k}' if k == 'local' else ''
+                    for k in akeys]
+        return ['1' if k == 'remote' else '0' for k in akeys]
+
+    class DummyRepo:
+        pathobj = Path.cwd()
+
+    monkeypatch.setattr(
+        'datalad_next.annexremotes.archivist.call_git_lines',
+        fake_call_git_lines)
+    presence = _ArchivePresence(DummyRepo(), ttl=300)
+    assert presence.any_present(['local', 'absent']) is True
+    assert presence.any_present(['remote', 'absent']) is True
+    assert queries == [
+        ('contentlocation', ['local', 'absent']),
+        ('checkpresentkey', ['absent']),
+        ('contentlocation', ['remote']),
+        ('checkpresentkey', ['remote']),
+    ]
+    # all outcomes are cached now, positive and negative
+    queries.clear()
+    for i in range(100):
+        assert presence.any_present(['absent']) is False
+        assert presence.any_present(['absent', 'remote']) is True
+    assert queries == []
+    # without reuse, every check is a query
+    presence = _ArchivePresence(DummyRepo(), ttl=0)
+    presence.any_present(['absent'])
+    presence.any_present(['absent'])
+    assert len(queries) == 4
@@ -0,0 +1,116 @@
+from io import StringIO
+import threading
+
+import pytest
+
+from .. import (
+    RemoteError,
+    SpecialRemote,
+)
+from ..asyncmaster import (
+    AsyncMaster,
+    main,
+)
+
+
+class DummyRemote(SpecialRemote):
+    supports_async = True
+
+    def __init__(self, annex):
+        super().__init__(annex)
+        self.nprepare = 0
+        # make all jobs wait for each other to prove concurrent processing
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def initremote(self):
+        pass
+
+    def prepare(self):
+        self.nprepare += 1
+
+    def transfer_retrieve(self, key, filename):
+        # requests to git-annex are answered within the job
+        value = self.annex.getconfig(key)
+        self.annex.progress(len(value))
+        self.barrier.wait()
+        if value == 'fail':
+            raise RemoteError('failed')
+
+    def transfer_store(self, key, filename):
+        pass
+
+    def checkpresent(self, key):
+        return True
+
+    def remove(self, key):
+        pass
+
+
+class SyncDummyRemote(DummyRemote):
+    supports_async = False
+
+
+def _run(cls, lines, max_jobs=4):
+    output = StringIO()
+    master = AsyncMaster(output=output, max_jobs=max_jobs)
+    remote = cls(master)
+    master.LinkRemote(remote)
+    master.Listen(input=StringIO(''.join(f'{line}\n' for line in lines)))
+    return remote, output.getvalue().splitlines()
+
+
+def test_asyncmaster():
+    remote, out = _run(DummyRemote, [
+        'EXTENSIONS INFO',
+        'J 1 PREPARE',
+        'J 2 PREPARE',
+        'J 1 TRANSFER RETRIEVE k1 f1',
+        'J 2 TRANSFER RETRIEVE k2 f2',
+        'J 1 VALUE some',
+        'J 2 VALUE fail',
+    ])
+    assert remote.nprepare == 1
+    assert out[:2] == ['VERSION 1', 'EXTENSIONS ASYNC']
+    # messages of jobs are prefixed and routed to the respective job
+    assert sorted(out[2:]) == [
+        'J 1 GETCONFIG k1',
+        'J 1 PREPARE-SUCCESS',
+        'J 1 PROGRESS 4',
+        'J 1 TRANSFER-SUCCESS RETRIEVE k1',
+        'J 2 GETCONFIG k2',
+        'J 2 PREPARE-SUCCESS',
+        'J 2 PROGRESS 4',
+        'J 2 TRANSFER-FAILURE RETRIEVE k2 failed',
+    ]
+    # order within a job is maintained
+    assert [line for line in out if line.startswith('J 1 ')] == [
+        'J 1 PREPARE-SUCCESS',
+        'J 1 GETCONFIG k1',
+        'J 1 PROGRESS 4',
+        'J 1 TRANSFER-SUCCESS RETRIEVE k1',
+    ]
+
+
+def test_asyncmaster_disabled():
+    # not announced when disabled by the remote, or by configuration
+    for cls, max_jobs in ((SyncDummyRemote, 4), (DummyRemote, 0)):
+        remote, out = _run(cls, ['EXTENSIONS INFO', 'PREPARE'], max_jobs)
+        assert out == ['VERSION 1', 'EXTENSIONS', 'PREPARE-SUCCESS']
+
+
+def test_asyncmaster_main(capsys):
+    class BrokenRemote(DummyRemote):
+        def __init__(self, annex):
+            assert isinstance(annex, AsyncMaster)
+            raise ValueError('broken')
+
+    from datalad.ui import ui
+    ui_backend = ui.backend
+    # errors are reported to git-annex
+    try:
+        with pytest.raises(SystemExit):
+            main(args=[], cls=BrokenRemote, remote_name='dummy',
+                 description='test')
+    finally:
+        ui.set_backend(ui_backend)
+    assert capsys.readouterr().out == 'ERROR broken (ValueError)\n'
@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pytest
 import re
+import subprocess
+import sys
 
 from datalad_next.consts import on_windows
 from datalad_next.tests import (
@@ -16,9 +19,13 @@ from datalad_next.exceptions import (
 )
 from datalad_next.url_operations import AnyUrlOperations
 
+from datalad_next.runners import call_git
+
 from ..uncurl import (
     RemoteError,
     UncurlRemote,
+    _PresenceCache,
+    _read_key_urls_log,
 )
 
 # for some tests below it is important that this base config contains no
@@ -447,3 +454,146 @@ def test_uncurl_testremote(tmp_path, existing_dataset):
     if not on_windows:
         # not running with --fast to also cover key chunking
         dsca(['testremote', '--quiet', 'myuncurl'])
+
+
+def test_uncurl_read_key_urls_log(tmp_path):
+    repo = tmp_path / 'repo'
+    call_git(['init', str(repo)])
+    branch = tmp_path / 'branch'
+    create_tree(branch, {
+        'a1b': {'c2d': {
+            'MD5E-s3--abc.dat.log.web':
+            '1700000000.1s 1 http://example.com/a\n'
+            '1700000000.2s 1 http://example.com/b\n'
+            '1700000000.3s 0 http://example.com/a\n',
+        }},
+        'e3f': {'a4b': {
+            'URL--http&c%%example.com%x.log.web':
+            '1700000000.1s 1 http://example.com/x\n',
+            'URL--http&c%%example.com%x.log':
+            '1700000000.1s 1 2d0660ae-e5bf-11ee-b6f2-37ba632b6dd3\n',
+        }},
+        'aaa': {'bbb': {
+            'MD5E-s1--gone.log.web':
+            '1700000000.1s 1 http://example.com/gone\n'
+            '1700000000.2s 0 http://example.com/gone\n',
+        }},
+    })
+    gitargs = [
+        '-c', 'user.name=dummy', '-c', 'user.email=dummy@example.com',
+        f'--git-dir={repo / ".git"}', f'--work-tree={branch}',
+    ]
+    call_git([*gitargs, 'checkout', '-q', '--orphan', 'git-annex'])
+    call_git([*gitargs, 'add', '.'])
+    call_git([*gitargs, 'commit', '-q', '-m', 'annex'])
+    # uncommitted changes in the journal
+    journal = repo / '.git' / 'annex' / 'journal'
+    journal.mkdir(parents=True)
+    (journal / 'a1b_c2d_MD5E-s3--abc.dat.log.web').write_text(
+        '1700000000.4s 1 http://example.com/c\n')
+    (journal / 'a5b_c6d_MD5E-s4--new__key.dat.log.web').write_text(
+        '1700000000.4s 1 http://example.com/new\n')
+
+    assert _read_key_urls_log(repo, repo / '.git') == {
+        'MD5E-s3--abc.dat': [
+            'http://example.com/b', 'http://example.com/c'],
+        'URL--http://example.com/x': ['http://example.com/x'],
+        'MD5E-s4--new_key.dat': ['http://example.com/new'],
+    }
+
+
+def test_uncurl_presence_cache(tmp_path):
+    cache = _PresenceCache(tmp_path / 'sub' / 'presence.sqlite', ttl=300)
+    assert cache.get('http://example.com/a') == (None, {}, False)
+    cache.set('http://example.com/a', True, {'http-etag': '"abc"'})
+    cache.set('http://example.com/b', False)
+    assert cache.get('http://example.com/a') == (
+        True, {'http-etag': '"abc"'}, True)
+    assert cache.get('http://example.com/b') == (False, {}, True)
+    cache.close()
+    # records persist, but expire
+    cache = _PresenceCache(tmp_path / 'sub' / 'presence.sqlite', ttl=0)
+    assert cache.get('http://example.com/a') == (
+        True, {'http-etag': '"abc"'}, False)
+    cache.close()
+
+
+def test_uncurl_store_remove_presence_cache(tmp_path):
+    r = UncurlRemote(NoOpAnnex(tmp_path))
+    r.url_handler = AnyUrlOperations()
+    r.url_tmpl = f'{(tmp_path / "remote").as_uri()}/{{annex_key}}'
+    r._presence = _PresenceCache(tmp_path / 'presence.sqlite', ttl=300)
+    key = 'MD5E-s9--9b4b3d8b3b1b5a5e8a2b6c4e2e1b1f36.txt'
+    url = f'{(tmp_path / "remote").as_uri()}/{key}'
+    # skip the URL lookup via git-annex
+    r._key_urls[key] = [url]
+    srcfile = tmp_path / 'src.txt'
+    srcfile.write_text('uppytyup!')
+    (tmp_path / 'remote').mkdir()
+    # a cached negative outcome does not survive a store
+    assert r.checkpresent(key) is False
+    assert r._presence.get(url)[0] is False
+    r.transfer_store(key, str(srcfile))
+    assert r._presence.get(url)[0] is True
+    assert r.checkpresent(key) is True
+    # a cached positive outcome does not survive a removal
+    r.remove(key)
+    assert r._presence.get(url)[0] is False
+    assert r.checkpresent(key) is False
+    # also not when the key was already gone
+    r._presence.set(url, True)
+    r.remove(key)
+    assert r.checkpresent(key) is False
+    r.close()
+
+
+def test_uncurl_url_handler_per_thread(tmp_path):
+    from datalad import cfg
+    r = UncurlRemote(NoOpAnnex(tmp_path))
+    # no handler before prepare()
+    assert r.url_handler is None
+    r._url_handler_cfg = cfg
+    handler = r.url_handler
+    assert isinstance(handler, AnyUrlOperations)
+    assert r.url_handler is handler
+    # each job thread uses its own handler
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        handlers = list(executor.map(
+            lambda i: r.url_handler, range(2)))
+    assert all(isinstance(h, AnyUrlOperations) for h in handlers)
+    assert handler not in handlers
+    r.close()
+    assert r.url_handler is None
+
+
+def test_uncurl_async_announcement():
+    # the special remote entry point announces concurrent job processing
+    out = subprocess.run(
+        [sys.executable, '-c',
+         'from datalad_next.annexremotes.uncurl import main; main()'],
+        input='EXTENSIONS INFO ASYNC\n',
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    assert out == ['VERSION 1', 'EXTENSIONS ASYNC']
+
+
+def test_uncurl_get_concurrently(existing_dataset, tmp_path):
+    ds = existing_dataset
+    dsca = ds.repo.call_annex
+    dsca(['initremote', 'myuncurl'] + std_initargs + [
+        'match=bingofile://(?P<path>.*)$',
+        'url=file://{path}',
+    ])
+    files = {f'file{i}.dat': f'content{i}' for i in range(8)}
+    create_tree(tmp_path / 'deposit', files)
+    for fname in files:
+        dsca(['addurl', '--file', fname,
+              f'bingo{(tmp_path / "deposit" / fname).as_uri()}'])
+    dsca(['drop', '--force'] + list(files))
+    assert not any((ds.pathobj / f).exists() for f in files)
+    # all jobs are served by a single special remote process
+    dsca(['get', '-J4'] + list(files))
+    for fname, content in files.items():
+        assert (ds.pathobj / fname).read_text() == content
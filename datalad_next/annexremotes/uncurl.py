@@ -211,6 +211,50 @@ expressions that may be included in the special remote setup via
 ``init/enableremote``. The ``remote.<remotename>.uncurl-match`` configuration
 item can be set as often as necessary (which one match expression each).
 
+Bulk operation
+--------------
+
+When git-annex requests more than a single key from the special remote
+(e.g., ``git annex get`` on a directory, or ``git annex fsck``), the URLs
+registered for all keys are read in one pass from the URL logs on the
+``git-annex`` branch (and any not yet committed journal entries), instead
+of asking git-annex for the URLs of each key individually. The final URL for
+each key (after applying any URL template) is only computed once.
+Keys without any URL in these logs (e.g., temporary keys created by
+``git annex addurl``) are still queried individually.
+
+Presence cache
+--------------
+
+By default, each presence check (e.g., ``git annex fsck --fast``, or
+``git annex find --in``) performs a ``stat`` request for the URL of a key
+(e.g., an HTTP ``HEAD`` request). With
+
+- ``remote.<remotename>.uncurl-presence-ttl=<seconds>``
+
+the outcomes of these checks, positive and negative, are recorded in a
+small database in ``.git/datalad/uncurl/<remoteuuid>/``, and are reused
+for the given number of seconds, also across invocations of the special
+remote. With
+
+- ``remote.<remotename>.uncurl-presence-revalidate=yes``
+
+an expired positive outcome is revalidated with a conditional request
+that uses the recorded validators (``ETag``, ``Last-Modified``,
+``Content-Length``). A full ``stat`` request is only performed when the
+target has changed since it was recorded.
+
+Concurrent transfers
+--------------------
+
+With ``git annex get -J<n>`` (or ``copy``, ``drop``, ``fsck``), a single
+*uncurl* process handles all concurrent jobs via the ``ASYNC`` extension of
+the special remote protocol (see
+:mod:`~datalad_next.annexremotes.asyncmaster`). Each job thread uses its own
+URL handlers, hence its own HTTP session and authentication handler. The
+maximum number of concurrent jobs is limited by the
+``datalad.annexremote.async-jobs`` configuration.
+
 Tips
 ----
 
@@ -220,19 +264,33 @@ names for each match-group to avoid collisions.
 from __future__ import annotations
 
 from annexremote import Master
+from collections.abc import Iterator
 from functools import partial
 from pathlib import Path
+import json
 import re
+import sqlite3
+import threading
+import time
 from typing import (
     Callable,
     Pattern,
 )
 
+from datasalad.itertools import (
+    decode_bytes,
+    itemize,
+)
+
+from datalad_next.config import ConfigManager
+from datalad_next.constraints import EnsureBool
 from datalad_next.exceptions import (
     CapturedException,
+    CommandError,
     UrlOperationsRemoteError,
     UrlOperationsResourceUnknown,
 )
+from datalad_next.runners import iter_git_subproc
 from datalad_next.url_operations import AnyUrlOperations
 from datalad_next.utils import ensure_list
 
@@ -245,6 +303,9 @@ from . import (
 
 class UncurlRemote(SpecialRemote):
     """ """
+    # requests are processed by job threads, each with its own URL handlers
+    supports_async = True
+
     def __init__(self, annex: Master):
         super().__init__(annex)
         self.configs.update(
@@ -253,18 +314,61 @@ class UncurlRemote(SpecialRemote):
         )
         self.url_tmpl: str | None = None
         self.match: list[Pattern[str]] | None = None
-        self.url_handler: AnyUrlOperations | None = None
+        # URL handlers by thread, created on demand after prepare()
+        # (see `url_handler`)
+        self._url_handlers: dict[int, AnyUrlOperations] = {}
+        self._url_handlers_lock = threading.Lock()
+        self._url_handler_cfg: ConfigManager | None = None
         # cache of properties that do not vary within a session
         # or across annex keys
         self.persistent_tmpl_props: dict[str, str] = {}
+        # URLs registered for all keys, read from the git-annex branch
+        # once more than one key is requested
+        self._key_urls_log: dict[str, list[str]] | None = None
+        # final (rewritten) URLs for keys served from the URL log
+        self._key_urls: dict[str, list[str]] = {}
+        # keys requested in this session, before the URL log was read
+        self._requested_keys: set[str] = set()
+        self._key_urls_log_lock = threading.Lock()
+        # record of presence check outcomes, if enabled
+        self._presence: _PresenceCache | None = None
+        self._presence_revalidate = False
 
     def __del__(self):
         self.close()
 
+    @property
+    def url_handler(self) -> AnyUrlOperations | None:
+        """URL handler of the executing thread
+
+        Handlers (and any HTTP session or SSH connection held by them) are
+        not shared between the threads that process concurrent jobs.
+        """
+        thread = threading.get_ident()
+        with self._url_handlers_lock:
+            handler = self._url_handlers.get(thread)
+            if handler is None and self._url_handler_cfg is not None:
+                handler = self._url_handlers[thread] = AnyUrlOperations(
+                    cfg=self._url_handler_cfg)
+        return handler
+
+    @url_handler.setter
+    def url_handler(self, handler: AnyUrlOperations | None) -> None:
+        thread = threading.get_ident()
+        with self._url_handlers_lock:
+            if handler is None:
+                self._url_handlers.pop(thread, None)
+            else:
+                self._url_handlers[thread] = handler
+
     def close(self) -> None:
-        if self.url_handler:
-            del self.url_handler
-            self.url_handler = None
+        with self._url_handlers_lock:
+            # no new handlers after closing
+            self._url_handler_cfg = None
+            self._url_handlers.clear()
+        if self._presence:
+            self._presence.close()
+            self._presence = None
 
     def initremote(self) -> None:
         # at present there is nothing that needs to be done on init/enable.
@@ -307,8 +411,8 @@ class UncurlRemote(SpecialRemote):
             f'Active URL match expressions: {[e.pattern for e in self.match]!r}',
             type='debug')
 
-        # let the URL handler use the repo's config
-        self.url_handler = AnyUrlOperations(cfg=self.repo.cfg)
+        # let the URL handlers use the repo's config
+        self._url_handler_cfg = self.repo.cfg
 
         # cache template properties
         # using function arg name syntax, we need the identifiers to be valid
@@ -319,6 +423,18 @@ class UncurlRemote(SpecialRemote):
             annex_remoteuuid=self.annex.getuuid(),
         )
 
+        presence_ttl = float(
+            self.get_remote_gitcfg('uncurl', 'presence-ttl', default=0))
+        if presence_ttl > 0:
+            self._presence = _PresenceCache(
+                self.repo.dot_git / 'datalad' / 'uncurl'
+                / self.persistent_tmpl_props['annex_remoteuuid']
+                / 'presence.sqlite',
+                ttl=presence_ttl,
+            )
+            self._presence_revalidate = EnsureBool()(self.get_remote_gitcfg(
+                'uncurl', 'presence-revalidate', default='no'))
+
     def claimurl(self, url: str) -> bool:
         """Needs to check if want to handle a given URL
 
@@ -401,7 +517,7 @@ class UncurlRemote(SpecialRemote):
         assert self.url_handler
         return self._check_retrieve(
             key,
-            self.url_handler.stat,
+            self._stat if self._presence else self.url_handler.stat,
             ('find', 'at'),
         )
 
@@ -411,6 +527,7 @@ class UncurlRemote(SpecialRemote):
             key,
             partial(self.url_handler.upload, from_path=Path(filename)),
             'cannot store',
+            present=True,
         )
 
     def remove(self, key: str) -> None:
@@ -428,6 +545,7 @@ class UncurlRemote(SpecialRemote):
                 key,
                 _delete,
                 'refuses to delete',
+                present=False,
             )
         except UrlOperationsResourceUnknown:
             self.message(
@@ -440,10 +558,38 @@ class UncurlRemote(SpecialRemote):
         return any(m.match(url) for m in self.match or [])
 
     def get_key_urls(self, key: str) -> list[str]:
+        if key in self._key_urls:
+            return self._key_urls[key]
+        urls = self._get_logged_key_urls(key)
+        if urls is not None:
+            urls = self._key_urls[key] = self._rewrite_key_urls(key, urls)
+            return urls
         # ask git-annex for the URLs it has on record for the key.
         # this will also work within checkurl() for a temporary key
         # generated by git-annex after claimurl()
         urls = self.annex.geturls(key, prefix='')
+        return self._rewrite_key_urls(key, urls)
+
+    def _get_logged_key_urls(self, key: str) -> list[str] | None:
+        with self._key_urls_log_lock:
+            if self._key_urls_log is None:
+                self._requested_keys.add(key)
+                if len(self._requested_keys) < 2:
+                    # a single key is cheaper to ask git-annex for
+                    return None
+                try:
+                    self._key_urls_log = _read_key_urls_log(
+                        self.repo.pathobj, self.repo.dot_git)
+                except CommandError as e:
+                    CapturedException(e)
+                    self.message(
+                        'Cannot read URL logs from git-annex branch',
+                        type='debug')
+                    self._key_urls_log = {}
+                self._requested_keys.clear()
+        return self._key_urls_log.get(key)
+
+    def _rewrite_key_urls(self, key: str, urls: list[str]) -> list[str]:
         self.message(f'Known urls for {key!r}: {urls}', type='debug')
         if self.url_tmpl:
             # we have a rewriting template. extract all properties
@@ -542,12 +688,44 @@ class UncurlRemote(SpecialRemote):
         raise RemoteError(
             f'Failed to {action[0]} {key!r} {action[1]} any of {urls!r}')
 
+    def _stat(self, url: str) -> None:
+        """``stat()`` a URL, with outcomes recorded in the presence cache"""
+        assert self.url_handler
+        assert self._presence
+        present, props, valid = self._presence.get(url)
+        if present is not None and valid:
+            if present:
+                return
+            raise UrlOperationsResourceUnknown(url)
+        try:
+            if present and self._presence_revalidate and props \
+                    and not self.url_handler.is_modified(url, props):
+                self._presence.set(url, True, props)
+                return
+            props = self.url_handler.stat(url)
+        except UrlOperationsResourceUnknown:
+            self._presence.set(url, False)
+            raise
+        self._presence.set(url, True, {
+            k: v for k, v in props.items()
+            if k in self.url_handler.validator_props
+        })
+
     def _store_delete(
         self,
         key: str,
         handler: Callable,
         action: str,
+        *,
+        present: bool,
     ) -> None:
+        """Store or delete a key at its URL
+
+        ``present`` declares whether the URL target exists after the
+        ``handler`` succeeded. Any presence cache record is updated
+        accordingly, such that ``checkpresent()`` never reports
+        outdated information on keys changed by this remote.
+        """
         if not self.url_tmpl:
             raise RemoteError(
                 f'Remote {action} content without a configured URL template')
@@ -558,6 +736,8 @@ class UncurlRemote(SpecialRemote):
         try:
             handler(to_url=url)
         except UrlOperationsResourceUnknown:
+            if self._presence and not present:
+                self._presence.set(url, False)
             # pass-through, would happen when removing a non-existing key,
             # which git-annex wants to be a OK thing to happen.
             # handler in callers
@@ -565,6 +745,62 @@ class UncurlRemote(SpecialRemote):
         except Exception as e:
             # we need to raise RemoteError whenever we could not perform
             raise RemoteError from e
+        if self._presence:
+            # no validators, a revalidation will need a full stat()
+            self._presence.set(url, present)
+
+
+class _PresenceCache:
+    """On-disk record of URL presence check outcomes
+
+    Records are kept in an SQLite database, and are shared by all special
+    remote processes using the same database file. A single connection is
+    shared by all threads of a process.
+    """
+    def __init__(self, path: Path, ttl: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # autocommit, records are written one at a time
+        self._db = sqlite3.connect(
+            str(path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS presence ('
+            'url TEXT PRIMARY KEY, present INTEGER, checked REAL, props TEXT)'
+        )
+
+    def get(self, url: str) -> tuple[bool | None, dict, bool]:
+        """Return recorded presence, validators, and whether still valid
+
+        The presence is ``None``, if there is no record for the URL.
+        """
+        with self._lock:
+            rec = self._db.execute(
+                'SELECT present, checked, props FROM presence WHERE url = ?',
+                (url,),
+            ).fetchone()
+        if rec is None:
+            return None, {}, False
+        present, checked, props = rec
+        return (
+            bool(present),
+            json.loads(props) if props else {},
+            time.time() - checked < self._ttl,
+        )
+
+    def set(self, url: str, present: bool, props: dict | None = None) -> None:
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO presence VALUES (?, ?, ?, ?)',
+                (url, int(present), time.time(), json.dumps(props or {})),
+            )
+
+    def close(self) -> None:
+        self._db.close()
 
 
 _stat2checkurl_map = {
@@ -574,6 +810,104 @@ _stat2checkurl_map = {
 to those expected from checkurl()"""
 
 
+def _read_key_urls_log(
+        repo_path: Path,
+        dot_git: Path,
+) -> dict[str, list[str]]:
+    """Read the URLs registered for all keys in a git-annex repository
+
+    All URL logs (``*.log.web``) on the ``git-annex`` branch are read in a
+    single ``git grep`` call. Uncommitted changes to these logs in the
+    git-annex journal are considered too.
+
+    Returns
+    -------
+    dict
+      Mapping of annex key names to a list of URLs currently registered for
+      the respective key. Keys without any registered URL are not included.
+    """
+    # url log records per key: url -> (timestamp, present)
+    records: dict[str, dict[str, tuple[float, bool]]] = {}
+
+    def _add_record(key: str, line: str) -> None:
+        try:
+            ts, status, url = line.split(' ', maxsplit=2)
+            rec = (float(ts.rstrip('s')), status == '1')
+        except ValueError:
+            # not a URL log record
+            return
+        key_recs = records.setdefault(key, {})
+        # the most recent record wins
+        if url not in key_recs or key_recs[url][0] <= rec[0]:
+            key_recs[url] = rec
+
+    for path, line in _iter_branch_url_logs(repo_path):
+        _add_record(_logfile2key(path.rpartition('/')[2]), line)
+
+    for journal in ('journal', 'journal-private'):
+        journal_dir = dot_git / 'annex' / journal
+        if not journal_dir.is_dir():
+            continue
+        for logfile in journal_dir.glob('*.log.web'):
+            key = _logfile2key(_unmangle_journalfile(logfile.name))
+            for line in logfile.read_text().splitlines():
+                _add_record(key, line)
+
+    return {
+        key: urls
+        for key, key_recs in records.items()
+        if (urls := [url for url, rec in key_recs.items() if rec[1]])
+    }
+
+
+def _iter_branch_url_logs(repo_path: Path) -> Iterator[tuple[str, str]]:
+    try:
+        with iter_git_subproc(
+                [
+                    'grep',
+                    '--no-color',
+                    # we rely on zero-byte splitting of path and match below
+                    '-z',
+                    '-e', '.',
+                    'git-annex',
+                    '--',
+                    '*.log.web',
+                ],
+                cwd=repo_path,
+        ) as r:
+            for item in itemize(decode_bytes(r), sep='\n', keep_ends=False):
+                # ref:path\0line
+                path, _, line = item.partition('\0')
+                yield path, line
+    except CommandError as e:
+        # git-grep exits with 1 when nothing matched
+        if e.returncode != 1:
+            raise
+
+
+def _logfile2key(fname: str) -> str:
+    """Turn the name of a ``.log.web`` file into the annex key name"""
+    fname = fname[:-len('.log.web')]
+    # reverse git-annex's keyFile() escaping
+    key = []
+    chars = iter(fname)
+    for c in chars:
+        if c == '%':
+            key.append('/')
+        elif c == '&':
+            key.append({'a': '&', 's': '%', 'c': ':'}.get(next(chars, ''), ''))
+        else:
+            key.append(c)
+    return ''.join(key)
+
+
+def _unmangle_journalfile(fname: str) -> str:
+    """Return the file name part of a git-annex journal file name"""
+    # journal files are named after their branch path, with '/'
+    # replaced by '_', and '_' replaced by '__'
+    return re.split(r'(?<!_)_(?!_)', fname)[-1].replace('__', '_')
+
+
 def main():
     """cmdline entry point"""
     super_main(
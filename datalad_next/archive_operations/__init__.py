@@ -10,9 +10,13 @@ Available handlers:
 
    TarArchiveOperations
    ZipArchiveOperations
+   RemoteZipArchiveOperations
 """
 from .tarfile import TarArchiveOperations
-from .zipfile import ZipArchiveOperations
+from .zipfile import (
+    RemoteZipArchiveOperations,
+    ZipArchiveOperations,
+)
 
 
 # TODO REMOVE EVERYTHING BELOW FOR V2.0
@@ -11,7 +11,10 @@ import pytest
 
 from datalad_next.iter_collections import FileSystemItemType
 
-from ..zipfile import ZipArchiveOperations
+from ..zipfile import (
+    RemoteZipArchiveOperations,
+    ZipArchiveOperations,
+)
 
 
 @dataclass
@@ -96,3 +99,55 @@ def test_ziparchive_noncontext(structured_sample_zip: _TestArchive):
     assert zip.zipfile.filename == str(spec.path)
     zip.close()
     assert zip._zipfile is None
+
+
+def test_remote_ziparchive(
+        structured_sample_zip: _TestArchive,
+        credman,
+        webdav_credential,
+        webdav_server,
+):
+    spec = structured_sample_zip
+    credman.set(**webdav_credential)
+    (webdav_server.path / 'sample.zip').write_bytes(spec.path.read_bytes())
+    url = f'{webdav_server.url}/sample.zip'
+    member_name = 'test-archive/onetwothree.txt'
+    with RemoteZipArchiveOperations(
+            url, credential=webdav_credential['name']) as archive_ops:
+        items = list(archive_ops)
+        assert len(items) == spec.item_count
+        assert member_name in archive_ops
+        assert 'bogus' not in archive_ops
+        with archive_ops.open(member_name) as member:
+            assert member.read() == spec.content
+    assert archive_ops._zipfile is None
+
+
+def test_ziparchive_read_extract_many(
+        structured_sample_zip: _TestArchive,
+        tmp_path: Path,
+):
+    spec = structured_sample_zip
+    members = [
+        'test-archive/onetwothree.txt',
+        PurePosixPath('test-archive/subdir/onetwothree<>again.txt'),
+    ]
+    with ZipArchiveOperations(spec.path) as zf:
+        res = dict(zf.read_many(members, hash=['md5'], max_workers=2))
+        assert set(res) == set(members)
+        for props in res.values():
+            assert props['md5'] == spec.target_hash['md5']
+            assert props['content-length'] == len(spec.content)
+        # handles are pooled, and bounded by the number of workers
+        assert 0 < len(zf._pool_all) <= 2
+
+        targets = {m: tmp_path / f'extract{i}' for i, m in enumerate(members)}
+        res = dict(zf.extract_many(targets, hash=['SHA1']))
+        for m, p in targets.items():
+            assert p.read_bytes() == spec.content
+            assert res[m]['SHA1'] == spec.target_hash['SHA1']
+
+        with pytest.raises(KeyError):
+            list(zf.read_many(['bogus']))
+    # all pooled handles are released
+    assert zf._pool_all == []
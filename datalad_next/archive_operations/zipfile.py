@@ -3,8 +3,21 @@
 from __future__ import annotations
 
 import logging
-import zipfile
+import os
+import threading
+from collections.abc import (
+    Iterable,
+    Mapping,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from contextlib import contextmanager
+from functools import partial
 from pathlib import (
     Path,
     PurePosixPath,
@@ -13,9 +26,17 @@ from typing import (
     Generator,
     IO,
 )
-from zipfile import ZipInfo
+from zipfile import (
+    ZipFile,
+    ZipInfo,
+)
 
 from datalad_next.config import ConfigManager
+from datalad_next.consts import COPY_BUFSIZE
+from datalad_next.utils.multihash import (
+    MultiHash,
+    NoOpHash,
+)
 # TODO we might just want to do it in reverse:
 # move the code of `iter_zip` in here and have it call
 # `ZipArchiveOperations(path).__iter__()` instead.
@@ -28,6 +49,8 @@ from datalad_next.iter_collections import (
     ZipfileItem,
     iter_zip,
 )
+from datalad_next.iter_collections.zipfile import _get_zipfile_item
+from datalad_next.url_operations import HttpUrlOperations
 from .base import ArchiveOperations
 
 
@@ -36,16 +59,23 @@ lgr = logging.getLogger('datalad.ext.next.archive_operations.zipfile')
 
 class ZipArchiveOperations(ArchiveOperations):
     """Handler for a ZIP archive on a local file system
+
+    Besides the standard API, this handler provides :meth:`read_many` and
+    :meth:`extract_many` for processing a set of archive members in
+    parallel. Each worker thread uses its own ``zipfile.ZipFile`` handle.
+    Such handles are opened lazily, and are kept in a pool for reuse
+    until the handler is closed. The number of pooled handles never
+    exceeds the largest number of workers used.
     """
     def __init__(self,
-                 location: Path,
+                 location: Path | str,
                  *,
                  cfg: ConfigManager | None = None,
                  **kwargs):
         """
         Parameters
         ----------
-        location: Path
+        location: Path or str
           ZIP archive location
         cfg: ConfigManager, optional
           A config manager instance that is consulted for any supported
@@ -56,26 +86,55 @@ class ZipArchiveOperations(ArchiveOperations):
         super().__init__(location, cfg=cfg)
 
         self.zipfile_kwargs = kwargs
-        # Consider supporting file-like for `location`,
-        # see zipfile.ZipFile(file_like_object)
-        self._zipfile_path = location
-        self._zipfile: zipfile.ZipFile | None = None
+        self._zipfile: ZipFile | None = None
+        # pool of additional handles for concurrent member access
+        self._pool_lock = threading.Lock()
+        self._pool_idle: list[ZipFile] = []
+        self._pool_all: list[ZipFile] = []
 
     @property
-    def zipfile(self) -> zipfile.ZipFile:
+    def zipfile(self) -> ZipFile:
         """Access to the wrapped ZIP archive as a ``zipfile.ZipFile``"""
         if self._zipfile is None:
-            self._zipfile = zipfile.ZipFile(
-                self._zipfile_path,
-                **self.zipfile_kwargs
-            )
+            self._zipfile = self._open_zipfile()
         return self._zipfile
 
     def close(self) -> None:
-        """Calls `.close()` on the underlying ``zipfile.ZipFile`` instance"""
+        """Calls `.close()` on all underlying ``zipfile.ZipFile`` instances"""
         if self._zipfile:
-            self._zipfile.close()
+            self._close_zipfile(self._zipfile)
             self._zipfile = None
+        with self._pool_lock:
+            for zf in self._pool_all:
+                self._close_zipfile(zf)
+            self._pool_all.clear()
+            self._pool_idle.clear()
+
+    def _open_zipfile(self) -> ZipFile:
+        # Consider supporting file-like for `location`,
+        # see zipfile.ZipFile(file_like_object)
+        return ZipFile(
+            Path(self._location),
+            **self.zipfile_kwargs
+        )
+
+    def _close_zipfile(self, zf: ZipFile) -> None:
+        zf.close()
+
+    @contextmanager
+    def _pooled_zipfile(self) -> Generator[ZipFile, None, None]:
+        """Get an exclusively used ``ZipFile`` handle from the pool"""
+        with self._pool_lock:
+            zf = self._pool_idle.pop() if self._pool_idle else None
+        if zf is None:
+            zf = self._open_zipfile()
+            with self._pool_lock:
+                self._pool_all.append(zf)
+        try:
+            yield zf
+        finally:
+            with self._pool_lock:
+                self._pool_idle.append(zf)
 
     @contextmanager
     def open(
@@ -100,7 +159,7 @@ class ZipArchiveOperations(ArchiveOperations):
 
         Parameters
         ----------
-        item: str | PurePosixPath | zipfile.ZipInfo
+        item: str | PurePosixPath | ZipInfo
           Name, path, or ZipInfo-instance that identifies an item in the
           zipfile
         kwargs: dict
@@ -115,6 +174,140 @@ class ZipArchiveOperations(ArchiveOperations):
         with self.zipfile.open(_anyzipid2membername(item), **kwargs) as fp:
             yield fp
 
+    def read_many(
+        self,
+        items: Iterable[str | PurePosixPath | ZipInfo],
+        *,
+        hash: list[str] | None = None,
+        max_workers: int | None = None,
+    ) -> Generator[tuple[str | PurePosixPath | ZipInfo, dict], None, None]:
+        """Read a set of archive members in parallel, and report on them
+
+        Each member is read completely, and any requested hashes are
+        computed for its content. Decompression of members happens in
+        parallel worker threads, each with its own ``ZipFile`` handle.
+
+        Parameters
+        ----------
+        items: iterable
+          Names, paths, or ZipInfo-instances that identify items in the
+          zipfile.
+        hash: list(algorithm_names), optional
+          If given, must be a list of hash algorithm names supported by the
+          ``hashlib`` module.
+        max_workers: int, optional
+          Maximum number of parallel worker threads. Defaults to the
+          number of CPUs.
+
+        Yields
+        ------
+        tuple
+          The item identifier, as given, and a mapping with the
+          ``content-length`` of the member, and a hexdigest for each
+          requested hash algorithm. Items are reported in the order
+          of completion, not in the order given.
+
+        Raises
+        ------
+        KeyError
+          If any item cannot be found in the archive.
+        """
+        yield from self._process_many(
+            ((item, None) for item in items),
+            hash=hash,
+            max_workers=max_workers,
+        )
+
+    def extract_many(
+        self,
+        items: Mapping[str | PurePosixPath | ZipInfo, Path],
+        *,
+        hash: list[str] | None = None,
+        max_workers: int | None = None,
+    ) -> Generator[tuple[str | PurePosixPath | ZipInfo, dict], None, None]:
+        """Extract a set of archive members to local files in parallel
+
+        Parameters
+        ----------
+        items: mapping
+          Mapping of item identifiers (see :meth:`read_many`) to local paths
+          the respective member content is written to. Any existing file at
+          a path is overwritten.
+        hash: list(algorithm_names), optional
+          If given, must be a list of hash algorithm names supported by the
+          ``hashlib`` module. Hashes are computed during extraction.
+        max_workers: int, optional
+          Maximum number of parallel worker threads. Defaults to the
+          number of CPUs.
+
+        Yields
+        ------
+        tuple
+          Like :meth:`read_many`.
+
+        Raises
+        ------
+        KeyError
+          If any item cannot be found in the archive.
+        """
+        yield from self._process_many(
+            items.items(),
+            hash=hash,
+            max_workers=max_workers,
+        )
+
+    def _process_many(
+        self,
+        items: Iterable[tuple[str | PurePosixPath | ZipInfo, Path | None]],
+        *,
+        hash: list[str] | None,
+        max_workers: int | None,
+    ) -> Generator[tuple[str | PurePosixPath | ZipInfo, dict], None, None]:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: set[Future] = set()
+            try:
+                for item, path in items:
+                    pending.add(executor.submit(
+                        self._copy_member, item, path, hash))
+                    # bounded lookahead, do not pile up futures for
+                    # huge item sets
+                    if len(pending) >= 2 * max_workers:
+                        done, pending = wait(
+                            pending, return_when=FIRST_COMPLETED)
+                        for f in done:
+                            yield f.result()
+                for f in as_completed(pending):
+                    yield f.result()
+            finally:
+                for f in pending:
+                    f.cancel()
+
+    def _copy_member(
+        self,
+        item: str | PurePosixPath | ZipInfo,
+        path: Path | None,
+        hash: list[str] | None,
+    ) -> tuple[str | PurePosixPath | ZipInfo, dict]:
+        hasher = MultiHash(hash) if hash else NoOpHash()
+        size = 0
+        with self._pooled_zipfile() as zf, \
+                zf.open(_anyzipid2membername(item)) as src_fp:
+            dst_fp = path.open('wb') if path is not None else None
+            try:
+                for chunk in iter(partial(src_fp.read, COPY_BUFSIZE), b''):
+                    hasher.update(chunk)
+                    if dst_fp:
+                        dst_fp.write(chunk)
+                    size += len(chunk)
+            finally:
+                if dst_fp:
+                    dst_fp.close()
+        props: dict[str, str | int] = dict(hasher.get_hexdigest())
+        props['content-length'] = size
+        return item, props
+
     def __contains__(self, item: str | PurePosixPath | ZipInfo) -> bool:
         try:
             self.zipfile.getinfo(_anyzipid2membername(item))
@@ -125,7 +318,76 @@ class ZipArchiveOperations(ArchiveOperations):
     def __iter__(self) -> Generator[ZipfileItem, None, None]:
         # if fp=True is needed, either `iter_zip()` can be used
         # directly, or `ZipArchiveOperations.open`
-        yield from iter_zip(self._zipfile_path, fp=False)
+        yield from iter_zip(Path(self._location), fp=False)
+
+
+class RemoteZipArchiveOperations(ZipArchiveOperations):
+    """Handler for a ZIP archive on an HTTP(S) server
+
+    The server must support HTTP range requests. The archive is never
+    downloaded as a whole. Only the central directory of the archive, and
+    the byte ranges of members that are actually accessed, are transferred.
+    This makes it possible to extract a single member from a very large
+    archive at minimal cost.
+
+    Archive access is implemented via
+    :meth:`~datalad_next.url_operations.HttpUrlOperations.open_seekable`.
+    """
+    def __init__(self,
+                 location: str,
+                 *,
+                 cfg: ConfigManager | None = None,
+                 credential: str | None = None,
+                 url_ops: HttpUrlOperations | None = None,
+                 **kwargs):
+        """
+        Parameters
+        ----------
+        location: str
+          http(s):// URL of the ZIP archive
+        cfg: ConfigManager, optional
+          A config manager instance that is consulted for any supported
+          configuration items
+        credential: str, optional
+          Name of a credential to be used for accessing the archive. If not
+          given, credentials are looked up automatically, if needed.
+        url_ops: HttpUrlOperations, optional
+          URL operations handler to use for archive access. If not given,
+          a new instance is created.
+        **kwargs: dict
+          Keyword arguments that are passed to zipfile.ZipFile-constructor
+        """
+        super().__init__(location, cfg=cfg, **kwargs)
+        self._credential = credential
+        self._url_ops = url_ops
+
+    def _open_zipfile(self) -> ZipFile:
+        # on first access, the archive's central directory is read from
+        # the server. each handle has its own remote file-like, and thereby
+        # its own connection
+        if self._url_ops is None:
+            self._url_ops = HttpUrlOperations(cfg=self.cfg)
+        fp = self._url_ops.open_seekable(
+            self._location,
+            credential=self._credential,
+        )
+        try:
+            return ZipFile(fp, **self.zipfile_kwargs)
+        except Exception:
+            fp.close()
+            raise
+
+    def _close_zipfile(self, zf: ZipFile) -> None:
+        # a ZipFile does not close a file-like it was given
+        fp = zf.fp
+        zf.close()
+        if fp:
+            fp.close()
+
+    def __iter__(self) -> Generator[ZipfileItem, None, None]:
+        # `iter_zip()` would read the central directory a second time
+        for zip_info in self.zipfile.infolist():
+            yield _get_zipfile_item(zip_info)
 
 
 def _anyzipid2membername(item: str | PurePosixPath | ZipInfo) -> str:
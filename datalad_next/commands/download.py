@@ -3,11 +3,22 @@
 
 __docformat__ = 'restructuredtext'
 
+from collections import (
+    defaultdict,
+    deque,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from logging import getLogger
 from pathlib import (
     Path,
     PurePosixPath,
 )
+import threading
 from urllib.parse import urlparse
 
 import datalad
@@ -30,10 +41,12 @@ from datalad_next.constraints import (
     EnsureChoice,
     EnsureDataset,
     EnsureGeneratorFromFileLike,
+    EnsureInt,
     EnsureJSON,
     EnsureListOf,
     EnsureMapping,
     EnsurePath,
+    EnsureRange,
     EnsureURL,
     EnsureValue,
     WithDescription,
@@ -78,9 +91,19 @@ class Download(ValidatedInterface):
     Simultaneous hashing (checksumming) of downloaded content is supported
     with user-specified algorithms.
 
-    The command can process any number of downloads (serially). it can read
-    download specifications from (command line) arguments, files, or STDIN.
-    It can deposit downloads to individual files, or stream to STDOUT.
+    The command can process any number of downloads, serially or
+    concurrently. it can read download specifications from (command line)
+    arguments, files, or STDIN. It can deposit downloads to individual files,
+    or stream to STDOUT.
+
+    With concurrent downloads, no more than
+    ``datalad.download.jobs-per-host`` downloads are performed from the same
+    host at the same time. Download specifications are read ahead of the
+    completed downloads only as far as needed to keep all workers busy.
+    Results are reported as downloads complete, unless the input order is to
+    be preserved. Credentials are looked up, or prompted for, by one download
+    at a time, and any other download in need of the same credential waits
+    for it.
 
     Implementation and extensibility
 
@@ -172,6 +195,7 @@ class Download(ValidatedInterface):
         # and/or credentials
         dataset=EnsureDataset(installed=True),
         force=force_choices | EnsureListOf(force_choices),
+        jobs=EnsureInt() & EnsureRange(min=1),
         # TODO EnsureCredential
         #credential=
         # TODO EnsureHashAlgorithm
@@ -228,6 +252,26 @@ class Download(ValidatedInterface):
             'hashlib' module, e.g. 'md5' or 'sha256'.
             [CMD: This option can be given more than once CMD]
             """),
+        resume=Parameter(
+            args=("--resume",),
+            action='store_true',
+            doc="""keep incomplete downloads, and continue them on a
+            subsequent run instead of starting over. Incomplete downloads are
+            kept in a '<path>.part' file, next to the download target path.
+            Downloads can only be continued for URL schemes and servers that
+            support it (e.g., HTTP servers with range request support),
+            other downloads start from the beginning."""),
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar='NJOBS',
+            doc="""number of downloads to perform concurrently. By default,
+            downloads are performed one after another."""),
+        preserve_order=Parameter(
+            args=("--preserve-order",),
+            action='store_true',
+            doc="""with concurrent downloads, report results in the order
+            of the download specification, rather than in the order in which
+            downloads complete."""),
     )
 
     _examples_ = [
@@ -243,6 +287,14 @@ class Download(ValidatedInterface):
          'datalad download --hash sha256 http://example.com/data.xml"',
          'code_py':
          'download("http://example.com/data.xml", hash=["sha256"])'},
+        {'text': 'Continue a previously interrupted download',
+         'code_cmd':
+         'datalad download --resume "http://example.com/big.tar"',
+         'code_py':
+         'download("http://example.com/big.tar", resume=True)'},
+        {'text': 'Download many files with up to 8 concurrent downloads',
+         'code_cmd': 'datalad download -J 8 urls.txt',
+         'code_py': 'download("urls.txt", jobs=8)'},
         {'text': 'Download from SSH server',
          'code_cmd': 'datalad download "ssh://example.com/home/user/data.xml"',
          'code_py': 'download("ssh://example.com/home/user/data.xml")'},
@@ -254,7 +306,7 @@ class Download(ValidatedInterface):
     @datasetmethod(name="download")
     @eval_results
     def __call__(spec, *, dataset=None, force=None, credential=None,
-                 hash=None):
+                 hash=None, resume=False, jobs=None, preserve_order=False):
         # which config to inspect for credentials etc
         cfg = dataset.ds.config if dataset else datalad.cfg
 
@@ -266,81 +318,191 @@ class Download(ValidatedInterface):
         # cache of already used handlers
         url_handler = AnyUrlOperations(cfg=cfg)
 
+        def do_download(url, dest):
+            return _download(
+                url_handler,
+                url,
+                dest,
+                credential=credential,
+                hash=ensure_list(hash),
+                resume=resume,
+            )
+
         # we are not running any tests upfront on the whole spec,
         # because the spec can be a generator and consume from a
         # long-running source (e.g. via stdin)
-        for item in spec:
-            if isinstance(item, CapturedException):
-                # the generator encountered an exception for a particular
-                # item and is relaying it as per instructions
-                # exc_mode='yield'. We report and move on. Outside
-                # flow logic will decide if processing continues
-                yield get_status_dict(
-                    action='download',
-                    status='impossible',
-                    exception=item,
-                )
-                continue
-
-            url, dest = item.popitem()
-            # we know that any URL has a scheme
-            if not url_handler.is_supported_url(url):
-                yield get_status_dict(
-                    action='download',
-                    status='error',
-                    message='unsupported URL '
-                    '(custom URL handlers can be declared via DataLad '
-                    'configuration)',
-                    url=url,
-                )
-                continue
-
-            # ready destination path
-            try:
-                dest = _prep_dest_path(dest, force)
-            except ValueError as e:
-                yield get_status_dict(
-                    action='download',
-                    status='error',
-                    exception=CapturedException(e),
-                    url=url,
-                    path=dest,
-                )
-                continue
-
-            try:
-                download_props = url_handler.download(
-                    url,
-                    dest,
-                    credential=credential,
-                    hash=ensure_list(hash),
-                )
-                res = get_status_dict(
-                    action='download',
-                    status='ok',
-                    url=url,
-                    path=dest,
-                )
-                # take the reported download properties (e.g. any computed
-                # hashes a a starting point, and overwrite any potentially
-                # conflicting keys with the standard ones)
-                res = dict(
-                    download_props,
-                    **res)
-                yield res
-            except Exception as e:
-                ce = CapturedException(e)
-                res = get_status_dict(
-                    action='download',
-                    status='error',
-                    message='download failure',
-                    url=url,
-                    path=dest,
-                    exception=ce,
-                )
-                if issubclass(type(e), UrlOperationsRemoteError):
-                    res['status_code'] = e.status_code
-                yield res
+        items = _prep_items(spec, url_handler, force)
+        if not jobs or jobs < 2:
+            for item in items:
+                yield item if isinstance(item, dict) else do_download(*item)
+            return
+
+        yield from _download_concurrently(
+            items,
+            do_download,
+            jobs=jobs,
+            jobs_per_host=cfg.obtain('datalad.download.jobs-per-host'),
+            preserve_order=preserve_order,
+        )
+
+
+def _prep_items(spec, url_handler, force):
+    """Yield (url, dest) tuples, or result records for invalid items"""
+    for item in spec:
+        if isinstance(item, CapturedException):
+            # the generator encountered an exception for a particular
+            # item and is relaying it as per instructions
+            # exc_mode='yield'. We report and move on. Outside
+            # flow logic will decide if processing continues
+            yield get_status_dict(
+                action='download',
+                status='impossible',
+                exception=item,
+            )
+            continue
+
+        url, dest = item.popitem()
+        # we know that any URL has a scheme
+        if not url_handler.is_supported_url(url):
+            yield get_status_dict(
+                action='download',
+                status='error',
+                message='unsupported URL '
+                '(custom URL handlers can be declared via DataLad '
+                'configuration)',
+                url=url,
+            )
+            continue
+
+        # ready destination path
+        try:
+            dest = _prep_dest_path(dest, force)
+        except ValueError as e:
+            yield get_status_dict(
+                action='download',
+                status='error',
+                exception=CapturedException(e),
+                url=url,
+                path=dest,
+            )
+            continue
+        yield url, dest
+
+
+def _download(url_handler, url, dest, **kwargs):
+    """Perform a single download and return a result record"""
+    try:
+        download_props = url_handler.download(url, dest, **kwargs)
+        res = get_status_dict(
+            action='download',
+            status='ok',
+            url=url,
+            path=dest,
+        )
+        # take the reported download properties (e.g. any computed
+        # hashes a a starting point, and overwrite any potentially
+        # conflicting keys with the standard ones)
+        res = dict(
+            download_props,
+            **res)
+        return res
+    except Exception as e:
+        ce = CapturedException(e)
+        res = get_status_dict(
+            action='download',
+            status='error',
+            message='download failure',
+            url=url,
+            path=dest,
+            exception=ce,
+        )
+        if issubclass(type(e), UrlOperationsRemoteError):
+            res['status_code'] = e.status_code
+        return res
+
+
+def _download_concurrently(items, do_download, *, jobs, jobs_per_host,
+                           preserve_order):
+    """Run downloads on a worker pool, and yield results as they complete
+
+    At most ``2 * jobs`` items are consumed from ``items`` ahead of the
+    results yielded, in order to keep memory demands bounded for long
+    (streamed) specifications.
+
+    Downloads from a host with ``jobs_per_host`` running downloads are
+    held back, and only submitted to the pool once one of them completes.
+    Workers never wait for a host to become available.
+    """
+    lookahead = 2 * jobs
+    # running downloads per host, and downloads held back per host.
+    # downloads to stdout (host `None`) must not be interleaved
+    running = defaultdict(int)
+    waiting = defaultdict(deque)
+    lock = threading.Lock()
+
+    def run(f, host, url, dest):
+        try:
+            f.set_result(do_download(url, dest))
+        except BaseException as e:
+            f.set_exception(e)
+        finally:
+            with lock:
+                if waiting[host]:
+                    # hand the slot over to the next download from this host
+                    next_f, next_url, next_dest = waiting[host].popleft()
+                    executor.submit(run, next_f, host, next_url, next_dest)
+                else:
+                    running[host] -= 1
+
+    pending = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=jobs,
+        thread_name_prefix='download',
+    )
+    try:
+        for item in items:
+            f = Future()
+            if isinstance(item, dict):
+                # a result for an invalid item
+                f.set_result(item)
+            else:
+                url, dest = item
+                host = None if dest is None else urlparse(url).netloc
+                with lock:
+                    if running[host] < (1 if host is None else jobs_per_host):
+                        running[host] += 1
+                        executor.submit(run, f, host, url, dest)
+                    else:
+                        waiting[host].append((f, url, dest))
+            pending.append(f)
+            yield from _pop_results(pending, preserve_order, lookahead)
+        yield from _pop_results(pending, preserve_order, 0)
+    finally:
+        with lock:
+            # nothing must be submitted after shutdown
+            waiting.clear()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _pop_results(pending, preserve_order, lookahead):
+    """Yield results of completed downloads from ``pending``
+
+    Blocks until no more than ``lookahead`` downloads are pending.
+    """
+    while pending:
+        if preserve_order:
+            if len(pending) <= lookahead and not pending[0].done():
+                return
+            yield pending.popleft().result()
+            continue
+        done = [f for f in pending if f.done()]
+        if not done:
+            if len(pending) <= lookahead:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            pending.remove(f)
+            yield f.result()
 
 
 def _prep_dest_path(dest, force):
@@ -48,6 +48,9 @@ from datalad_next.uis import (
 )
 from datalad_next.utils import ensure_list
 
+from datalad_next.archive_operations import RemoteZipArchiveOperations
+from datalad_next.shell import posix
+
 from datalad_next.iter_collections import (
     FileSystemItemType,
     GitTreeItemType,
@@ -57,6 +60,7 @@ from datalad_next.iter_collections import (
     iter_dir,
     iter_gittree,
     iter_gitworktree,
+    iter_sshdir,
     iter_tar,
     iter_zip,
 )
@@ -71,6 +75,7 @@ lgr = getLogger('datalad.local.ls_file_collection')
 # code, and some iterators may not even be about *file* collections
 _supported_collection_types = (
     'directory',
+    'ssh-directory',
     'tarfile',
     'zipfile',
     'gittree',
@@ -114,6 +119,48 @@ class LsFileCollectionParamValidator(EnsureCommandParameterization):
         hash = kwargs['hash']
         iter_fx = None
         iter_kwargs = None
+        if type == 'zipfile' and not isinstance(collection, Path):
+            if not collection.startswith(('http://', 'https://')):
+                self.raise_for(
+                    kwargs,
+                    "{type} collection requires a Path-type identifier, "
+                    "or a http(s):// URL",
+                    type=type,
+                )
+            return dict(
+                collection=CollectionSpec(
+                    orig_id=collection,
+                    iter=iter_remote_zip(collection, fp=hash is not None),
+                    item2res=fsitem_to_dict),
+            )
+        if type == 'ssh-directory':
+            if isinstance(collection, Path) \
+                    or not collection.startswith('ssh://'):
+                self.raise_for(
+                    kwargs,
+                    "{type} collection requires an ssh:// URL",
+                    type=type,
+                )
+            unsupported = sorted(
+                set(ensure_list(hash)).difference(posix.hash_commands))
+            if unsupported:
+                # hashes are computed with tools on the remote host
+                self.raise_for(
+                    kwargs,
+                    "{type} collection does not support hash "
+                    "algorithm(s) {unsupported}",
+                    type=type,
+                    unsupported=unsupported,
+                )
+            return dict(
+                collection=CollectionSpec(
+                    orig_id=collection,
+                    iter=iter_sshdir(
+                        collection,
+                        hash=ensure_list(hash) if hash is not None else None,
+                    ),
+                    item2res=sshdiritem_to_dict),
+            )
         if type in ('directory', 'tarfile', 'zipfile', 'gitworktree', 'annexworktree'):
             if not isinstance(collection, Path):
                 self.raise_for(
@@ -166,6 +213,22 @@ class LsFileCollectionParamValidator(EnsureCommandParameterization):
         )
 
 
+def iter_remote_zip(url: str, *, fp: bool = False) -> Iterator:
+    """Like ``iter_zip()``, but for a ZIP archive on an HTTP(S) server
+
+    Only the central directory, and the content of members (with ``fp=True``)
+    is transferred, via HTTP range requests.
+    """
+    with RemoteZipArchiveOperations(url) as archive:
+        for item in archive:
+            if fp and item.type == FileSystemItemType.file:
+                with archive.open(item.name) as amfp:
+                    item.fp = amfp
+                    yield item
+            else:
+                yield item
+
+
 def fsitem_to_dict(item, hash) -> Dict:
     keymap = {'name': 'item'}
     # FileSystemItemType is too fine-grained to be used as result type
@@ -201,6 +264,15 @@ def fsitem_to_dict(item, hash) -> Dict:
     return d
 
 
+def sshdiritem_to_dict(item, hash) -> Dict:
+    d = fsitem_to_dict(item, hash)
+    # the hashes were computed on the remote host, report them like
+    # locally computed ones
+    for hname, hdigest in (d.pop('hashes') or {}).items():
+        d[f'hash-{hname}'] = hdigest
+    return d
+
+
 def gittreeitem_to_dict(item, hash) -> Dict:
     gittreeitem_type_to_res_type = {
         # permission bits are not distinguished for types
@@ -323,6 +395,14 @@ class LsFileCollection(ValidatedInterface):
       Like ``gitworktree``, but amends the reported items with git-annex
       information, such as ``annexkey``, ``annexsize``, and ``annnexobjpath``.
 
+    ``ssh-directory``
+      Like ``directory``, for a directory on a remote host. The collection
+      identifier is an ``ssh://`` URL of the directory. The listing is
+      performed by ``find`` on the remote host (requires support for
+      ``-printf``), and hashes are computed on the remote host too, without
+      transferring file content. Parallel hashing can be configured with
+      ``datalad.ssh.hash-jobs``.
+
     ``tarfile``
       Reports on members of a TAR archive. The collection identifier is the
       path of the TAR file. Item identifiers are the relative paths
@@ -335,7 +415,11 @@ class LsFileCollection(ValidatedInterface):
       result is yielded. PY]
 
     ``zipfile``
-      Like ``tarfile`` for reporting on ZIP archives.
+      Like ``tarfile`` for reporting on ZIP archives. The collection identifier
+      can also be an ``http(s)://`` URL of a ZIP archive on a server that
+      supports HTTP range requests. In this case, only the archive's
+      central directory (and member content, when hashes are computed)
+      is transferred, rather than the entire archive.
     """
     _validator_ = LsFileCollectionParamValidator()
 
@@ -1,5 +1,6 @@
 from io import StringIO
 import json
+import threading
 import pytest
 
 import datalad
@@ -11,6 +12,7 @@ from datalad_next.tests import (
     assert_result_count,
     assert_status,
 )
+from datalad_next.commands.download import _download_concurrently
 from datalad_next.utils import chpwd
 
 from datalad_next.utils import CredentialManager
@@ -64,12 +66,68 @@ def test_download(tmp_path, http_server, no_result_rendering):
 
     assert (wdir / 'testfile2.txt').read_text() == 'test'
 
+    # a resumable download leaves no partial download behind
+    with chpwd(wdir):
+        download(f'{srvurl}testfile.txt testfile3.txt', resume=True)
+    assert (wdir / 'testfile3.txt').read_text() == 'test'
+    assert not (wdir / 'testfile3.txt.part').exists()
+    assert not (wdir / 'testfile3.txt.part.json').exists()
+
     # non-existing download source
     assert_result_count(
         download(f'{srvurl}nothere', on_failure='ignore'),
         1, status='error', message='download failure')
 
 
+def test_download_jobs(tmp_path, http_server, no_result_rendering):
+    srvurl = http_server.url
+    for i in range(10):
+        (http_server.path / f'file{i}.txt').write_text(f'content{i}')
+    spec = [{f'{srvurl}file{i}.txt': tmp_path / f'file{i}.txt'}
+            for i in range(10)]
+    # one non-existing download source
+    spec.insert(3, {f'{srvurl}nothere': tmp_path / 'nothere'})
+    res = download(spec, jobs=3, preserve_order=True, on_failure='ignore')
+    assert [r['url'] for r in res] == [list(s)[0] for s in spec]
+    assert_result_count(res, 10, status='ok')
+    assert_result_count(res, 1, status='error', url=f'{srvurl}nothere')
+    for i in range(10):
+        assert (tmp_path / f'file{i}.txt').read_text() == f'content{i}'
+
+    # unordered reporting yields the same results
+    spec = [{f'{srvurl}file{i}.txt': tmp_path / 'unordered' / f'file{i}.txt'}
+            for i in range(10)]
+    res = download(spec, jobs=4)
+    assert sorted(r['url'] for r in res) == \
+        sorted(list(s)[0] for s in spec)
+
+
+def test_download_concurrently_host_limit():
+    other_host_done = threading.Event()
+    running = {'a': 0, 'b': 0}
+    lock = threading.Lock()
+
+    def do_download(url, dest):
+        host = url.split('/')[2]
+        with lock:
+            running[host] += 1
+            assert running[host] == 1
+        if url == 'http://a/1':
+            # only completes, if the download from the other host is not
+            # stuck behind the second download from this host
+            assert other_host_done.wait(timeout=10)
+        elif url == 'http://b/1':
+            other_host_done.set()
+        with lock:
+            running[host] -= 1
+        return dict(url=url)
+
+    items = [(u, u) for u in ('http://a/1', 'http://a/2', 'http://b/1')]
+    res = list(_download_concurrently(
+        items, do_download, jobs=2, jobs_per_host=1, preserve_order=True))
+    assert [r['url'] for r in res] == [i[0] for i in items]
+
+
 def test_download_invalid_calls(monkeypatch, no_result_rendering):
     # unsupported url scheme, only detected when actually calling
     # a handler inside, hence error result
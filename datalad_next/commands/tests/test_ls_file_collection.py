@@ -7,11 +7,18 @@ import pytest
 from datalad.api import ls_file_collection
 
 from datalad_next.constraints import CommandParametrizationError
+from datalad_next.iter_collections import (
+    FileSystemItemType,
+    SshDirectoryItem,
+)
 # we need this fixture
 from datalad_next.iter_collections.tests.test_iterzip import sample_zip
 from datalad_next.tests import skipif_no_network
 
-from ..ls_file_collection import LsFileCollectionParamValidator
+from ..ls_file_collection import (
+    LsFileCollectionParamValidator,
+    sshdiritem_to_dict,
+)
 
 
 def test_ls_file_collection_insufficient_args():
@@ -28,6 +35,15 @@ def test_ls_file_collection_insufficient_args():
     with pytest.raises(CommandParametrizationError):
         ls_file_collection('tarfile', 'http://example.com')
 
+    # ...and ssh-directory an ssh:// URL
+    with pytest.raises(CommandParametrizationError):
+        ls_file_collection('ssh-directory', 'http://example.com')
+
+    # ...and hash algorithms that are supported on the remote host
+    with pytest.raises(CommandParametrizationError):
+        ls_file_collection('ssh-directory', 'ssh://localhost/tmp',
+                           hash=['md5', 'sha3_256'])
+
     # not a known collection type
     with pytest.raises(CommandParametrizationError):
         ls_file_collection('bogus', 'http://example.com')
@@ -97,6 +113,23 @@ def test_ls_file_collection_validator():
         val.get_collection_iter(type='bogus', collection='any', hash=None)
 
 
+def test_sshdiritem_to_dict():
+    item = SshDirectoryItem(
+        name='file',
+        type=FileSystemItemType.file,
+        size=9,
+        hashes={'md5': 'abc'},
+    )
+    for i in range(2):
+        res = sshdiritem_to_dict(item, ['md5'])
+        assert res['item'] == 'file'
+        assert res['type'] == 'file'
+        assert res['hash-md5'] == 'abc'
+        assert 'hashes' not in res
+    # the item is not modified
+    assert item.hashes == {'md5': 'abc'}
+
+
 @skipif_no_network
 def test_replace_add_archive_content(sample_tar_xz, existing_dataset,
                                      no_result_rendering):
@@ -212,3 +245,21 @@ def test_ls_annexworktree_simple_dataset(existing_dataset):
         'annexsize',
         'annexobjpath'
     }.issubset(set(annexed_files[0].keys()))
+
+
+def test_ls_file_collection_remote_zipfile(
+        sample_zip, credman, webdav_credential, webdav_server,
+        no_result_rendering):
+    # credential auto-lookup by realm
+    credman.set(**webdav_credential, realm=f'{webdav_server.url}/')
+    (webdav_server.path / 'sample.zip').write_bytes(sample_zip.read_bytes())
+    url = f'{webdav_server.url}/sample.zip'
+    res = ls_file_collection('zipfile', url, hash='md5')
+    assert len(res) == 4
+    for r in res:
+        _check_archive_member_result(r, url)
+        if r['type'] == 'file':
+            assert r['hash-md5'] == 'd700214df5487801e8ee23d31e60382a'
+    # only http(s) URLs are supported
+    with pytest.raises(CommandParametrizationError):
+        ls_file_collection('zipfile', 'ftp://example.com/some.zip')
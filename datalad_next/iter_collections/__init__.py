@@ -19,6 +19,7 @@ collections.
 
    iter_annexworktree
    iter_dir
+   iter_sshdir
    iter_gitdiff
    iter_gitstatus
    iter_gittree
@@ -30,6 +31,7 @@ collections.
    ZipfileItem
    FileSystemItem
    FileSystemItemType
+   SshDirectoryItem
    GitTreeItemType
    GitWorktreeItem
    GitWorktreeFileSystemItem
@@ -57,6 +59,11 @@ from .utils import (
     compute_multihash_from_fp,
 )
 from .directory import iter_dir
+from .sshdirectory import (
+    # TODO move to datalad_next.types?
+    SshDirectoryItem,
+    iter_sshdir,
+)
 from .gittree import (
     # TODO move to datalad_next.types?
     GitTreeItemType,
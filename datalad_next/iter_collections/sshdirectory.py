@@ -0,0 +1,192 @@
+"""Report on the content of directories on SSH-accessible hosts
+
+The main functionality is provided by the :func:`iter_sshdir()` function.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import PurePosixPath
+from shlex import quote as posix_quote
+import stat
+from typing import (
+    Dict,
+    Generator,
+    List,
+)
+
+from datalad_next.config import ConfigManager
+from datalad_next.shell import (
+    ShellCommandExecutor,
+    VariableLengthResponseGeneratorPosix,
+    posix,
+    shell,
+)
+from datalad_next.shell.shell import ExecutionResult
+
+from .utils import (
+    FileSystemItem,
+    FileSystemItemType,
+)
+
+
+# output format for `find -printf`: type, size, mtime, permissions, uid, gid,
+# name, link target -- each terminated by a NUL byte
+_find_format = r'%y\0%s\0%T@\0%m\0%U\0%G\0%f\0%l\0'
+_find_nfields = 8
+
+# `find` type indicators, and their item types and file type mode bits
+_find_types = {
+    b'f': (FileSystemItemType.file, stat.S_IFREG),
+    b'd': (FileSystemItemType.directory, stat.S_IFDIR),
+    b'l': (FileSystemItemType.symlink, stat.S_IFLNK),
+    b'p': (FileSystemItemType.specialfile, stat.S_IFIFO),
+    b's': (FileSystemItemType.specialfile, stat.S_IFSOCK),
+    b'c': (FileSystemItemType.specialfile, stat.S_IFCHR),
+    b'b': (FileSystemItemType.specialfile, stat.S_IFBLK),
+}
+
+
+@dataclass  # sadly PY3.10+ only (kw_only=True)
+class SshDirectoryItem(FileSystemItem):
+    name: str
+    """Names of items are reported in POSIX form, relative to the directory.
+    """
+    link_target: str | None = None
+    """Just as for ``name``, a link target is also reported in POSIX
+    format."""
+    hashes: Dict[str, str] | None = None
+    """Mapping of hash algorithm names to hexdigests of the item content,
+    computed on the remote host."""
+
+    @cached_property
+    def path(self) -> PurePosixPath:
+        """Returns the item name as a ``PurePosixPath`` instance"""
+        return PurePosixPath(self.name)
+
+    @cached_property
+    def link_target_path(self) -> PurePosixPath | None:
+        """Returns the link_target as a ``PurePosixPath`` instance"""
+        return PurePosixPath(self.link_target) \
+            if self.link_target is not None else None
+
+
+def iter_sshdir(
+    url: str,
+    *,
+    hash: List[str] | None = None,
+    hash_jobs: int | None = None,
+    cfg: ConfigManager | None = None,
+) -> Generator[SshDirectoryItem, None, None]:
+    """Report on the content of a directory on a remote host via SSH
+
+    This is the remote counterpart of
+    :func:`~datalad_next.iter_collections.directory.iter_dir()`. A single
+    SSH connection is opened (see :func:`datalad_next.shell.shell`), the
+    directory is listed by ``find`` on the remote host, and the listing is
+    parsed while it is received. Content hashes are computed on the remote
+    host as well, no file content is transferred.
+
+    The remote host must provide a ``find`` that supports ``-printf``
+    (e.g. GNU findutils), and for hashing, the tools required by
+    :func:`datalad_next.shell.operations.posix.hash_files`.
+
+    Parameters
+    ----------
+    url: str
+      ``ssh://`` URL of the directory to report content for. The same
+      URL conventions and SSH configuration as for
+      :class:`~datalad_next.url_operations.SshUrlOperations` apply.
+    hash: list(str), optional
+      Names of hash algorithms to compute for all file-type items, e.g.
+      ``md5`` or ``sha256``.
+    hash_jobs: int, optional
+      Number of hashing processes to run in parallel on the remote host.
+      By default, the ``datalad.ssh.hash-jobs`` configuration is used.
+    cfg: ConfigManager, optional
+      Config manager to consult for SSH configuration.
+
+    Yields
+    ------
+    :class:`SshDirectoryItem`
+      With hashes requested, items are reported after the hashes of all
+      files were computed.
+
+    Raises
+    ------
+    CommandError
+      If the directory cannot be listed.
+    """
+    # imported here, the URL handlers are not needed for any other
+    # collection type
+    from datalad_next.url_operations.ssh import ssh_url2openargs
+
+    if cfg is None:
+        import datalad
+        cfg = datalad.cfg
+
+    ssh_args, parsed = ssh_url2openargs(url, cfg)
+    path = PurePosixPath(parsed.path)
+    with shell(['ssh'] + ssh_args) as ssh:
+        if not hash:
+            yield from _iter_find(ssh, path)
+            return
+        # hashes are computed after the listing, keep the items meanwhile
+        items = list(_iter_find(ssh, path))
+        hashes = posix.hash_files(
+            ssh,
+            (
+                path / i.name for i in items
+                if i.type == FileSystemItemType.file
+            ),
+            hash,
+            jobs=hash_jobs if hash_jobs is not None
+            else cfg.obtain('datalad.ssh.hash-jobs'),
+        )
+        for item in items:
+            item.hashes = hashes.get(path / item.name)
+            yield item
+
+
+def _iter_find(
+    ssh: ShellCommandExecutor,
+    path: PurePosixPath,
+) -> Generator[SshDirectoryItem, None, None]:
+    command = (
+        f'find {posix_quote(str(path))} -mindepth 1 -maxdepth 1 '
+        f"-printf '{_find_format}'"
+    )
+    response_generator = VariableLengthResponseGeneratorPosix(ssh.stdout)
+    fields: list[bytes] = []
+    remainder = b''
+    for chunk in ssh.start(command, response_generator=response_generator):
+        *complete, remainder = (remainder + chunk).split(b'\0')
+        for field in complete:
+            fields.append(field)
+            if len(fields) == _find_nfields:
+                yield _fields_to_item(fields)
+                fields = []
+    stderr = b''.join(response_generator.stderr_deque)
+    response_generator.stderr_deque.clear()
+    ExecutionResult(
+        stdout=b'',
+        stderr=stderr,
+        returncode=response_generator.returncode,
+    ).to_exception(command, 'directory listing failed')
+
+
+def _fields_to_item(fields: list[bytes]) -> SshDirectoryItem:
+    ftype, size, mtime, perms, uid, gid, name, link_target = fields
+    itype, mode = _find_types.get(ftype, (FileSystemItemType.specialfile, 0))
+    return SshDirectoryItem(
+        name=name.decode(errors='surrogateescape'),
+        type=itype,
+        size=int(size),
+        mtime=float(mtime),
+        mode=mode | int(perms, 8),
+        uid=int(uid),
+        gid=int(gid),
+        link_target=link_target.decode(errors='surrogateescape')
+        if itype == FileSystemItemType.symlink else None,
+    )
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from datalad_next.exceptions import CommandError
+from datalad_next.shell import shell
+from datalad_next.tests import skip_if_on_windows
+
+from ..directory import iter_dir
+from ..sshdirectory import (
+    FileSystemItemType,
+    iter_sshdir,
+)
+# we need this fixture
+from .test_iterdir import dir_tree
+
+
+@pytest.fixture
+def local_shell(monkeypatch):
+    # run a local shell instead of connecting to a remote host
+    import datalad_next.iter_collections.sshdirectory
+    monkeypatch.setattr(
+        datalad_next.iter_collections.sshdirectory,
+        'shell',
+        lambda args: shell(['bash']),
+    )
+
+
+@skip_if_on_windows
+def test_iter_sshdir(dir_tree, local_shell):
+    url = f'ssh://localhost{dir_tree}'
+    items = {i.name: i for i in iter_sshdir(url)}
+    # same properties as reported for the local directory
+    for local_item in iter_dir(dir_tree):
+        item = items.pop(local_item.name.name)
+        assert item.type == local_item.type
+        assert item.mode == local_item.mode
+        assert item.uid == local_item.uid
+        assert item.gid == local_item.gid
+        assert item.mtime == pytest.approx(local_item.mtime)
+        if item.type == FileSystemItemType.file:
+            assert item.size == local_item.size
+        if item.type == FileSystemItemType.symlink:
+            assert item.link_target == os.readlink(local_item.name)
+        assert item.hashes is None
+    assert not items
+
+    target_hash = dict(md5='9893532233caff98cd083a116b013c0b',
+                       sha1='94e66df8cd09d410c62d9e0dc59d3a884e458e05')
+    for jobs in (1, 2):
+        items = {
+            i.name: i
+            for i in iter_sshdir(url, hash=['md5', 'sha1'], hash_jobs=jobs)
+        }
+        assert items['random_file1.txt'].hashes == target_hash
+        assert items['some_dir'].hashes is None
+
+    with pytest.raises(CommandError):
+        list(iter_sshdir(f'ssh://localhost{dir_tree}/nonexistent'))
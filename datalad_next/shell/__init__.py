@@ -123,6 +123,12 @@ the final command list and to parse the result. Users can override this on a
 per-call basis by providing a different response generator class in the
 ``response_generator``-parameter of :meth:`ShellCommandExecutor.__call__`.
 
+Commands can also be pipelined, i.e. sent to the shell before the responses
+of previously sent commands were read, via
+:meth:`ShellCommandExecutor.submit` and :meth:`ShellCommandExecutor.pipeline`.
+The shell executes them in order, and their responses are read in the same
+order. For remote shells, this saves one round-trip per command.
+
 Examples
 --------
 
@@ -148,9 +154,14 @@ API overview
    FixedLengthResponseGeneratorPowerShell
    DownloadResponseGenerator
    DownloadResponseGeneratorPosix
+   CompressedDownloadResponseGeneratorPosix
    operations.posix.upload
+   operations.posix.upload_many
    operations.posix.download
+   operations.posix.download_many
    operations.posix.delete
+   operations.posix.hash_files
+   operations.posix.get_compression_methods
 """
 
 
@@ -166,6 +177,7 @@ from .shell import (
 
 from .operations import posix
 from .operations.posix import (
+    CompressedDownloadResponseGeneratorPosix,
     DownloadResponseGenerator,
     DownloadResponseGeneratorPosix,
 )
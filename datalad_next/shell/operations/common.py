@@ -4,7 +4,10 @@ from abc import ABCMeta
 from datasalad.iterable_subprocess.iterable_subprocess import OutputFrom
 from logging import getLogger
 
-from ..response_generators import ShellCommandResponseGenerator
+from ..response_generators import (
+    ShellCommandResponseGenerator,
+    ShellOutput,
+)
 
 
 lgr = getLogger('datalad.ext.next.shell.operations')
@@ -21,7 +24,7 @@ class DownloadResponseGenerator(ShellCommandResponseGenerator, metaclass=ABCMeta
     creation of the appropriate final command list to its subclasses.
     """
     def __init__(self,
-                 stdout: OutputFrom,
+                 stdout: OutputFrom | ShellOutput,
                  ) -> None:
         super().__init__(stdout, stdout.stderr_deque)
         self.length = 0
@@ -59,6 +62,7 @@ class DownloadResponseGenerator(ShellCommandResponseGenerator, metaclass=ABCMeta
                 # a negative length indicates an error during download length
                 # determination or download length-communication.
                 if self.length < 0:
+                    self._complete_response(chunk, self.stdout_gen)
                     self.state = 1
                     self.returncode = 23
                     raise StopIteration
@@ -70,7 +74,8 @@ class DownloadResponseGenerator(ShellCommandResponseGenerator, metaclass=ABCMeta
                     self.returncode_chunk,
                     self.stdout_gen,
                 )
-                if trailing:
+                if not self._complete_response(trailing, self.stdout_gen) \
+                        and trailing:
                     lgr.warning(
                         'unexpected output after return code: %s',
                         repr(trailing))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from pathlib import (
     Path,
     PurePosixPath,
@@ -10,11 +11,24 @@ from shlex import quote as posix_quote
 from typing import (
     BinaryIO,
     Callable,
+    Generator,
+    Iterable,
+    Protocol,
 )
+import zlib
+
+from more_itertools import consume
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    # optional dependency
+    zstandard = None
 
 from .common import DownloadResponseGenerator
 from ..shell import (
     ExecutionResult,
+    PendingExecutionResult,
     ShellCommandExecutor,
     create_result,
 )
@@ -24,15 +38,60 @@ from datalad_next.consts import COPY_BUFSIZE
 __all__ = [
     'DownloadResponseGenerator',
     'DownloadResponseGeneratorPosix',
+    'CompressedDownloadResponseGeneratorPosix',
     'upload',
+    'upload_many',
     'download',
+    'download_many',
     'delete',
+    'hash_files',
+    'get_compression_methods',
+    'compress_chunks',
+    'frame_chunks',
 ]
 
 
 lgr = logging.getLogger("datalad.ext.next.shell.operations")
 
 
+# names of hash algorithms (as used by `hashlib`) and the coreutils
+# commands that compute them
+hash_commands = {
+    'md5': 'md5sum',
+    'sha1': 'sha1sum',
+    'sha224': 'sha224sum',
+    'sha256': 'sha256sum',
+    'sha384': 'sha384sum',
+    'sha512': 'sha512sum',
+    'blake2b': 'b2sum',
+}
+
+
+# transfer compression methods, in order of preference, and the commands
+# that compress and decompress in the connected shell
+compression_commands = {
+    'zstd': ('zstd -cq', 'zstd -dcq'),
+    'gzip': ('gzip -c', 'gzip -dc'),
+}
+
+# a shell loop that reads chunks, as produced by `frame_chunks()`, from stdin
+# and writes their content to stdout
+read_frames_command = (
+    'while IFS= read -r n && [ "$n" -gt 0 ]; do head -c "$n"; done'
+)
+
+
+class _Decompressor(Protocol):
+    """Interface of the decompression objects of ``zlib`` and ``zstandard``"""
+    @property
+    def eof(self) -> bool: ...
+
+    @property
+    def unused_data(self) -> bytes: ...
+
+    def decompress(self, data: bytes) -> bytes: ...
+
+
 class DownloadResponseGeneratorPosix(DownloadResponseGenerator):
     """A response generator for efficient download commands from Linux systems"""
 
@@ -70,12 +129,108 @@ class DownloadResponseGeneratorPosix(DownloadResponseGenerator):
         return command
 
 
+class CompressedDownloadResponseGeneratorPosix(DownloadResponseGenerator):
+    """A response generator for compressed download from Linux systems
+
+    The file content is compressed in the connected shell, and decompressed
+    while it is received. The shell sends ``<length>\\n`` (the uncompressed
+    size), the compressed content of the file, and ``<return code>\\n``. The
+    end of the compressed content is determined by the decompressor.
+    Chunks that are yielded by this generator contain uncompressed content.
+    """
+    def __init__(self,
+                 stdout,
+                 compression: str,
+                 ) -> None:
+        """
+        Parameters
+        ----------
+        stdout
+            The output of the shell.
+        compression : str
+            The compression method, one of ``zstd`` or ``gzip``. It must be
+            supported locally and in the connected shell (see
+            :func:`get_compression_methods`).
+        """
+        super().__init__(stdout)
+        self.compression = compression
+        # created for each file, when its compressed content starts
+        self.decompressor: _Decompressor | None = None
+        self.pending_chunk = b''
+
+    def get_final_command(self, remote_file_name: bytes) -> bytes:
+        """Return a final command list for the download of ``remote_file_name``
+
+        See :meth:`DownloadResponseGeneratorPosix.get_final_command`.
+        """
+        command = b"""
+            test -r {remote_file_name}
+            if [ $? -eq 0 ]; then
+                LC_ALL=C ls -dln -- {remote_file_name} | awk '{print $5; exit}'
+                {compress} -- {remote_file_name}
+                echo $?
+            else
+                echo -1;
+            fi
+        """.replace(
+            b'{compress}', compression_commands[self.compression][0].encode()
+        ).replace(b'{remote_file_name}', remote_file_name)
+        return command
+
+    def send(self, _) -> bytes:
+        while True:
+            if self.state == 2:
+                chunk = self.pending_chunk or next(self.stdout_gen)
+                self.pending_chunk = b''
+                assert self.decompressor is not None
+                data = self.decompressor.decompress(chunk)
+                if self.decompressor.eof:
+                    self.returncode_chunk = self.decompressor.unused_data
+                    self.decompressor = None
+                    self.state = 3
+                if data:
+                    self.read += len(data)
+                    return data
+                continue
+
+            if self.state == 1:
+                self.length, chunk = self._get_number_and_newline(
+                    b'',
+                    self.stdout_gen,
+                )
+                if self.length < 0:
+                    self._complete_response(chunk, self.stdout_gen)
+                    self.returncode = 23
+                    raise StopIteration
+                self.decompressor = _get_decompressobj(self.compression)
+                self.pending_chunk = chunk
+                self.read = 0
+                self.state = 2
+                continue
+
+            if self.state == 3:
+                self.returncode, trailing = self._get_number_and_newline(
+                    self.returncode_chunk,
+                    self.stdout_gen,
+                )
+                if not self._complete_response(trailing, self.stdout_gen) \
+                        and trailing:
+                    lgr.warning(
+                        'unexpected output after return code: %s',
+                        repr(trailing))
+                self.state = 1
+                raise StopIteration
+
+            raise RuntimeError(f'unknown state: {self.state}')
+
+
 def upload(
     shell: ShellCommandExecutor,
     local_path: Path,
     remote_path: PurePosixPath,
     *,
     progress_callback: Callable[[int, int], None] | None = None,
+    compression: str | None = None,
     check: bool = False,
 ) -> ExecutionResult:
     """Upload a local file to a named file in the connected shell
@@ -100,6 +255,10 @@ def upload(
     progress_callback : callable[[int, int], None], optional, default: None
         If given, the callback is called with the number of bytes that have
         been sent and the total number of bytes that should be sent.
+    compression : str | None, optional, default: None
+        If given, the content is sent compressed with this method, and
+        decompressed in the connected shell, see
+        :func:`get_compression_methods`.
     check : bool, optional, default: False
         If ``True``, raise a :class:`CommandError` if the remote operation does
         not exit with a ``0`` as return code.
@@ -157,10 +316,16 @@ def upload(
     # next command, and that might be bad, e.g. if the uploaded content was
     # `rm -rf $HOME`.
     file_size = local_path.stat().st_size
-    cmd_line = (
-        f'head -c {file_size} > {posix_quote(str(remote_path))}'
-        f"|| (head -c {file_size} > /dev/null; test 1 == 2)"
-    )
+    if compression is None:
+        cmd_line = _get_upload_command(file_size, remote_path)
+    else:
+        # the compressed size is not known upfront, send framed chunks
+        decompress = compression_commands[compression][1]
+        cmd_line = (
+            f'{read_frames_command} | {{ {decompress} > '
+            f'{posix_quote(str(remote_path))} '
+            '|| { cat > /dev/null; test 1 == 2; }; }'
+        )
     with local_path.open("rb") as local_file:
         # We use the `signaling_read` iterator to deal with the situation where
         # the content of a file that should be uploaded is completely read and
@@ -173,15 +338,107 @@ def upload(
         # render it unusable.`signaling_read` allows us to wait for a completed
         # read, including the EOF reading.
         signal_queue: Queue = Queue()
-        result = shell(
-            cmd_line, stdin=signaling_read(local_file, file_size, signal_queue)
-        )
+        stdin: Iterable[bytes] = signaling_read(
+            local_file, file_size, signal_queue)
+        if compression is not None:
+            stdin = frame_chunks(compress_chunks(stdin, compression))
+        result = shell(cmd_line, stdin=stdin)
         signal_queue.get()
     if check:
         result.to_exception(cmd_line, 'upload failed')
     return result
 
 
+def upload_many(
+    shell: ShellCommandExecutor,
+    files: Iterable[tuple[Path, PurePosixPath]],
+    *,
+    progress_callback: Callable[[PurePosixPath, int, int], None] | None = None,
+    max_pending: int = 64,
+    check: bool = False,
+) -> list[ExecutionResult]:
+    """Upload a number of local files to named files in the connected shell
+
+    This function performs the same operation as :func:`upload` for every
+    file in ``files``. The upload commands are submitted to the shell
+    without waiting for the response of the previous upload (see
+    :meth:`ShellCommandExecutor.submit`). Uploading many small files
+    therefore does not cost one round-trip to the connected shell per file.
+
+    The requirements for upload_many are the same as for :func:`upload`.
+
+    Parameters
+    ----------
+    shell : ShellCommandExecutor
+        The shell that should be used to upload the files.
+    files : Iterable[tuple[Path, PurePosixPath]]
+        Pairs of the path of a local file that should be uploaded, and the
+        path of the file on the connected shell that will contain the
+        uploaded content.
+    progress_callback : callable[[PurePosixPath, int, int], None], optional, default: None
+        If given, the callback is called with the remote path of a file, the
+        number of bytes of the file that have been sent, and the total number
+        of bytes of the file.
+    max_pending : int, optional, default: 64
+        The maximum number of uploads that are submitted to the shell before
+        the response of the oldest upload is read.
+    check : bool, optional, default: False
+        If ``True``, raise a :class:`CommandError` if the remote operation
+        of any upload does not exit with a ``0`` as return code.
+
+    Returns
+    -------
+    list[ExecutionResult]
+        The results of the upload operations, in the order of ``files``.
+
+    Raises
+    -------
+    CommandError:
+        If the remote operation of an upload does not exit with a ``0`` as
+        return code, and ``check`` is ``True``, a :class:`CommandError` is
+        raised for the first failed upload, after all uploads were
+        performed.
+    """
+
+    def read_file(
+            file: BinaryIO,
+            size: int,
+            remote_path: PurePosixPath,
+    ):
+        # this iterator is consumed by the thread that feeds the shell, it
+        # owns the file and closes it when the file was read completely
+        try:
+            processed = 0
+            while processed < size:
+                data = file.read(min(COPY_BUFSIZE, size - processed))
+                if data == b"":
+                    break
+                yield data
+                processed += len(data)
+                if progress_callback is not None:
+                    progress_callback(remote_path, processed, size)
+        finally:
+            file.close()
+
+    submitted: list[PendingExecutionResult] = []
+    for local_path, remote_path in files:
+        if len(submitted) >= max_pending:
+            # limit the number of files that are open at any time
+            submitted[-max_pending].result()
+        file_size = local_path.stat().st_size
+        # open the file here to report access errors to the caller
+        local_file = local_path.open("rb")
+        submitted.append(shell.submit(
+            _get_upload_command(file_size, remote_path),
+            stdin=read_file(local_file, file_size, remote_path),
+        ))
+    results = [p.result() for p in submitted]
+    if check:
+        for p, result in zip(submitted, results):
+            result.to_exception(p.command, 'upload failed')
+    return results
+
+
 def download(
     shell: ShellCommandExecutor,
     remote_path: PurePosixPath,
@@ -191,6 +448,7 @@ def download(
     response_generator_class: type[
         DownloadResponseGenerator
     ] = DownloadResponseGeneratorPosix,
+    compression: str | None = None,
     check: bool = False,
 ) -> ExecutionResult:
     """Download a file from the connected shell
@@ -221,6 +479,12 @@ def download(
         output. It must be a subclass of :class:`DownloadResponseGenerator`.
         The default works if the connected shell runs on a Unix-like system that
         provides `ls -dln`, `cat`, `echo`, and `awk`, e.g. ``Linux`` or ``OSX``.
+    compression : str | None, optional, default: None
+        If given, the content is compressed with this method in the connected
+        shell, and decompressed while it is received, see
+        :func:`get_compression_methods`. ``response_generator_class`` is
+        ignored in this case, and
+        :class:`CompressedDownloadResponseGeneratorPosix` is used.
     check : bool, optional, default: False
         If ``True``, raise a :class:`CommandError` if the remote operation does
         not exit with a ``0`` as return code.
@@ -240,7 +504,10 @@ def download(
         output.
     """
     command = posix_quote(str(remote_path)).encode()
-    response_generator = response_generator_class(shell.stdout)
+    response_generator = response_generator_class(shell.stdout) \
+        if compression is None \
+        else CompressedDownloadResponseGeneratorPosix(
+            shell.stdout, compression)
     result_generator = shell.start(
         command,
         response_generator=response_generator,
@@ -265,6 +532,93 @@ def download(
     )
 
 
+def download_many(
+    shell: ShellCommandExecutor,
+    files: Iterable[tuple[PurePosixPath, Path]],
+    *,
+    progress_callback: Callable[[PurePosixPath, int, int], None] | None = None,
+    response_generator_class: type[
+        DownloadResponseGenerator
+    ] = DownloadResponseGeneratorPosix,
+    max_pending: int = 64,
+    check: bool = False,
+) -> list[ExecutionResult]:
+    """Download a number of files from the connected shell
+
+    This function performs the same operation as :func:`download` for every
+    file in ``files``. The download commands are sent to the shell without
+    waiting for the response of the previous download, the responses are
+    read in order. Downloading many small files therefore does not cost one
+    round-trip to the connected shell per file.
+
+    The requirements for download_many are the same as for :func:`download`.
+
+    Parameters
+    ----------
+    shell: ShellCommandExecutor
+        The shell from which the files should be downloaded.
+    files : Iterable[tuple[PurePosixPath, Path]]
+        Pairs of the path of a file on the connected shell that should be
+        downloaded, and the path of the local file that will contain the
+        downloaded content.
+    progress_callback : callable[[PurePosixPath, int, int], None], optional, default: None
+        If given, the callback is called with the remote path of a file, the
+        number of bytes of the file that have been received, and the total
+        number of bytes of the file.
+    response_generator_class : type[DownloadResponseGenerator], optional, default: DownloadResponseGeneratorPosix
+        The response generator that should be used to handle the download
+        output, see :func:`download`.
+    max_pending : int, optional, default: 64
+        The maximum number of download commands that are sent to the shell
+        before the response of the oldest download is read.
+    check : bool, optional, default: False
+        If ``True``, raise a :class:`CommandError` if the remote operation
+        of any download does not exit with a ``0`` as return code.
+
+    Returns
+    -------
+    list[ExecutionResult]
+        The results of the download operations, in the order of ``files``.
+        A local file is only created if the remote file could be read.
+
+    Raises
+    -------
+    CommandError:
+        If the remote operation of a download does not exit with a ``0`` as
+        return code, and ``check`` is ``True``, a :class:`CommandError` is
+        raised for the first failed download, after all downloads were
+        performed.
+    """
+    pending: deque[
+        tuple[PurePosixPath, Path, DownloadResponseGenerator]
+    ] = deque()
+    commands: list[str] = []
+    results: list[ExecutionResult] = []
+    try:
+        for remote_path, local_path in files:
+            if len(pending) >= max_pending:
+                results.append(_receive_file(
+                    *pending.popleft(), commands[len(results)],
+                    progress_callback))
+            commands.append(posix_quote(str(remote_path)))
+            response_generator = response_generator_class(shell.stdout)
+            # the responses of the started commands are read in order below
+            shell.start(commands[-1], response_generator=response_generator)
+            pending.append((remote_path, local_path, response_generator))
+        while pending:
+            results.append(_receive_file(
+                *pending.popleft(), commands[len(results)],
+                progress_callback))
+    finally:
+        # keep the shell usable, if a download failed locally
+        for _, _, response_generator in pending:
+            consume(response_generator)
+    if check:
+        for command, result in zip(commands, results):
+            result.to_exception(command, 'download failed')
+    return results
+
+
 def delete(
     shell: ShellCommandExecutor,
     files: list[PurePosixPath],
@@ -313,3 +667,259 @@ def delete(
     if check:
         result.to_exception(cmd_line, 'delete failed')
     return result
+
+
+def hash_files(
+    shell: ShellCommandExecutor,
+    files: Iterable[PurePosixPath],
+    hash: Iterable[str],
+    *,
+    jobs: int = 1,
+    check: bool = False,
+) -> dict[PurePosixPath, dict[str, str]]:
+    """Compute hashes of files in the connected shell
+
+    The content of the files is not transferred, only the hexdigests are.
+    The file names are sent to the connected shell via stdin, hence there
+    is no limit on the number of files.
+
+    The requirements for hash_files are:
+    - The connected shell must be a POSIX shell.
+    - ``head`` and ``xargs`` must be installed in the remote shell.
+    - For every requested hash, the respective coreutils command, e.g.
+      ``sha256sum``, must be installed in the remote shell and support
+      the ``-z`` option (see ``hash_commands``).
+
+    Parameters
+    ----------
+    shell: ShellCommandExecutor
+        The shell in which the hashes should be computed.
+    files : Iterable[PurePosixPath]
+        The paths of the files that should be hashed.
+    hash : Iterable[str]
+        The names of the hash algorithms, e.g. ``md5`` or ``sha256``.
+    jobs : int, optional, default: 1
+        The number of hashing processes that run in parallel in the
+        connected shell. With more than one job, ``mktemp`` must be
+        installed in the remote shell, because the output of every process
+        is collected in a temporary file.
+    check : bool, optional, default: False
+        If ``True``, raise a :class:`CommandError` if any file could not be
+        hashed.
+
+    Returns
+    -------
+    dict[PurePosixPath, dict[str, str]]
+        Mapping of the paths of all hashed files to a mapping of hash
+        algorithm names to hexdigests. Files that could not be hashed
+        (with all requested algorithms) are not included.
+
+    Raises
+    -------
+    ValueError:
+        If a hash algorithm is not supported.
+    CommandError:
+        If any file could not be hashed, and ``check`` is ``True``.
+    """
+    hash = list(hash)
+    unsupported = [h for h in hash if h not in hash_commands]
+    if unsupported:
+        raise ValueError(f'unsupported hash algorithm(s): {unsupported}')
+    names = b''.join(
+        str(f).encode(errors='surrogateescape') + b'\0' for f in files)
+    submitted = [
+        (
+            h,
+            shell.submit(
+                _get_hash_command(hash_commands[h], len(names), jobs),
+                stdin=[names],
+            ),
+        )
+        for h in hash
+    ]
+    hashes: dict[PurePosixPath, dict[str, str]] = {}
+    for h, pending in submitted:
+        result = pending.result()
+        if check:
+            result.to_exception(pending.command, 'hashing failed')
+        for line in result.stdout.split(b'\0')[:-1]:
+            # '<hexdigest> <type-indicator><name>', the type indicator is
+            # ' ' or '*'
+            digest, name = line.split(b' ', 1)
+            hashes.setdefault(
+                PurePosixPath(name[1:].decode(errors='surrogateescape')),
+                {},
+            )[h] = digest.decode()
+    return {
+        path: path_hashes
+        for path, path_hashes in hashes.items()
+        if len(path_hashes) == len(submitted)
+    }
+
+
+def _get_upload_command(file_size: int, remote_path: PurePosixPath) -> str:
+    return (
+        f'head -c {file_size} > {posix_quote(str(remote_path))}'
+        f"|| (head -c {file_size} > /dev/null; test 1 == 2)"
+    )
+
+
+def _receive_file(
+    remote_path: PurePosixPath,
+    local_path: Path,
+    response_generator: DownloadResponseGenerator,
+    command: str,
+    progress_callback: Callable[[PurePosixPath, int, int], None] | None,
+) -> ExecutionResult:
+    local_file = None
+    try:
+        processed = 0
+        for chunk in response_generator:
+            if local_file is None:
+                local_file = local_path.open("wb")
+            local_file.write(chunk)
+            processed += len(chunk)
+            if progress_callback is not None:
+                progress_callback(
+                    remote_path, processed, response_generator.length)
+    except BaseException:
+        # read the rest of the response to keep the shell usable
+        consume(response_generator)
+        raise
+    finally:
+        if local_file is not None:
+            local_file.close()
+    if local_file is None and response_generator.returncode == 0:
+        # the remote file is empty
+        local_path.open("wb").close()
+    stderr = b''.join(response_generator.stderr_deque)
+    response_generator.stderr_deque.clear()
+    return create_result(
+        response_generator,
+        command,
+        stdout=b'',
+        stderr=stderr,
+    )
+
+
+def _get_hash_command(tool: str, names_size: int, jobs: int) -> str:
+    if jobs == 1:
+        return f'head -c {names_size} | xargs -0 -r -n 64 {tool} -z --'
+    # the output of parallel processes would be interleaved, collect it in
+    # one file per process. The file names are always read from stdin,
+    # otherwise they would be interpreted as commands by the shell.
+    return (
+        f'( t=$(mktemp -d) || {{ head -c {names_size} > /dev/null; exit 1; }}; '
+        f'head -c {names_size} > "$t/names"; '
+        f'xargs -0 -r -P {jobs} -n 64 '
+        f"""sh -c '{tool} -z -- "$@" > "$(mktemp "$0/out.XXXXXX")"' "$t" """
+        f'< "$t/names"; r=$?; '
+        f'rm "$t/names"; cat "$t"/out.* 2> /dev/null; rm -rf "$t"; exit $r )'
+    )
+
+
+def get_compression_methods(shell: ShellCommandExecutor) -> list[str]:
+    """Report the compression methods that can be used for transfers
+
+    A compression method can be used, if it is supported locally and in
+    the connected shell. ``gzip`` is supported locally via the standard
+    library, ``zstd`` requires the ``zstandard`` package.
+
+    Parameters
+    ----------
+    shell: ShellCommandExecutor
+        The shell in which the compression tools should be found.
+
+    Returns
+    -------
+    list[str]
+        The names of the usable compression methods, in order of
+        preference.
+    """
+    methods = [
+        m for m in compression_commands
+        if m != 'zstd' or zstandard is not None
+    ]
+    result = shell(
+        ' '.join(f'command -v {m} > /dev/null && echo {m};' for m in methods)
+        + ' true'
+    )
+    found = result.stdout.decode().split()
+    return [m for m in methods if m in found]
+
+
+def compress_chunks(
+    chunks: Iterable[bytes],
+    compression: str,
+) -> Generator[bytes, None, None]:
+    """Compress a stream of chunks, such that the shell can decompress it
+
+    Parameters
+    ----------
+    chunks : Iterable[bytes]
+        The content that should be compressed.
+    compression : str
+        The compression method, one of ``zstd`` or ``gzip``.
+
+    Yields
+    ------
+    bytes
+        Chunks of compressed content. Their size is unrelated to the size
+        of the input chunks.
+    """
+    compressor = _get_compressobj(compression)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def frame_chunks(
+    chunks: Iterable[bytes],
+    frame_size: int = 8 * 1024 * 1024,
+) -> Generator[bytes, None, None]:
+    """Merge chunks into frames, prefixed with their length, end with ``0``
+
+    The output can be read by :data:`read_frames_command` in the connected
+    shell. This allows to send content of unknown length to a command
+    without closing the shell's stdin.
+
+    Every frame costs a ``head`` process and a byte-wise ``read`` in the
+    connected shell. Therefore, chunks are merged into frames of at least
+    ``frame_size`` bytes (except for the last frame), instead of sending
+    each chunk in a frame of its own.
+    """
+    frame: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        if not chunk:
+            # an empty chunk would end the stream
+            continue
+        frame.append(chunk)
+        size += len(chunk)
+        if size >= frame_size:
+            yield b'%d\n' % size
+            yield from frame
+            frame.clear()
+            size = 0
+    if size:
+        yield b'%d\n' % size
+        yield from frame
+    yield b'0\n'
+
+
+def _get_compressobj(compression: str):
+    if compression == 'gzip':
+        return zlib.compressobj(wbits=31)
+    elif compression == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f'unsupported compression method: {compression}')
+
+
+def _get_decompressobj(compression: str) -> _Decompressor:
+    if compression == 'gzip':
+        return zlib.decompressobj(wbits=31)
+    elif compression == 'zstd' and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f'unsupported compression method: {compression}')
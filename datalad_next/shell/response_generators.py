@@ -10,10 +10,10 @@ from collections.abc import Generator
 from random import randint
 
 from datasalad.iterable_subprocess.iterable_subprocess import OutputFrom
-from datasalad.itertools import align_pattern
 
 
 __all__ = [
+    'ShellOutput',
     'FixedLengthResponseGenerator',
     'FixedLengthResponseGeneratorPosix',
     'FixedLengthResponseGeneratorPowerShell',
@@ -27,6 +27,50 @@ __all__ = [
 lgr = logging.getLogger('datalad.ext.next.shell.protocol')
 
 
+class ShellOutput:
+    """Output of a shell, shared by the response generators of all commands
+
+    This wraps the ``stdout``-iterator of a shell process, e.g. the object
+    that is returned by :func:`iter_subproc`. The response of a command may
+    end in the middle of a chunk of output, if further commands were sent
+    to the shell before the response was read completely (see
+    :meth:`ShellCommandExecutor.submit`). Response generators hand the
+    output following their response back via :meth:`complete_response`,
+    and it is delivered to the response generator of the next command.
+    """
+    def __init__(self, stdout: OutputFrom) -> None:
+        self._stdout = stdout
+        self.stderr_deque = stdout.stderr_deque
+        # output that belongs to responses of subsequent commands
+        self._unread: deque[bytes] = deque()
+        # number of commands sent to the shell
+        self.sent = 0
+        # number of commands whose responses were read completely
+        self.completed = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self._unread:
+            return self._unread.popleft()
+        return next(self._stdout)
+
+    def complete_response(self, trailing: bytes) -> bool:
+        """Register the end of a response, and any output that followed it
+
+        Returns ``True``, if ``trailing`` was kept for the response of a
+        subsequent command, or ``False``, if no further commands were sent,
+        and ``trailing`` is unexpected output.
+        """
+        self.completed += 1
+        if self.completed >= self.sent:
+            return False
+        if trailing:
+            self._unread.appendleft(trailing)
+        return True
+
+
 class ShellCommandResponseGenerator(Generator, metaclass=ABCMeta):
     """An abstract class the specifies the minimal functionality of a response generator
 
@@ -38,7 +82,10 @@ class ShellCommandResponseGenerator(Generator, metaclass=ABCMeta):
     stderr-output is available in the ``stderr_deque``-attribute (a
     ``deque``-instance), of instances of this class.
     """
-    def __init__(self, stdout_gen: Generator, stderr_deque: deque) -> None:
+    def __init__(self,
+                 stdout_gen: Generator | ShellOutput,
+                 stderr_deque: deque,
+                 ) -> None:
         self.stdout_gen = stdout_gen
         self.stderr_deque = stderr_deque
         self.state: str | int = 'output'
@@ -69,6 +116,28 @@ class ShellCommandResponseGenerator(Generator, metaclass=ABCMeta):
         digits, trailing = chunk.split(b'\n', 1)
         return int(digits), trailing
 
+    @staticmethod
+    def _complete_response(trailing: bytes, stdout) -> bool:
+        """Helper that hands back the output following a complete response
+
+        Parameters
+        ----------
+        trailing : bytes
+            The portion of the last chunk that was not part of the response.
+        stdout : ShellOutput | OutputFrom
+            The output of the shell. If this is a :class:`ShellOutput`, output
+            that belongs to the responses of subsequent commands is handed
+            back to it.
+
+        Returns
+        -------
+        bool
+            ``True``, if ``trailing`` belongs to the responses of subsequent
+            commands, ``False`` if it is unexpected output.
+        """
+        return isinstance(stdout, ShellOutput) \
+            and stdout.complete_response(trailing)
+
     @abstractmethod
     def send(self, _) -> bytes:
         """Deliver the next part of generated output
@@ -105,35 +174,81 @@ class VariableLengthResponseGenerator(ShellCommandResponseGenerator, metaclass=A
     will execute the command and print a random end-marker and the return code
     after the output of the command. The :meth:`send`-method of this class uses
     the end-marker to determine then end of the command output.
+
+    Each chunk of output is scanned once for the end-marker. Output chunks
+    are passed on as-is, only the end of a chunk that could be the beginning
+    of the end-marker is held back, until the next chunk tells whether the
+    end-marker straddles the chunk boundary. The end-marker is searched for
+    by its dash-less core, leading dashes would make the search crawl
+    through any output that consists of dashes.
     """
     def __init__(self,
-                 stdout: OutputFrom,
+                 stdout: OutputFrom | ShellOutput,
                  ) -> None:
         self.end_marker = _create_end_marker()
         self.stream_marker = self.end_marker + b'\n'
         self.plain_stdout = stdout
-        super().__init__(
-            align_pattern(stdout, self.stream_marker),
-            stdout.stderr_deque
-        )
+        # end of the last chunk that could be the start of the marker
+        self.pending_chunk = b''
+        self.marker_core = self.end_marker.strip(b'-')
+        self.marker_core_offset = self.stream_marker.index(self.marker_core)
+        # lengths of the proper prefixes of the marker, by their last byte,
+        # longest first
+        self.prefix_lengths: dict[int, list[int]] = {}
+        for length in range(len(self.stream_marker) - 1, 0, -1):
+            self.prefix_lengths.setdefault(
+                self.stream_marker[length - 1], []).append(length)
+        super().__init__(stdout, stdout.stderr_deque)
 
     def send(self, _) -> bytes:
         if self.state == 'output':
-            chunk = next(self.stdout_gen)
-            if self.stream_marker in chunk:
-                self.state = 'returncode'
-                chunk, self.returncode_chunk = chunk.split(self.stream_marker)
-                if chunk:
-                    return chunk
-            else:
-                return chunk
+            marker = self.stream_marker
+            while True:
+                chunk = next(self.stdout_gen)
+                tail = self.pending_chunk
+                self.pending_chunk = b''
+                if tail and len(chunk) < len(marker) - 1:
+                    # too short to complete a marker that starts in the
+                    # tail, merging is cheap
+                    chunk = tail + chunk
+                    tail = b''
+                if tail:
+                    index = (tail + chunk[:len(marker) - 1]).find(marker)
+                    if index >= 0:
+                        # the marker starts in the tail
+                        self.state = 'returncode'
+                        self.returncode_chunk = \
+                            chunk[index + len(marker) - len(tail):]
+                        if index:
+                            return tail[:index]
+                        break
+                index = self._find_marker(chunk)
+                if index >= 0:
+                    self.state = 'returncode'
+                    self.returncode_chunk = chunk[index + len(marker):]
+                    end = index
+                else:
+                    keep = self._get_prefix_length(chunk)
+                    end = len(chunk) - keep
+                    if keep:
+                        self.pending_chunk = chunk[end:]
+                if tail:
+                    # a single copy of the output
+                    output = b''.join((tail, memoryview(chunk)[:end]))
+                else:
+                    output = chunk if end == len(chunk) else chunk[:end]
+                if output:
+                    return output
+                if index >= 0:
+                    break
 
         if self.state == 'returncode':
             self.returncode, trailing = self._get_number_and_newline(
                 self.returncode_chunk,
                 self.plain_stdout,
             )
-            if trailing:
+            if not self._complete_response(trailing, self.plain_stdout) \
+                    and trailing:
                 lgr.warning(
                     'unexpected output after return code: %s',
                     repr(trailing))
@@ -145,6 +260,30 @@ class VariableLengthResponseGenerator(ShellCommandResponseGenerator, metaclass=A
 
         raise RuntimeError(f'unknown state: {self.state}')
 
+    def _find_marker(self, chunk: bytes) -> int:
+        """Return the index of the marker in ``chunk``, or -1"""
+        core, offset = self.marker_core, self.marker_core_offset
+        # a core found before `offset` cannot be part of a complete marker
+        index = chunk.find(core, offset)
+        while index >= 0:
+            if chunk.startswith(self.stream_marker, index - offset):
+                return index - offset
+            index = chunk.find(core, index + 1)
+        return -1
+
+    def _get_prefix_length(self, chunk: bytes) -> int:
+        """Return the length of the longest end of ``chunk`` that starts the marker
+
+        Only ends that are shorter than the marker are considered.
+        """
+        if not chunk:
+            return 0
+        for length in self.prefix_lengths.get(chunk[-1], ()):
+            if length <= len(chunk) \
+                    and chunk.endswith(self.stream_marker[:length]):
+                return length
+        return 0
+
     @property
     @abstractmethod
     def zero_command(self) -> bytes:
@@ -154,13 +293,13 @@ class VariableLengthResponseGenerator(ShellCommandResponseGenerator, metaclass=A
 
 class VariableLengthResponseGeneratorPosix(VariableLengthResponseGenerator):
     """A variable length response generator for POSIX shells"""
-    def __init__(self, stdout):
+    def __init__(self, stdout: OutputFrom | ShellOutput) -> None:
         """
         Parameters
         ----------
-        stdout : OutputFrom
-            A generator that yields output from a shell. Usually the object
-            that is returned by :func:`iter_proc`.
+        stdout : OutputFrom | ShellOutput
+            A generator that yields output from a shell. Usually the
+            ``stdout``-attribute of a :class:`ShellCommandExecutor`.
         """
         super().__init__(stdout)
 
@@ -183,13 +322,13 @@ class VariableLengthResponseGeneratorPosix(VariableLengthResponseGenerator):
 
 class VariableLengthResponseGeneratorPowerShell(VariableLengthResponseGenerator):
     """A variable length response generator for PowerShell shells"""
-    def __init__(self, stdout):
+    def __init__(self, stdout: OutputFrom | ShellOutput) -> None:
         """
         Parameters
         ----------
-        stdout : OutputFrom
-            A generator that yields output from a shell. Usually the object
-            that is returned by :func:`iter_proc`.
+        stdout : OutputFrom | ShellOutput
+            A generator that yields output from a shell. Usually the
+            ``stdout``-attribute of a :class:`ShellCommandExecutor`.
         """
         super().__init__(stdout)
 
@@ -225,15 +364,15 @@ class FixedLengthResponseGenerator(ShellCommandResponseGenerator, metaclass=ABCM
     scanning the output for an end-marker.
     """
     def __init__(self,
-                 stdout: OutputFrom,
+                 stdout: OutputFrom | ShellOutput,
                  length: int,
                  ) -> None:
         """
         Parameters
         ----------
-        stdout : OutputFrom
-            A generator that yields output from a shell. Usually the object
-            that is returned by :func:`iter_proc`.
+        stdout : OutputFrom | ShellOutput
+            A generator that yields output from a shell. Usually the
+            ``stdout``-attribute of a :class:`ShellCommandExecutor`.
         length : int
             The length (in bytes) of the output that a command will generate.
         """
@@ -262,7 +401,8 @@ class FixedLengthResponseGenerator(ShellCommandResponseGenerator, metaclass=ABCM
                 self.returncode_chunk,
                 self.stdout_gen,
             )
-            if trailing:
+            if not self._complete_response(trailing, self.stdout_gen) \
+                    and trailing:
                 lgr.warning(
                     'unexpected output after return code: %s',
                     repr(trailing))
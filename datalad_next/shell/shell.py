@@ -2,15 +2,18 @@
 -- autoclass:: ShellCommandExecutor
    :special-members: __call__
 
+-- autoclass:: PendingExecutionResult
+
 
 """
 from __future__ import annotations
 
 import logging
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datasalad.iterable_subprocess.iterable_subprocess import OutputFrom
 from datasalad.runners.iter_subproc import iter_subproc
+from more_itertools import consume
 
 from queue import Queue
 from typing import (
@@ -20,6 +23,7 @@ from typing import (
 
 from .response_generators import (
     ShellCommandResponseGenerator,
+    ShellOutput,
     VariableLengthResponseGenerator,
     VariableLengthResponseGeneratorPosix,
 )
@@ -31,6 +35,7 @@ from datalad_next.exceptions import CommandError
 __all__ = [
     'shell',
     'ExecutionResult',
+    'PendingExecutionResult',
     'ShellCommandExecutor',
 ]
 
@@ -379,7 +384,9 @@ def shell(shell_cmd: list[str],
     with iter_subproc(shell_cmd,
                       inputs=train(subprocess_inputs),
                       chunk_size=chunk_size,
-                      bufsize=0) as shell_output:
+                      bufsize=0) as subprocess_output:
+
+        shell_output = ShellOutput(subprocess_output)
 
         assert issubclass(zero_command_rg_class, VariableLengthResponseGenerator)
 
@@ -393,6 +400,11 @@ def shell(shell_cmd: list[str],
             cmd_executor.command_zero(zero_command_rg_class(shell_output))
             # Return the now ready connection
             yield cmd_executor
+            # Let the shell exit, and read any output that it still produces.
+            # Otherwise, writing this output would kill the shell with
+            # SIGPIPE.
+            subprocess_inputs.put(None)
+            consume(subprocess_output)
         finally:
             # Ensure that the shell is terminated if an exception is raised by
             # code that uses `shell`. This is necessary because
@@ -416,7 +428,7 @@ class ShellCommandExecutor:
 
     def __init__(self,
                  process_inputs: Queue,
-                 stdout: OutputFrom,
+                 stdout: ShellOutput,
                  shell_cmd: list[str],
                  default_rg_class: type[VariableLengthResponseGenerator],
                  ) -> None:
@@ -424,6 +436,8 @@ class ShellCommandExecutor:
         self.stdout = stdout
         self.shell_cmd = shell_cmd
         self.default_rg_class = default_rg_class
+        # submitted commands whose responses were not yet read, in order
+        self._pending: deque[PendingExecutionResult] = deque()
 
     def __call__(self,
                  command: bytes | str,
@@ -516,6 +530,12 @@ class ShellCommandExecutor:
         generator is exhausted, the return code of the command is available
         in the ``returncode``-attribute of the generator.
 
+        Further commands can be started before the output of a started
+        command was read. Their outputs follow each other, i.e. the returned
+        generators must be exhausted in the order in which the commands
+        were started. Responses of commands that were sent via
+        :meth:`submit` before are read when the command is started.
+
         Parameters
         ----------
         command : bytes | str
@@ -557,6 +577,137 @@ class ShellCommandExecutor:
             ``response_generator``-parameter, the same instance will be
             returned.
         """
+        response_generator = self._send(
+            command,
+            stdin=stdin,
+            response_generator=response_generator,
+            encoding=encoding,
+        )
+        # the output of the command follows the responses of any previously
+        # submitted commands, read them first
+        self._read_pending()
+        return response_generator
+
+    def submit(self,
+               command: bytes | str,
+               *,
+               stdin: Iterable[bytes] | None = None,
+               response_generator: ShellCommandResponseGenerator | None = None,
+               encoding: str = 'utf-8',
+               check: bool = False,
+               ) -> PendingExecutionResult:
+        """Send a command to the connected shell, without waiting for it
+
+        The command is sent to the shell immediately. Any number of commands
+        can be submitted before the response of the first command is read.
+        The shell executes them one after the other, and their responses are
+        read in the order in which the commands were submitted. This way,
+        a sequence of commands costs a single round-trip to a remote shell,
+        instead of one round-trip per command.
+
+        Responses are only read when they are requested via
+        :meth:`PendingExecutionResult.result`, or when a subsequent command
+        is executed via :meth:`__call__` or :meth:`start`. Reading a
+        response also reads the responses of all commands that were
+        submitted before. Until their responses are read, output of
+        submitted commands may fill up pipe buffers and thereby pause the
+        shell.
+
+        Stderr-output is assigned to the result of the command whose stdout
+        was being read when the stderr-output was received. For submitted
+        commands, this need not be the command that actually wrote it.
+
+        Parameters
+        ----------
+        command : bytes | str
+            The command to execute. If the command is given as a string, it
+            will be encoded to bytes using the encoding given in `encoding`.
+        stdin : Iterable[byte] | None, optional, default: None
+            If given, the bytes are sent to stdin of the command. The
+            command must consume exactly these bytes, e.g. by using
+            `head -c <byte-count>`, otherwise subsequent commands will not be
+            executed as intended.
+        response_generator : ShellCommandResponseGenerator | None, optional, default: None
+            If given, the responder generator that is used to generate the
+            command line and to parse the output of the command. Each
+            submitted command requires its own response generator.
+        encoding : str, optional, default: 'utf-8'
+            The encoding that is used to encode the command if it is given as a
+            string.
+        check : bool, optional, default: False
+            If True, :meth:`PendingExecutionResult.result` raises a
+            :class:`CommandError`-exception if the return code of the
+            command is not zero.
+
+        Returns
+        -------
+        :class:`PendingExecutionResult`
+            A handle to obtain the :class:`ExecutionResult` of the command.
+        """
+        if response_generator is None:
+            response_generator = self.default_rg_class(self.stdout)
+            # end markers of pending commands must be distinct, otherwise
+            # the end of an output would be detected too early
+            markers = {
+                getattr(p.response_generator, 'end_marker', None)
+                for p in self._pending
+            }
+            while response_generator.end_marker in markers:
+                response_generator = self.default_rg_class(self.stdout)
+        pending = PendingExecutionResult(
+            self,
+            self._send(
+                command,
+                stdin=stdin,
+                response_generator=response_generator,
+                encoding=encoding,
+            ),
+            command,
+            check,
+        )
+        self._pending.append(pending)
+        return pending
+
+    def pipeline(self,
+                 commands: Iterable[bytes | str],
+                 *,
+                 encoding: str = 'utf-8',
+                 check: bool = False,
+                 ) -> Generator[ExecutionResult, None, None]:
+        """Execute a sequence of commands with pipelined responses
+
+        All commands are sent to the shell at once (see :meth:`submit`),
+        the results are yielded in the order of the commands.
+
+        Parameters
+        ----------
+        commands : Iterable[bytes | str]
+            The commands to execute.
+        encoding : str, optional, default: 'utf-8'
+            The encoding that is used to encode commands that are given as
+            strings.
+        check : bool, optional, default: False
+            If True, a :class:`CommandError`-exception is raised for the
+            first command with a return code that is not zero.
+
+        Yields
+        ------
+        :class:`ExecutionResult`
+        """
+        pending = [
+            self.submit(c, encoding=encoding, check=check)
+            for c in commands
+        ]
+        for p in pending:
+            yield p.result()
+
+    def _send(self,
+              command: bytes | str,
+              *,
+              stdin: Iterable[bytes] | None,
+              response_generator: ShellCommandResponseGenerator | None,
+              encoding: str,
+              ) -> ShellCommandResponseGenerator:
         if response_generator is None:
             response_generator = self.default_rg_class(self.stdout)
 
@@ -570,8 +721,19 @@ class ShellCommandExecutor:
         self.process_inputs.put([final_command])
         if stdin is not None:
             self.process_inputs.put(stdin)
+        self.stdout.sent += 1
         return response_generator
 
+    def _read_pending(self,
+                      until: PendingExecutionResult | None = None) -> None:
+        # read the responses of submitted commands, in order, up to and
+        # including `until`, or all of them
+        while self._pending:
+            pending = self._pending.popleft()
+            pending._read()
+            if pending is until:
+                break
+
     def __repr__(self):
         return f'{self.__class__.__name__}({self.shell_cmd!r})'
 
@@ -598,6 +760,56 @@ class ShellCommandExecutor:
         lgr.debug('skipped login message: %s', result_zero.stdout)
 
 
+class PendingExecutionResult:
+    """Handle for the result of a command sent via :meth:`ShellCommandExecutor.submit`"""
+    def __init__(self,
+                 executor: ShellCommandExecutor,
+                 response_generator: ShellCommandResponseGenerator,
+                 command: bytes | str,
+                 check: bool,
+                 ) -> None:
+        self.executor = executor
+        self.response_generator = response_generator
+        self.command = command
+        self.check = check
+        self._result: ExecutionResult | None = None
+
+    def done(self) -> bool:
+        """Report whether the response of the command was read already"""
+        return self._result is not None
+
+    def result(self) -> ExecutionResult:
+        """Return the result of the command
+
+        If necessary, the responses of all commands that were submitted
+        before are read first.
+
+        Raises
+        ------
+        :class:`CommandError`
+            If the return code of the command is not zero and `check` was
+            True.
+        """
+        if self._result is None:
+            self.executor._read_pending(until=self)
+        assert self._result is not None
+        if self.check is True:
+            self._result.to_exception(self.command)
+        return self._result
+
+    def _read(self) -> None:
+        stdout = b''.join(self.response_generator)
+        stderr_deque = self.executor.stdout.stderr_deque
+        stderr = b''.join(stderr_deque)
+        stderr_deque.clear()
+        self._result = create_result(
+            self.response_generator,
+            self.command,
+            stdout,
+            stderr,
+        )
+
+
 def create_result(response_generator: ShellCommandResponseGenerator,
                   command: bytes | str | list[str],
                   stdout: bytes,
@@ -120,3 +120,24 @@ def test_trailing_content_detection_in_download(monkeypatch):
         ('unexpected output after return code: %s', "b'EXTRA-CONTENT\\n'"),
         {}
     )]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 17, 55, 56, 57, 58, 1000])
+def test_end_marker_across_chunks(chunk_size):
+    # the end-marker is detected in any chunking of the output, and output
+    # that only looks like the start of the end-marker is passed on
+    response_generator = VariableLengthResponseGeneratorPosix(
+        cast(OutputFrom, DummyOutputFrom())
+    )
+    marker = response_generator.stream_marker
+    output = b'abc----' + marker[:20] + b'x' + marker[:-1] + b'-' + marker[:1]
+    stream = output + marker + b'0\n'
+    response_generator.stdout_gen = DummyOutputFrom([
+        stream[i:i + chunk_size]
+        for i in range(0, len(stream), chunk_size)
+    ])
+    response_generator.plain_stdout = response_generator.stdout_gen
+    chunks = list(response_generator)
+    assert b''.join(chunks) == output
+    assert all(chunks)
+    assert response_generator.returncode == 0
@@ -3,7 +3,10 @@ from __future__ import annotations
 from datasalad.runners import iter_subproc
 import os
 import sys
-from pathlib import PurePosixPath
+from pathlib import (
+    Path,
+    PurePosixPath,
+)
 from shlex import quote as posix_quote
 
 import pytest
@@ -262,6 +265,155 @@ def test_upload_local_bash(tmp_path):
         _check_ls_result(bash, common_files[0])
 
 
+# This test only works on Posix-like systems because it executes a local bash
+@skip_if(on_windows)
+def test_upload_download_many_local_bash(tmp_path):
+    sizes = [0, 1, 10, 100000, 3]
+    sources = []
+    for i, size in enumerate(sizes):
+        sources.append(tmp_path / f'source {i}')
+        sources[-1].write_bytes(os.urandom(size))
+    (tmp_path / 'remote').mkdir()
+    remote = [PurePosixPath(tmp_path / 'remote' / f'$file {i}')
+              for i in range(len(sizes))]
+    progress = []
+    with shell(['bash']) as bash:
+        results = posix.upload_many(
+            bash,
+            list(zip(sources, remote)) + [
+                (sources[1], PurePosixPath('/nonexistent/file'))],
+            progress_callback=lambda *args: progress.append(args),
+            max_pending=2,
+        )
+        assert [r.returncode for r in results[:-1]] == [0] * len(sizes)
+        assert results[-1].returncode != 0
+        for source, destination in zip(sources, remote):
+            assert Path(destination).read_bytes() == source.read_bytes()
+        assert (remote[3], sizes[3], sizes[3]) in progress
+        _check_ls_result(bash, common_files[0])
+
+        targets = [tmp_path / f'target {i}' for i in range(len(sizes))]
+        progress.clear()
+        results = posix.download_many(
+            bash,
+            list(zip(remote, targets)) + [
+                (PurePosixPath('/nonexistent/file'), tmp_path / 'missing')],
+            progress_callback=lambda *args: progress.append(args),
+            max_pending=2,
+        )
+        assert [r.returncode for r in results[:-1]] == [0] * len(sizes)
+        assert results[-1].returncode != 0
+        assert not (tmp_path / 'missing').exists()
+        for source, target in zip(sources, targets):
+            assert target.read_bytes() == source.read_bytes()
+        assert (remote[3], sizes[3], sizes[3]) in progress
+        _check_ls_result(bash, common_files[0])
+
+        with pytest.raises(CommandError):
+            posix.download_many(
+                bash,
+                [(PurePosixPath('/nonexistent/file'), tmp_path / 'missing'),
+                 (remote[2], tmp_path / 'other')],
+                check=True,
+            )
+        # failures are only reported after all files were transferred
+        assert (tmp_path / 'other').exists()
+        _check_ls_result(bash, common_files[0])
+
+
+# This test only works on Posix-like systems because it executes a local bash
+@skip_if(on_windows)
+def test_hash_files_local_bash(tmp_path):
+    files = [tmp_path / 'some file', tmp_path / '\\odd\nname']
+    for f in files:
+        f.write_text('some content')
+    missing = PurePosixPath(tmp_path / 'missing')
+    remote = [PurePosixPath(f) for f in files]
+    target = dict(md5='9893532233caff98cd083a116b013c0b',
+                  sha1='94e66df8cd09d410c62d9e0dc59d3a884e458e05')
+    with shell(['bash']) as bash:
+        for jobs in (1, 3):
+            assert posix.hash_files(
+                bash, remote + [missing], ['md5', 'sha1'], jobs=jobs,
+            ) == {r: target for r in remote}
+        with pytest.raises(CommandError):
+            posix.hash_files(bash, [missing], ['md5'], check=True)
+        with pytest.raises(ValueError):
+            posix.hash_files(bash, remote, ['bogus'])
+        _check_ls_result(bash, common_files[0])
+
+
+# This test only works on Posix-like systems because it executes a local bash
+@skip_if(on_windows)
+def test_compressed_transfer_local_bash(tmp_path):
+    content = os.urandom(100000) + b'0' * 1000000
+    source = tmp_path / 'source'
+    source.write_bytes(content)
+    with shell(['bash']) as bash:
+        methods = posix.get_compression_methods(bash)
+        assert 'gzip' in methods
+        for method in methods:
+            progress = []
+            result = posix.upload(
+                bash,
+                source,
+                PurePosixPath(tmp_path / f'up-{method}'),
+                progress_callback=lambda a, b: progress.append((a, b)),
+                compression=method,
+            )
+            assert result.returncode == 0
+            assert (tmp_path / f'up-{method}').read_bytes() == content
+            assert progress[-1] == (len(content), len(content))
+
+            result = posix.download(
+                bash,
+                PurePosixPath(source),
+                tmp_path / f'down-{method}',
+                progress_callback=lambda a, b: progress.append((a, b)),
+                compression=method,
+            )
+            assert result.returncode == 0
+            assert (tmp_path / f'down-{method}').read_bytes() == content
+            assert progress[-1] == (len(content), len(content))
+
+            result = posix.upload(
+                bash,
+                source,
+                PurePosixPath(tmp_path / 'source' / 'impossible'),
+                compression=method,
+            )
+            assert result.returncode != 0
+            with pytest.raises(CommandError):
+                posix.download(
+                    bash,
+                    PurePosixPath(tmp_path / 'missing'),
+                    tmp_path / 'missing-download',
+                    compression=method,
+                    check=True,
+                )
+            _check_ls_result(bash, common_files[0])
+
+
+# This test only works on Posix-like systems because it executes a local bash
+@skip_if(on_windows)
+def test_frame_chunks_local_bash(tmp_path):
+    chunks = [b'abc', b'', b'defg', b'\n0\n', b'h']
+    # chunks are merged into frames of at least `frame_size` bytes
+    assert list(posix.frame_chunks(chunks, frame_size=6)) == [
+        b'7\n', b'abc', b'defg', b'4\n', b'\n0\n', b'h', b'0\n']
+    assert list(posix.frame_chunks([])) == [b'0\n']
+    with shell(['bash']) as bash:
+        for frame_size in (1, 6, 1024):
+            result = bash(
+                f'{posix.read_frames_command} > {tmp_path / "out"}',
+                stdin=posix.frame_chunks(chunks, frame_size=frame_size),
+            )
+            assert result.returncode == 0
+            assert (tmp_path / 'out').read_bytes() == b''.join(chunks)
+        # the shell remains usable
+        _check_ls_result(bash, common_files[0])
+
+
 # This test only works on Posix-like systems because it executes a local bash
 @skip_if(on_windows)
 def test_upload_local_bash_error(tmp_path):
@@ -538,3 +690,42 @@ def test_download_error(tmp_path):
         )
         assert result.returncode not in (0, None)
         _check_ls_result(bash, common_files[0])
+
+
+
+# This test only works on Posix-like systems because it executes a local bash
+@skip_if(on_windows)
+def test_pipeline_bash():
+    with shell(['bash']) as bash:
+        results = list(bash.pipeline(
+            [f'echo {i}; test {i} -ne 3' for i in range(10)]
+        ))
+        assert [r.stdout for r in results] == [
+            f'{i}\n'.encode() for i in range(10)]
+        assert [r.returncode for r in results] == [
+            1 if i == 3 else 0 for i in range(10)]
+
+        with pytest.raises(CommandError):
+            list(bash.pipeline(['true', 'false', 'true'], check=True))
+
+        # responses of any size are separated correctly, also if they end
+        # within a chunk of output
+        sizes = [0, 1, 100000, 7, 70000, 3]
+        results = list(bash.pipeline(
+            [f'head -c {size} /dev/zero' for size in sizes]
+        ))
+        assert [r.stdout for r in results] == [b'\0' * n for n in sizes]
+
+        # results can be obtained in any order, and pending responses are
+        # read before the response of a subsequently executed command
+        first = bash.submit(b'echo first')
+        second = bash.submit('head -c 3', stdin=[b'abc'])
+        third = bash.submit(b'echo third >&2; echo third', check=True)
+        assert not first.done()
+        assert second.result().stdout == b'abc'
+        assert first.done() and not third.done()
+        assert bash(b'echo direct').stdout == b'direct\n'
+        assert third.done()
+        assert third.result().stdout == b'third\n'
+        assert first.result().stdout == b'first\n'
+        bash.close()
@@ -0,0 +1,32 @@
+"""Handlers for asynchronous operations on various URL types and protocols
+
+These handlers offer the API of :mod:`datalad_next.url_operations` as
+coroutines, for use with an ``asyncio`` event loop. Any number of
+operations can be performed concurrently on a single event loop.
+
+Native implementations are provided for the ``http(s)://`` scheme (requires
+the ``aiohttp`` package), and ``file://`` URLs. Operations on any other URL
+scheme are performed with the respective synchronous handler in an executor.
+
+Available handlers:
+
+.. currentmodule:: datalad_next.url_operations.aio
+.. autosummary::
+   :toctree: generated
+
+   AsyncUrlOperations
+   AsyncAnyUrlOperations
+   AsyncFileUrlOperations
+   AsyncHttpUrlOperations
+   SyncUrlOperationsAdapter
+"""
+
+from .base import (
+    # base class for 3rd-party extensions and implementations
+    AsyncUrlOperations,
+    SyncUrlOperationsAdapter,
+)
+
+from .any import AsyncAnyUrlOperations
+from .file import AsyncFileUrlOperations
+from .http import AsyncHttpUrlOperations
@@ -0,0 +1,145 @@
+"""Asynchronous meta URL handler with scheme-based switching of implementations
+"""
+
+# allow for |-type UnionType declarations
+from __future__ import annotations
+
+from concurrent.futures import Executor
+import logging
+from pathlib import Path
+from typing import Dict
+
+from datalad_next.config import ConfigManager
+
+from ..any import AnyUrlOperations
+from ..base import UrlOperations
+from ..file import FileUrlOperations
+from ..http import HttpUrlOperations
+from .base import (
+    AsyncUrlOperations,
+    SyncUrlOperationsAdapter,
+)
+from .file import AsyncFileUrlOperations
+from .http import (
+    AsyncHttpUrlOperations,
+    aiohttp,
+)
+
+lgr = logging.getLogger('datalad.ext.next.url_operations.aio.any')
+
+
+__all__ = ['AsyncAnyUrlOperations']
+
+
+class AsyncAnyUrlOperations(AsyncUrlOperations):
+    """Handler for asynchronous operations on any supported URLs
+
+    URL handlers are selected exactly like with
+    :class:`~datalad_next.url_operations.AnyUrlOperations`, including any
+    handlers declared via ``datalad.url-handler.*`` configuration. If a
+    native asynchronous implementation exists for a selected handler
+    (:class:`AsyncFileUrlOperations`, and :class:`AsyncHttpUrlOperations` if
+    ``aiohttp`` is installed), it is used. Any other handler is run in an
+    executor via :class:`SyncUrlOperationsAdapter`. This also applies to
+    HTTP requests that require an authentication scheme that is not
+    supported by :class:`AsyncHttpUrlOperations`.
+
+    An instance retains and reuses URL scheme handler instances for subsequent
+    operations, such that held connections or cached credentials can be reused
+    efficiently.
+    """
+    def __init__(self,
+                 cfg: ConfigManager | None = None,
+                 *,
+                 executor: Executor | None = None):
+        """
+        Parameters
+        ----------
+        cfg: ConfigManager, optional
+          A config manager instance that is consulted for any configuration
+          filesystem configuration individual handlers may support.
+        executor: Executor, optional
+          Executor to run synchronous handlers in. By default, the default
+          executor of the running event loop is used.
+        """
+        super().__init__(cfg=cfg)
+        self._executor = executor
+        self._sync_ops = AnyUrlOperations(cfg=cfg)
+        # cache of async handlers, by the sync handler they are made for
+        self._url_handler_cache: Dict[int, AsyncUrlOperations] = {}
+
+    def _get_handler(self, url: str) -> AsyncUrlOperations:
+        sync_handler = self._sync_ops._get_handler(url)
+        handler = self._url_handler_cache.get(id(sync_handler))
+        if handler is None:
+            handler = self._make_async_handler(sync_handler)
+            self._url_handler_cache[id(sync_handler)] = handler
+        return handler
+
+    def _make_async_handler(self,
+                            sync_handler: UrlOperations) -> AsyncUrlOperations:
+        # only exact types, subclasses may implement different behavior
+        if type(sync_handler) is FileUrlOperations:
+            return AsyncFileUrlOperations(
+                cfg=sync_handler.cfg, executor=self._executor)
+        elif type(sync_handler) is HttpUrlOperations and aiohttp is not None:
+            # carry over any custom headers. the sync handler remains in
+            # charge of any authentication schemes not supported natively
+            return AsyncHttpUrlOperations(
+                cfg=sync_handler.cfg,
+                headers=sync_handler._headers,
+                fallback=SyncUrlOperationsAdapter(
+                    sync_handler, executor=self._executor),
+            )
+        lgr.debug('Using %s via executor', sync_handler.__class__.__name__)
+        return SyncUrlOperationsAdapter(sync_handler, executor=self._executor)
+
+    def is_supported_url(self, url) -> bool:
+        return self._sync_ops.is_supported_url(url)
+
+    async def aclose(self) -> None:
+        for handler in self._url_handler_cache.values():
+            await handler.aclose()
+        self._url_handler_cache.clear()
+
+    async def stat(self,
+                   url: str,
+                   *,
+                   credential: str | None = None,
+                   timeout: float | None = None) -> Dict:
+        """Call `*UrlOperations.stat()` for the respective URL scheme"""
+        return await self._get_handler(url).stat(
+            url, credential=credential, timeout=timeout)
+
+    async def download(self,
+                       from_url: str,
+                       to_path: Path | None,
+                       *,
+                       credential: str | None = None,
+                       hash: list[str] | None = None,
+                       timeout: float | None = None) -> Dict:
+        """Call `*UrlOperations.download()` for the respective URL scheme"""
+        return await self._get_handler(from_url).download(
+            from_url, to_path, credential=credential, hash=hash,
+            timeout=timeout)
+
+    async def upload(self,
+                     from_path: Path | None,
+                     to_url: str,
+                     *,
+                     credential: str | None = None,
+                     hash: list[str] | None = None,
+                     timeout: float | None = None) -> Dict:
+        """Call `*UrlOperations.upload()` for the respective URL scheme"""
+        return await self._get_handler(to_url).upload(
+            from_path, to_url, credential=credential, hash=hash,
+            timeout=timeout)
+
+    async def delete(self,
+                     url: str,
+                     *,
+                     credential: str | None = None,
+                     timeout: float | None = None) -> Dict:
+        """Call `*UrlOperations.delete()` for the respective URL scheme"""
+        return await self._get_handler(url).delete(
+            url, credential=credential, timeout=timeout)
@@ -0,0 +1,176 @@
+"""API base class"""
+
+# allow for |-type UnionType declarations
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Dict
+
+import datalad
+from datalad_next.config import ConfigManager
+
+from ..base import UrlOperations
+
+
+__all__ = ['AsyncUrlOperations', 'SyncUrlOperationsAdapter']
+
+
+class AsyncUrlOperations:
+    """Abstraction for asynchronous operations on URLs
+
+    This is the ``asyncio`` counterpart of
+    :class:`datalad_next.url_operations.UrlOperations`. All operations are
+    coroutines with the same parameters, return values, and exception
+    behavior as their synchronous counterparts. See the documentation of
+    :class:`~datalad_next.url_operations.UrlOperations` for details.
+
+    Implementations may hold resources, like network connections, across
+    operations. They must be released with :meth:`aclose`, or by using an
+    instance as an asynchronous context manager.
+    """
+    def __init__(self, *, cfg: ConfigManager | None = None):
+        """
+        Parameters
+        ----------
+        cfg: ConfigManager, optional
+          A config manager instance that implementations will consult for
+          any configuration items they may support.
+        """
+        self._cfg = cfg
+
+    @property
+    def cfg(self) -> ConfigManager:
+        if self._cfg is None:
+            self._cfg = datalad.cfg
+        return self._cfg
+
+    async def stat(self,
+                   url: str,
+                   *,
+                   credential: str | None = None,
+                   timeout: float | None = None) -> Dict:
+        """Gather information on a URL target, without downloading it
+
+        See :meth:`datalad_next.url_operations.UrlOperations.stat`.
+        """
+        raise NotImplementedError
+
+    async def download(self,
+                       from_url: str,
+                       to_path: Path | None,
+                       *,
+                       credential: str | None = None,
+                       hash: list[str] | None = None,
+                       timeout: float | None = None) -> Dict:
+        """Download from a URL to a local file or stream to stdout
+
+        See :meth:`datalad_next.url_operations.UrlOperations.download`.
+        """
+        raise NotImplementedError
+
+    async def upload(self,
+                     from_path: Path | None,
+                     to_url: str,
+                     *,
+                     credential: str | None = None,
+                     hash: list[str] | None = None,
+                     timeout: float | None = None) -> Dict:
+        """Upload from a local file or stream to a URL
+
+        See :meth:`datalad_next.url_operations.UrlOperations.upload`.
+        """
+        raise NotImplementedError
+
+    async def delete(self,
+                     url: str,
+                     *,
+                     credential: str | None = None,
+                     timeout: float | None = None) -> Dict:
+        """Delete a resource identified by a URL
+
+        See :meth:`datalad_next.url_operations.UrlOperations.delete`.
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release any resources held by the handler"""
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+class SyncUrlOperationsAdapter(AsyncUrlOperations):
+    """Run the operations of a synchronous handler in an executor
+
+    This adapter makes any
+    :class:`~datalad_next.url_operations.UrlOperations` implementation
+    usable with an event loop. Each operation occupies a thread of the
+    executor for its entire duration. Hence, the number of concurrent
+    operations is limited by the size of the executor.
+    """
+    def __init__(self,
+                 url_ops: UrlOperations,
+                 *,
+                 executor: Executor | None = None):
+        """
+        Parameters
+        ----------
+        url_ops: UrlOperations
+          Synchronous handler to perform all operations with.
+        executor: Executor, optional
+          Executor to run operations in. By default, the default executor
+          of the running event loop is used.
+        """
+        super().__init__(cfg=url_ops.cfg)
+        self._url_ops = url_ops
+        self._executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs))
+
+    async def stat(self,
+                   url: str,
+                   *,
+                   credential: str | None = None,
+                   timeout: float | None = None) -> Dict:
+        return await self._run(
+            self._url_ops.stat, url, credential=credential, timeout=timeout)
+
+    async def download(self,
+                       from_url: str,
+                       to_path: Path | None,
+                       *,
+                       credential: str | None = None,
+                       hash: list[str] | None = None,
+                       timeout: float | None = None) -> Dict:
+        return await self._run(
+            self._url_ops.download, from_url, to_path,
+            credential=credential, hash=hash, timeout=timeout)
+
+    async def upload(self,
+                     from_path: Path | None,
+                     to_url: str,
+                     *,
+                     credential: str | None = None,
+                     hash: list[str] | None = None,
+                     timeout: float | None = None) -> Dict:
+        return await self._run(
+            self._url_ops.upload, from_path, to_url,
+            credential=credential, hash=hash, timeout=timeout)
+
+    async def delete(self,
+                     url: str,
+                     *,
+                     credential: str | None = None,
+                     timeout: float | None = None) -> Dict:
+        return await self._run(
+            self._url_ops.delete, url, credential=credential, timeout=timeout)
@@ -0,0 +1,30 @@
+"""Asynchronous handler for operations on file:// URLs"""
+
+# allow for |-type UnionType declarations
+from __future__ import annotations
+
+from concurrent.futures import Executor
+
+from datalad_next.config import ConfigManager
+
+from ..file import FileUrlOperations
+from .base import SyncUrlOperationsAdapter
+
+
+__all__ = ['AsyncFileUrlOperations']
+
+
+class AsyncFileUrlOperations(SyncUrlOperationsAdapter):
+    """Handler for asynchronous operations on `file://` URLs
+
+    Operating systems offer no non-blocking access to regular files that
+    an event loop could wait on. Each operation is therefore performed by
+    :class:`~datalad_next.url_operations.FileUrlOperations` in an executor,
+    as a whole, such that it does not cost more than a single thread
+    hand-over per operation.
+    """
+    def __init__(self,
+                 cfg: ConfigManager | None = None,
+                 *,
+                 executor: Executor | None = None):
+        super().__init__(FileUrlOperations(cfg=cfg), executor=executor)
@@ -0,0 +1,417 @@
+"""Asynchronous handler for operations on http(s):// URLs"""
+
+# allow for |-type UnionType declarations
+from __future__ import annotations
+
+import asyncio
+from base64 import b64encode
+import logging
+from pathlib import Path
+import sys
+from typing import Dict
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    # optional dependency
+    aiohttp = None
+from requests_toolbelt import user_agent
+
+import datalad
+
+from datalad_next.config import ConfigManager
+from datalad_next.utils import (
+    DataladAuth,
+    parse_www_authenticate,
+)
+from datalad_next.utils.http_helpers import get_auth_realm
+from datalad_next.utils.multihash import (
+    MultiHash,
+    NoOpHash,
+)
+
+from ..exceptions import (
+    UrlOperationsRemoteError,
+    UrlOperationsResourceUnknown,
+)
+from ..http import HttpUrlOperations
+from .base import (
+    AsyncUrlOperations,
+    SyncUrlOperationsAdapter,
+)
+
+lgr = logging.getLogger('datalad.ext.next.url_operations.aio.http')
+
+
+__all__ = ['AsyncHttpUrlOperations']
+
+
+class AsyncHttpUrlOperations(AsyncUrlOperations):
+    """Handler for asynchronous operations on `http(s)://` URLs
+
+    This handler is built on the ``aiohttp`` package, which must be
+    installed. All operations of an instance share a single client session,
+    hence connections are reused for subsequent requests to the same host.
+    The number of concurrent connections per host is limited by the
+    ``datalad.http.async-connections-per-host`` configuration setting.
+    Operations exceeding this limit wait for a connection to become
+    available.
+
+    Authentication is supported with DataLad credentials, like with
+    :class:`~datalad_next.url_operations.HttpUrlOperations`, for the
+    'basic' and 'bearer' HTTP authentication schemes. Credential lookup
+    (and any interactive entry) is performed in a separate thread, in order
+    to not block the event loop. Authentication that succeeded for a URL is
+    reused for subsequent requests to URLs in the same directory, or below.
+    Operations on URLs that require any other authentication scheme (e.g.,
+    'digest') are performed by a ``fallback`` handler.
+    """
+    def __init__(self, cfg: ConfigManager | None = None,
+                 headers: Dict | None = None,
+                 *,
+                 fallback: AsyncUrlOperations | None = None):
+        """
+        Parameters
+        ----------
+        cfg: ConfigManager, optional
+          A config manager instance that is consulted for any configuration
+          filesystem configuration individual handlers may support.
+        headers: dict, optional
+          Additional or alternative headers to add to a request. The default
+          headers contain a ``user-agent`` declaration. Any headers provided
+          here override corresponding defaults.
+        fallback: AsyncUrlOperations, optional
+          Handler for operations on URLs that require an authentication
+          scheme that is not supported natively. By default, a
+          :class:`~datalad_next.url_operations.HttpUrlOperations` instance
+          is used via :class:`SyncUrlOperationsAdapter`.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncHttpUrlOperations requires the `aiohttp` package')
+        super().__init__(cfg=cfg)
+        self._headers = {
+            'user-agent': user_agent('datalad', datalad.__version__),
+        }
+        if headers:
+            self._headers.update(headers)
+        self._session: aiohttp.ClientSession | None = None
+        # 'Authorization' header values that succeeded, by target and
+        # realm, with the protection spaces they were used for
+        self._auth_cache: Dict = {}
+        # authenticate one request at a time, such that any other can
+        # reuse the outcome
+        self._auth_lock = asyncio.Lock()
+        self._fallback = fallback
+
+    def get_headers(self, headers: Dict | None = None) -> Dict:
+        # start with the default
+        hdrs = dict(self._headers)
+        if headers is not None:
+            hdrs.update(headers)
+        return hdrs
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=self.cfg.obtain(
+                        'datalad.http.async-connections-per-host'),
+                ),
+            )
+        return self._session
+
+    def _get_fallback(self) -> AsyncUrlOperations:
+        if self._fallback is None:
+            self._fallback = SyncUrlOperationsAdapter(
+                HttpUrlOperations(cfg=self.cfg, headers=self._headers))
+        return self._fallback
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._fallback is not None:
+            await self._fallback.aclose()
+
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       *,
+                       credential: str | None,
+                       timeout: float | None,
+                       headers: Dict | None = None,
+                       ) -> aiohttp.ClientResponse:
+        """Perform a request, and authenticate if the server demands it
+
+        The returned response must be released by the caller.
+
+        Raises
+        ------
+        _UnsupportedAuthentication
+          If the server demands an authentication scheme that is not
+          supported.
+        """
+        session = self._get_session()
+        hdrs = self.get_headers(headers)
+        authorization = _get_cached_authorization(
+            self._auth_cache, credential, url)
+        if authorization is not None:
+            hdrs['Authorization'] = authorization
+        kwargs = dict(
+            allow_redirects=True,
+            # like with `requests`, the timeout applies to establishing a
+            # connection, and to any wait for data. It is not a deadline
+            # for the entire transfer
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=timeout, sock_read=timeout),
+        )
+        r = await session.request(method, url, headers=hdrs, **kwargs)
+        if not 400 <= r.status < 500 \
+                or 'www-authenticate' not in r.headers:
+            return r
+
+        # the server demands authentication
+        challenges = parse_www_authenticate(r.headers['www-authenticate'])
+        if not any(s in _supported_auth_schemes for s in challenges):
+            r.release()
+            raise _UnsupportedAuthentication(url)
+        realm = get_auth_realm(str(r.url), challenges)
+        async with self._auth_lock:
+            authorization = None if 'Authorization' in hdrs \
+                else _get_cached_authorization(
+                    self._auth_cache, credential, str(r.url), realm)
+            auth = None
+            if authorization is None:
+                # another request did not authenticate for this realm
+                # already, look up a credential. this may prompt,
+                # keep the loop going meanwhile
+                auth = DataladAuth(self.cfg, credential=credential)
+                ascheme, _, cred = await asyncio.to_thread(
+                    _get_credential, auth, str(r.url), challenges)
+                if ascheme not in _supported_auth_schemes \
+                        and 'basic' in challenges:
+                    # a credential for another scheme, but with what
+                    # the server also accepts
+                    ascheme = 'basic'
+                authorization = _get_authorization(ascheme, cred)
+                if authorization is None:
+                    # nothing we can do, leave the response as-is
+                    return r
+            r.release()
+            hdrs['Authorization'] = authorization
+            # the final URL after any redirects
+            r = await session.request(method, r.url, headers=hdrs, **kwargs)
+            if r.status < 400:
+                _cache_authorization(
+                    self._auth_cache, credential, str(r.url), realm,
+                    authorization)
+        if auth is not None and r.status < 400:
+            await asyncio.to_thread(
+                auth.save_entered_credential,
+                context=f'for accessing {url}',
+            )
+        return r
+
+    def _check_status(self, r: aiohttp.ClientResponse, url: str) -> None:
+        if r.status == 404:
+            raise UrlOperationsResourceUnknown(url, status_code=r.status)
+        if r.status >= 400:
+            raise UrlOperationsRemoteError(
+                url,
+                message=f'{r.status} {r.reason} for url: {r.url}',
+                status_code=r.status,
+            )
+
+    async def stat(self,
+                   url: str,
+                   *,
+                   credential: str | None = None,
+                   timeout: float | None = None) -> Dict:
+        """Gather information on a URL target, without downloading it
+
+        See :meth:`datalad_next.url_operations.HttpUrlOperations.stat`
+        for the reported properties.
+
+        Raises
+        ------
+        UrlOperationsResourceUnknown
+          For access targets found absent.
+        """
+        try:
+            r = await self._request(
+                'HEAD', url, credential=credential, timeout=timeout)
+        except _UnsupportedAuthentication:
+            return await self._get_fallback().stat(
+                url, credential=credential, timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f'Timeout while accessing {url}') from e
+        try:
+            self._check_status(r, url)
+            props: Dict[str, str | int] = {
+                # same standardization as with HttpUrlOperations
+                k.lower() if k.lower() == 'content-length'
+                else f'http-{k.lower()}': v
+                for k, v in r.headers.items()
+            }
+            props['url'] = str(r.url)
+        finally:
+            r.release()
+        if 'content-length' in props:
+            try:
+                props['content-length'] = int(props['content-length'])
+            except (TypeError, ValueError):
+                pass
+        return props
+
+    async def download(self,
+                       from_url: str,
+                       to_path: Path | None,
+                       *,
+                       credential: str | None = None,
+                       hash: list[str] | None = None,
+                       timeout: float | None = None) -> Dict:
+        """Download via HTTP GET request
+
+        Raises
+        ------
+        UrlOperationsResourceUnknown
+          For download targets found absent.
+        """
+        hasher = MultiHash(hash) if hash is not None else NoOpHash()
+        try:
+            try:
+                r = await self._request(
+                    'GET', from_url, credential=credential, timeout=timeout)
+            except _UnsupportedAuthentication:
+                return await self._get_fallback().download(
+                    from_url, to_path, credential=credential, hash=hash,
+                    timeout=timeout)
+            try:
+                self._check_status(r, from_url)
+                fp = sys.stdout.buffer if to_path is None \
+                    else open(to_path, 'wb')
+                try:
+                    async for chunk in r.content.iter_chunked(65536):
+                        fp.write(chunk)
+                        hasher.update(chunk)
+                finally:
+                    if to_path is not None:
+                        fp.close()
+            finally:
+                r.release()
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f'Timeout while downloading {from_url}') from e
+        props: Dict[str, str] = {}
+        props.update(hasher.get_hexdigest())
+        return props
+
+    async def delete(self,
+                     url: str,
+                     *,
+                     credential: str | None = None,
+                     timeout: float | None = None) -> Dict:
+        """Delete the target of a http(s)://-URL"""
+        try:
+            r = await self._request(
+                'DELETE', url, credential=credential, timeout=timeout)
+        except _UnsupportedAuthentication:
+            return await self._get_fallback().delete(
+                url, credential=credential, timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f'Timeout while deleting {url}') from e
+        try:
+            self._check_status(r, url)
+        finally:
+            r.release()
+        return {}
+
+
+# authentication schemes supported natively
+_supported_auth_schemes = ('basic', 'bearer')
+
+
+class _UnsupportedAuthentication(Exception):
+    """A server demands an authentication scheme that is not supported"""
+
+
+def _get_credential(
+    auth: DataladAuth,
+    url: str,
+    challenges: Dict,
+) -> tuple[str | None, str | None, Dict | None]:
+    # one lookup at a time, like with DataladAuth as a requests handler
+    with DataladAuth._credential_lock:
+        return auth._get_credential(url, challenges)
+
+
+def _get_auth_target(credential: str | None, url: str) -> tuple[tuple, str]:
+    p = urlparse(url)
+    return (credential, p.scheme, p.netloc), p.path or '/'
+
+
+def _get_cached_authorization(
+    cache: Dict,
+    credential: str | None,
+    url: str,
+    realm: str | None = None,
+) -> str | None:
+    """Return an 'Authorization' header value that worked for a URL
+
+    Without a ``realm``, any value recorded for a protection space that
+    contains the URL is reported, otherwise any value for the realm.
+    """
+    target, path = _get_auth_target(credential, url)
+    if realm is not None:
+        authorization, _ = cache.get(target + (realm,), (None, None))
+        return authorization
+    # use the most specific protection space
+    match = max(
+        (
+            (prefix, authorization)
+            for key, (authorization, prefixes) in list(cache.items())
+            if key[:3] == target
+            for prefix in prefixes
+            if path.startswith(prefix)
+        ),
+        key=lambda m: len(m[0]),
+        default=None,
+    )
+    return match[1] if match else None
+
+
+def _cache_authorization(
+    cache: Dict,
+    credential: str | None,
+    url: str,
+    realm: str,
+    authorization: str,
+) -> None:
+    """Record an 'Authorization' header value that worked for a URL
+
+    The protection space is the directory of the URL, and anything below
+    it (RFC 7617, section 2.2).
+    """
+    target, path = _get_auth_target(credential, url)
+    key = target + (realm,)
+    _, prefixes = cache.get(key, (None, frozenset()))
+    cache[key] = (authorization, prefixes | {path.rpartition('/')[0] + '/'})
+
+
+def _get_authorization(ascheme: str | None, cred: Dict | None) -> str | None:
+    """Return an 'Authorization' header value for a credential"""
+    if cred is None or 'secret' not in cred:
+        return None
+    if ascheme is None:
+        ascheme = cred.get('http_auth_scheme')
+    if ascheme is None:
+        ascheme = 'bearer' if cred.get('type') == 'token' else 'basic'
+    if ascheme == 'basic':
+        userpass = f"{cred.get('user', '')}:{cred['secret']}"
+        return f"Basic {b64encode(userpass.encode('utf-8')).decode('ascii')}"
+    elif ascheme == 'bearer':
+        return f"Bearer {cred['secret']}"
+    lgr.debug('Unsupported HTTP authentication scheme %r', ascheme)
+    return None
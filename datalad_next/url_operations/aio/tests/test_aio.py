@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+import threading
+import time
+
+import pytest
+
+from ...file import FileUrlOperations
+from ...exceptions import UrlOperationsResourceUnknown
+from .. import (
+    AsyncAnyUrlOperations,
+    AsyncFileUrlOperations,
+    AsyncUrlOperations,
+    SyncUrlOperationsAdapter,
+)
+
+
+def test_async_file_url_operations(tmp_path):
+    src = tmp_path / 'src'
+    src.write_text('some content')
+    dst = tmp_path / 'dst'
+
+    async def run():
+        async with AsyncFileUrlOperations() as ops:
+            props = await ops.stat(src.as_uri())
+            assert props['content-length'] == 12
+            props = await ops.download(src.as_uri(), dst, hash=['md5'])
+            assert props['md5'] == hashlib.md5(b'some content').hexdigest()
+            await ops.delete(src.as_uri())
+            with pytest.raises(UrlOperationsResourceUnknown):
+                await ops.stat(src.as_uri())
+
+    asyncio.run(run())
+    assert dst.read_text() == 'some content'
+
+
+def test_sync_adapter_concurrency(tmp_path):
+    srcs = []
+    for i in range(20):
+        src = tmp_path / f'src{i}'
+        src.write_text(f'content{i}')
+        srcs.append(src)
+
+    async def run():
+        ops = SyncUrlOperationsAdapter(FileUrlOperations())
+        return await asyncio.gather(*(
+            ops.download(src.as_uri(), tmp_path / f'dst{i}')
+            for i, src in enumerate(srcs)
+        ))
+
+    assert len(asyncio.run(run())) == 20
+    for i in range(20):
+        assert (tmp_path / f'dst{i}').read_text() == f'content{i}'
+
+
+def test_async_any_url_operations(tmp_path):
+    src = tmp_path / 'src'
+    src.write_text('123')
+
+    async def run():
+        async with AsyncAnyUrlOperations() as ops:
+            assert ops.is_supported_url(src.as_uri())
+            assert not ops.is_supported_url('bogus://whatever')
+            assert (await ops.stat(src.as_uri()))['content-length'] == 3
+            # native implementation, reused for subsequent requests
+            handler = ops._get_handler(src.as_uri())
+            assert isinstance(handler, AsyncFileUrlOperations)
+            assert handler is ops._get_handler(src.as_uri())
+            # anything else is run via an executor
+            assert isinstance(
+                ops._get_handler('ssh://localhost/some'),
+                SyncUrlOperationsAdapter)
+            with pytest.raises(ValueError):
+                await ops.stat('bogus://whatever')
+
+    asyncio.run(run())
+
+
+def test_async_http_url_operations(http_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    from .. import AsyncHttpUrlOperations
+
+    (http_server.path / 'test.txt').write_text('test')
+
+    async def run():
+        async with AsyncHttpUrlOperations() as ops:
+            url = f'{http_server.url}test.txt'
+            props = await ops.stat(url)
+            assert props['content-length'] == 4
+            results = await asyncio.gather(*(
+                ops.download(url, tmp_path / f'dl{i}', hash=['md5'])
+                for i in range(10)
+            ))
+            assert all(r['md5'] == hashlib.md5(b'test').hexdigest()
+                       for r in results)
+            with pytest.raises(UrlOperationsResourceUnknown):
+                await ops.stat(f'{http_server.url}nothere')
+
+    asyncio.run(run())
+    assert (tmp_path / 'dl9').read_text() == 'test'
+
+
+def test_async_http_auth(credman, http_credential, http_server_with_basicauth,
+                         tmp_path):
+    pytest.importorskip('aiohttp')
+    from .. import AsyncHttpUrlOperations
+
+    srvurl = http_server_with_basicauth.url
+    (http_server_with_basicauth.path / 'test.txt').write_text('test')
+    credman.set(**dict(http_credential, realm=f'{srvurl}Protected'))
+
+    async def run():
+        async with AsyncHttpUrlOperations() as ops:
+            # the test server only supports GET requests with authentication
+            await ops.download(f'{srvurl}test.txt', tmp_path / 'dl1')
+            assert ops._auth_cache
+            await ops.download(f'{srvurl}test.txt', tmp_path / 'dl2')
+
+    asyncio.run(run())
+    assert (tmp_path / 'dl2').read_text() == 'test'
+
+
+@pytest.fixture
+def custom_http_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/trickle':
+                # 3 bytes, one per second
+                self.send_response(200)
+                self.send_header('Content-Length', '3')
+                self.end_headers()
+                for _ in range(3):
+                    time.sleep(1)
+                    self.wfile.write(b'x')
+                    self.wfile.flush()
+            elif self.path == '/digest':
+                self.send_response(401)
+                self.send_header(
+                    'WWW-Authenticate', 'Digest realm="test", nonce="abc"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        do_HEAD = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_http_timeout(custom_http_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    from .. import AsyncHttpUrlOperations
+
+    async def run():
+        async with AsyncHttpUrlOperations() as ops:
+            # the timeout applies to waiting for data, not to the entire
+            # transfer
+            await ops.download(
+                f'{custom_http_server}/trickle', tmp_path / 'dl',
+                timeout=2)
+
+    asyncio.run(run())
+    assert (tmp_path / 'dl').read_bytes() == b'xxx'
+
+
+def test_async_http_auth_fallback(custom_http_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    from .. import AsyncHttpUrlOperations
+
+    class Fallback(AsyncUrlOperations):
+        calls = []
+
+        async def stat(self, url, *, credential=None, timeout=None):
+            self.calls.append(('stat', url))
+            return {'content-length': 1}
+
+        async def download(self, from_url, to_path, *, credential=None,
+                           hash=None, timeout=None):
+            self.calls.append(('download', from_url))
+            return {}
+
+    url = f'{custom_http_server}/digest'
+
+    async def run():
+        # digest authentication is not supported natively
+        async with AsyncHttpUrlOperations(fallback=Fallback()) as ops:
+            assert await ops.stat(url) == {'content-length': 1}
+            await ops.download(url, tmp_path / 'dl')
+
+    asyncio.run(run())
+    assert Fallback.calls == [('stat', url), ('download', url)]
+    # by default, the synchronous handler takes over
+    ops = AsyncAnyUrlOperations()
+    handler = ops._get_handler(url)
+    assert isinstance(handler, AsyncHttpUrlOperations)
+    assert handler._get_fallback()._url_ops is ops._sync_ops._get_handler(url)
@@ -8,7 +8,11 @@ import json
 import logging
 from pathlib import Path
 import re
-from typing import Dict
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+)
 
 from datalad_next.config import ConfigManager
 from datalad_next.exceptions import CapturedException
@@ -180,11 +184,70 @@ class AnyUrlOperations(UrlOperations):
                  *,
                  credential: str | None = None,
                  hash: list[str] | None = None,
-                 timeout: float | None = None) -> Dict:
+                 timeout: float | None = None,
+                 resume: bool = False) -> Dict:
         """Call `*UrlOperations.download()` for the respective URL scheme"""
         return self._get_handler(from_url).download(
             from_url, to_path, credential=credential, hash=hash,
-            timeout=timeout)
+            timeout=timeout, resume=resume)
+
+    def stat_many(self,
+                  urls: Iterable[str],
+                  *,
+                  credential: str | None = None,
+                  timeout: float | None = None,
+                  ) -> Generator[tuple[str, Dict | Exception], None, None]:
+        """Call `*UrlOperations.stat_many()` for the respective URL schemes
+
+        URLs are grouped by handler, and each handler processes its URLs
+        in a single call. Results are reported in the order of ``urls``.
+        """
+        yield from self._dispatch_many(
+            urls,
+            lambda url: url,
+            lambda handler, urls: handler.stat_many(
+                urls, credential=credential, timeout=timeout),
+        )
+
+    def download_many(self,
+                      items: Iterable[tuple[str, Path | None]],
+                      *,
+                      credential: str | None = None,
+                      hash: list[str] | None = None,
+                      timeout: float | None = None,
+                      ) -> Generator[
+                          tuple[str, Path | None, Dict | Exception],
+                          None, None]:
+        """Call `*UrlOperations.download_many()` for the respective URL schemes
+
+        Downloads are grouped by handler, and each handler processes its
+        downloads in a single call. Results are reported in the order of
+        ``items``.
+        """
+        yield from self._dispatch_many(
+            items,
+            lambda item: item[0],
+            lambda handler, items: handler.download_many(
+                items, credential=credential, hash=hash, timeout=timeout),
+        )
+
+    def _dispatch_many(self, items, get_url, run):
+        items = list(items)
+        # item indices by handler
+        groups: Dict[int, tuple[UrlOperations, list[int]]] = {}
+        for i, item in enumerate(items):
+            handler = self._get_handler(get_url(item))
+            groups.setdefault(id(handler), (handler, []))[1].append(i)
+        if len(groups) == 1:
+            # no need to reorder
+            handler = next(iter(groups.values()))[0]
+            yield from run(handler, items)
+            return
+        results: list = [None] * len(items)
+        for handler, idx in groups.values():
+            for i, res in zip(idx, run(handler, [items[i] for i in idx])):
+                results[i] = res
+        yield from results
 
     def upload(self,
                from_path: Path | None,
@@ -206,3 +269,13 @@ class AnyUrlOperations(UrlOperations):
         """Call `*UrlOperations.delete()` for the respective URL scheme"""
         return self._get_handler(url).delete(
             url, credential=credential, timeout=timeout)
+
+    def is_modified(self,
+                    url: str,
+                    props: Dict,
+                    *,
+                    credential: str | None = None,
+                    timeout: float | None = None) -> bool:
+        """Call `*UrlOperations.is_modified()` for the respective URL scheme"""
+        return self._get_handler(url).is_modified(
+            url, props, credential=credential, timeout=timeout)
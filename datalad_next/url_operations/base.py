@@ -22,6 +22,8 @@ from datalad_next.utils.multihash import (
     NoOpHash,
 )
 
+from .exceptions import UrlOperationsRemoteError
+
 
 lgr = logging.getLogger('datalad.ext.next.url_operations')
 
@@ -41,6 +43,10 @@ class UrlOperations:
     This class provides a range of helper methods to aid computation of
     hashes and progress reporting.
     """
+    validator_props = ('content-length', 'http-etag', 'http-last-modified')
+    """Names of :meth:`stat` properties that identify a particular version
+    of a URL target"""
+
     def __init__(self, *, cfg: ConfigManager | None = None):
         """
         Parameters
@@ -107,7 +113,8 @@ class UrlOperations:
                  *,
                  credential: str | None = None,
                  hash: list[str] | None = None,
-                 timeout: float | None = None) -> Dict:
+                 timeout: float | None = None,
+                 resume: bool = False) -> Dict:
         """Download from a URL to a local file or stream to stdout
 
         Parameters
@@ -133,6 +140,10 @@ class UrlOperations:
           If given, specifies a timeout in seconds. If the operation is not
           completed within this time, it will raise a `TimeoutError`-exception.
           If timeout is None, the operation will never timeout.
+        resume: bool, optional
+          If set, an implementation may continue a previously interrupted
+          download to `to_path`. Implementations that cannot resume
+          downloads ignore this flag, and perform a complete download.
 
         Returns
         -------
@@ -301,6 +312,129 @@ class UrlOperations:
         """
         raise NotImplementedError
 
+    def is_modified(self,
+                    url: str,
+                    props: Dict,
+                    *,
+                    credential: str | None = None,
+                    timeout: float | None = None) -> bool:
+        """Test whether a URL target changed since ``props`` were obtained
+
+        The default implementation calls :meth:`stat` and compares the values
+        of all validator properties (see ``validator_props``) that are
+        present in ``props``. Implementations may override this method
+        to use a cheaper, conditional request.
+
+        Parameters
+        ----------
+        url: str
+          Valid URL with any scheme supported by a particular implementation.
+        props: dict
+          Properties of the URL target, as previously reported by
+          :meth:`stat`.
+        credential: str, optional
+          The name of a dedicated credential to be used for authentication.
+        timeout: float, optional
+          If given, specifies a timeout in seconds.
+
+        Returns
+        -------
+        bool
+          ``False`` if the target is known to be unchanged, ``True``
+          otherwise.
+
+        Raises
+        ------
+        All exceptions documented for :meth:`stat` can be raised.
+        """
+        current = self.stat(url, credential=credential, timeout=timeout)
+        validators = [p for p in self.validator_props if p in props]
+        if not validators:
+            # nothing to compare, we cannot know
+            return True
+        return any(props[p] != current.get(p) for p in validators)
+
+    def stat_many(self,
+                  urls: Iterable[str],
+                  *,
+                  credential: str | None = None,
+                  timeout: float | None = None,
+                  ) -> Generator[tuple[str, Dict | Exception], None, None]:
+        """Gather information on any number of URL targets
+
+        This default implementation calls :meth:`stat` for each URL in turn.
+        Implementations can override it with a more efficient approach for
+        their respective protocol (e.g., concurrent requests, or a single
+        remote command for all URLs).
+
+        Parameters
+        ----------
+        urls: iterable(str)
+          URLs to gather information on.
+        credential: str, optional
+          See :meth:`stat`.
+        timeout: float, optional
+          See :meth:`stat`. Applies to any individual URL.
+
+        Yields
+        ------
+        tuple(str, dict or Exception)
+          One item per URL, in the order of ``urls``, with the URL and either
+          the properties reported by :meth:`stat`, or the exception that
+          was raised for this URL (``UrlOperationsRemoteError`` and any
+          subclass, or ``TimeoutError``). Any other exception is raised
+          immediately.
+        """
+        for url in urls:
+            try:
+                yield url, self.stat(
+                    url, credential=credential, timeout=timeout)
+            except (UrlOperationsRemoteError, TimeoutError) as e:
+                yield url, e
+
+    def download_many(self,
+                      items: Iterable[tuple[str, Path | None]],
+                      *,
+                      credential: str | None = None,
+                      hash: list[str] | None = None,
+                      timeout: float | None = None,
+                      ) -> Generator[
+                          tuple[str, Path | None, Dict | Exception],
+                          None, None]:
+        """Download any number of URL targets
+
+        This default implementation calls :meth:`download` for each item in
+        turn. Implementations can override it with a more efficient approach
+        for their respective protocol.
+
+        Parameters
+        ----------
+        items: iterable(tuple(str, Path or None))
+          Pairs of source URL and destination path, as taken by
+          :meth:`download`.
+        credential: str, optional
+          See :meth:`download`.
+        hash: list(algorithm_names), optional
+          See :meth:`download`.
+        timeout: float, optional
+          See :meth:`download`. Applies to any individual download.
+
+        Yields
+        ------
+        tuple(str, Path or None, dict or Exception)
+          One item per download, in the order of ``items``, with the source
+          URL, the destination path, and either the properties reported by
+          :meth:`download`, or the exception that was raised for this
+          download (``UrlOperationsRemoteError`` and any subclass, or
+          ``TimeoutError``). Any other exception is raised immediately.
+        """
+        for from_url, to_path in items:
+            try:
+                yield from_url, to_path, self.download(
+                    from_url, to_path, credential=credential, hash=hash,
+                    timeout=timeout)
+            except (UrlOperationsRemoteError, TimeoutError) as e:
+                yield from_url, to_path, e
 
     def _get_progress_id(self, from_id: str, to_id: str):
         return f'progress_transport_{from_id}_{to_id}'
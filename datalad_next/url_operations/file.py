@@ -3,7 +3,10 @@
 # allow for |-type UnionType declarations
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import errno
 import logging
+import os
 import random
 import stat
 import sys
@@ -14,13 +17,18 @@ from pathlib import Path
 from typing import (
     BinaryIO,
     Dict,
+    Generator,
+    Iterable,
 )
 from urllib import (
     request,
     parse,
 )
 
-from datalad_next.consts import COPY_BUFSIZE
+from datalad_next.consts import (
+    COPY_BUFSIZE,
+    on_linux,
+)
 
 from .base import UrlOperations
 from .exceptions import (
@@ -40,6 +48,15 @@ class FileUrlOperations(UrlOperations):
     Access to local data via file-scheme URLs is supported with the
     same API and feature set as other URL-schemes (simultaneous
     content hashing and progress reporting.
+
+    Copies between regular files are performed by the operating system
+    kernel, without passing the data through Python, whenever possible.
+    On copy-on-write filesystems (e.g., btrfs, XFS) a copy is created
+    as a reflink (``FICLONE``) that shares storage with the source file.
+    Otherwise ``os.copy_file_range()`` (which also enables server-side copies
+    on NFS), or ``os.sendfile()`` are used. When hashes are requested, the
+    source file is read for hashing in a separate thread, while the kernel
+    copies the next portion of the file.
     """
     def _file_url_to_path(self, url):
         assert url.startswith('file://')
@@ -82,6 +99,60 @@ class FileUrlOperations(UrlOperations):
             '_path': from_path,
         }
 
+    # minimum number of paths in the same directory to read the directory
+    # listing, rather than to stat() each path individually
+    _stat_many_scandir_threshold = 16
+
+    def stat_many(self,
+                  urls: Iterable[str],
+                  *,
+                  credential: str | None = None,
+                  timeout: float | None = None,
+                  ) -> Generator[tuple[str, Dict | Exception], None, None]:
+        """Gather information on any number of file:// URL targets
+
+        For many targets in the same directory, the directory is read once.
+        Absent targets are then identified without any further system call,
+        and the properties of present targets are queried relative to the
+        open directory.
+
+        See :meth:`datalad_next.url_operations.UrlOperations.stat_many`
+        for parameter documentation and return value.
+        """
+        urls = list(urls)
+        paths = [self._file_url_to_path(url) for url in urls]
+        # URL indices by parent directory
+        groups: Dict[Path, list[int]] = {}
+        for i, path in enumerate(paths):
+            groups.setdefault(path.parent, []).append(i)
+        results: list = [None] * len(urls)
+        for parent, idx in groups.items():
+            entries = None
+            if len(idx) >= self._stat_many_scandir_threshold:
+                try:
+                    with os.scandir(parent) as it:
+                        entries = {e.name: e for e in it}
+                except (FileNotFoundError, NotADirectoryError):
+                    # nothing in here
+                    entries = {}
+            for i in idx:
+                url = urls[i]
+                try:
+                    if entries is None:
+                        size = paths[i].stat().st_size
+                    else:
+                        entry = entries.get(paths[i].name)
+                        if entry is None:
+                            raise FileNotFoundError(paths[i])
+                        size = entry.stat().st_size
+                except (FileNotFoundError, NotADirectoryError) as e:
+                    exc = UrlOperationsResourceUnknown(url)
+                    exc.__cause__ = e
+                    results[i] = (url, exc)
+                    continue
+                results[i] = (url, {'content-length': size})
+        yield from results
+
     def download(self,
                  from_url: str,
                  to_path: Path | None,
@@ -91,7 +162,9 @@ class FileUrlOperations(UrlOperations):
                  # to gain file access
                  credential: str | None = None,
                  hash: list[str] | None = None,
-                 timeout: float | None = None) -> Dict:
+                 timeout: float | None = None,
+                 # unused, downloads always start from the beginning
+                 resume: bool = False) -> Dict:
         """Copy a file:// URL target to a local path
 
         See :meth:`datalad_next.url_operations.UrlOperations.download`
@@ -273,6 +346,14 @@ class FileUrlOperations(UrlOperations):
             progress_id, start_log, progress_label, expected_size)
         copy_size = 0
         try:
+            if _is_regular_file(src_fp) and _is_regular_file(dst_fp):
+                copy_size = self._copyfp_in_kernel(
+                    src_fp,
+                    dst_fp,
+                    hasher if hash is not None else None,
+                    lambda n: self._progress_report_update(
+                        progress_id, update_log, n),
+                )
             while True:
                 chunk = src_fp_read(COPY_BUFSIZE)
                 if not chunk:
@@ -292,3 +373,154 @@ class FileUrlOperations(UrlOperations):
             return props
         finally:
             self._progress_report_stop(progress_id, finish_log)
+
+    def _copyfp_in_kernel(self,
+                          src_fp: IOBase | BinaryIO,
+                          dst_fp: IOBase | BinaryIO,
+                          hasher,
+                          report_progress) -> int:
+        """Copy from the current positions of two regular files in the kernel
+
+        Returns the number of bytes copied. The positions of both file
+        objects are advanced accordingly. Zero is returned, if no kernel-side
+        copy method is supported for the files. Any remaining content must
+        then be copied by other means.
+        """
+        dst_fp.flush()
+        src_fd = src_fp.fileno()
+        dst_fd = dst_fp.fileno()
+        src_off = src_fp.tell()
+        dst_off = dst_fp.tell()
+        size = os.fstat(src_fd).st_size - src_off
+        if size <= 0:
+            # nothing to copy, or a special file that does not report
+            # a size
+            return 0
+
+        hash_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='file-hash') \
+            if hasher is not None else None
+        # hashing of the previous portion, if any
+        hashing = None
+        copied = 0
+        try:
+            if src_off == 0 and dst_off == 0 \
+                    and _clone_file(src_fd, dst_fd):
+                lgr.debug('Cloned %s bytes', size)
+                copied = size
+                if hasher is not None:
+                    _hash_range(hasher, src_fd, 0, size)
+                report_progress(size)
+            else:
+                copy_range = None
+                while copied < size:
+                    count = min(_KERNEL_COPY_CHUNKSIZE, size - copied)
+                    if copy_range is None:
+                        copy_range, n = _start_kernel_copy(
+                            src_fd, dst_fd, src_off, dst_off, count)
+                        if copy_range is None:
+                            # not supported
+                            return 0
+                    else:
+                        n = copy_range(
+                            src_fd, dst_fd,
+                            src_off + copied, dst_off + copied, count)
+                    if not n:
+                        # the file got shorter meanwhile
+                        break
+                    if hash_pool is not None:
+                        # hash this portion while the next one is copied.
+                        # the single worker thread processes in order
+                        if hashing is not None:
+                            hashing.result()
+                        hashing = hash_pool.submit(
+                            _hash_range, hasher, src_fd, src_off + copied, n)
+                    copied += n
+                    report_progress(n)
+                if hashing is not None:
+                    hashing.result()
+        finally:
+            if hash_pool is not None:
+                hash_pool.shutdown()
+        src_fp.seek(src_off + copied)
+        dst_fp.seek(dst_off + copied)
+        return copied
+
+
+# portion of a file to copy with a single system call
+_KERNEL_COPY_CHUNKSIZE = 8 * 1024 * 1024
+
+# from linux/fs.h
+_FICLONE = 0x40049409
+
+# error codes indicating that a kernel-side copy method is not supported
+# for a pair of files
+_KERNEL_COPY_UNSUPPORTED = {
+    getattr(errno, e) for e in (
+        'EXDEV', 'ENOSYS', 'EINVAL', 'EOPNOTSUPP', 'ENOTSUP', 'ENOTSOCK',
+        'EBADF',
+    )
+    if hasattr(errno, e)
+}
+
+
+def _is_regular_file(fp: IOBase | BinaryIO) -> bool:
+    try:
+        return stat.S_ISREG(os.fstat(fp.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        # no file descriptor
+        return False
+
+
+def _clone_file(src_fd: int, dst_fd: int) -> bool:
+    """Try to create a reflink of a source file via FICLONE"""
+    if not on_linux:
+        return False
+    import fcntl
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file_range(src_fd, dst_fd, src_off, dst_off, count) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count, src_off, dst_off)
+
+
+def _sendfile(src_fd, dst_fd, src_off, dst_off, count) -> int:
+    # sendfile() writes at the current position of the destination
+    os.lseek(dst_fd, dst_off, os.SEEK_SET)
+    return os.sendfile(dst_fd, src_fd, src_off, count)
+
+
+def _start_kernel_copy(src_fd, dst_fd, src_off, dst_off, count):
+    """Copy a first portion with the first supported kernel-side method
+
+    Returns the method and the number of bytes copied, or ``(None, 0)``
+    if no method is supported.
+    """
+    for copy_range in (
+            _copy_file_range if hasattr(os, 'copy_file_range') else None,
+            _sendfile if hasattr(os, 'sendfile') else None,
+    ):
+        if copy_range is None:
+            continue
+        try:
+            return copy_range, copy_range(
+                src_fd, dst_fd, src_off, dst_off, count)
+        except OSError as e:
+            if e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                raise
+            lgr.debug('%s not supported: %s', copy_range.__name__, e)
+    return None, 0
+
+
+def _hash_range(hasher, fd: int, offset: int, count: int) -> None:
+    end = offset + count
+    while offset < end:
+        chunk = os.pread(fd, min(COPY_BUFSIZE, end - offset), offset)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        offset += len(chunk)
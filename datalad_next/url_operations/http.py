@@ -3,12 +3,29 @@
 # allow for |-type UnionType declarations
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import cached_property
+import io
+import json
 import logging
 from pathlib import Path
+import re
 import sys
-from typing import Dict
+import threading
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+)
 import requests
+from requests.adapters import HTTPAdapter
 from requests_toolbelt import user_agent
+from urllib3.util.retry import Retry
 
 import datalad
 
@@ -16,6 +33,10 @@ from datalad_next.utils import (
     DataladAuth,
     parse_www_authenticate,
 )
+from datalad_next.utils.multihash import (
+    MultiHash,
+    NoOpHash,
+)
 from .base import UrlOperations
 from .exceptions import (
     UrlOperationsRemoteError,
@@ -25,7 +46,7 @@ from .exceptions import (
 lgr = logging.getLogger('datalad.ext.next.url_operations.http')
 
 
-__all__ = ['HttpUrlOperations']
+__all__ = ['HttpUrlOperations', 'HttpRangeReader']
 
 
 class HttpUrlOperations(UrlOperations):
@@ -35,6 +56,21 @@ class HttpUrlOperations(UrlOperations):
     employes :class:`datalad_next.utils.requests_auth.DataladAuth`, an adaptor
     that consults the DataLad credential system in order to fulfill HTTP
     authentication challenges.
+
+    All requests of a handler instance are performed with a single
+    ``requests.Session``. Connections are kept alive and reused for
+    subsequent requests to the same host. The size of the connection pool
+    per host (``datalad.http.pool-maxsize``), and the number of retries
+    for failed connections and temporary server errors
+    (``datalad.http.retries``, ``datalad.http.retry-backoff``) are
+    configurable. Authentication that succeeded for a URL is reused for
+    subsequent requests to URLs in the same directory, or below, without
+    waiting for another authentication challenge (see
+    :class:`~datalad_next.utils.requests_auth.DataladAuth`).
+
+    Large downloads from servers that support range requests are split
+    into segments that are downloaded concurrently via separate connections
+    (see :meth:`download`).
     """
 
     def __init__(self, cfg=None, headers: Dict | None = None):
@@ -55,6 +91,36 @@ class HttpUrlOperations(UrlOperations):
         }
         if headers:
             self._headers.update(headers)
+        # authentication handlers that succeeded, shared across requests
+        # (see DataladAuth)
+        self._auth_cache: Dict = {}
+
+    @cached_property
+    def _session(self) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(
+            total=self.cfg.obtain('datalad.http.retries'),
+            backoff_factor=self.cfg.obtain('datalad.http.retry-backoff'),
+            # a read timeout must surface as such (TimeoutError), and
+            # must not be multiplied by retries
+            read=False,
+            # temporary server-side issues
+            status_forcelist=(429, 502, 503, 504),
+            respect_retry_after_header=True,
+            # report the final response, status checks are done by us
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_maxsize=self.cfg.obtain('datalad.http.pool-maxsize'),
+            max_retries=retries,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_auth(self, credential: str | None) -> DataladAuth:
+        return DataladAuth(
+            self.cfg, credential=credential, auth_cache=self._auth_cache)
 
     def get_headers(self, headers: Dict | None = None) -> Dict:
         # start with the default
@@ -93,9 +159,9 @@ class HttpUrlOperations(UrlOperations):
         UrlOperationsResourceUnknown
           For access targets found absent.
         """
-        auth = DataladAuth(self.cfg, credential=credential)
+        auth = self._get_auth(credential)
         props: Dict[str, str | int]
-        with requests.head(
+        with self._session.head(
                 url,
                 headers=self.get_headers(),
                 auth=auth,
@@ -127,6 +193,53 @@ class HttpUrlOperations(UrlOperations):
                 pass
         return props
 
+    def is_modified(self,
+                    url: str,
+                    props: Dict,
+                    *,
+                    credential: str | None = None,
+                    timeout: float | None = None) -> bool:
+        """Test whether a URL target changed, via a conditional request
+
+        The ``ETag`` and ``Last-Modified`` validators in ``props`` (as
+        reported by :meth:`stat`) are sent as ``If-None-Match`` and
+        ``If-Modified-Since`` headers with a ``HEAD`` request. A server
+        response ``304 Not Modified`` indicates an unchanged target.
+
+        See :meth:`datalad_next.url_operations.UrlOperations.is_modified`
+        for parameter documentation and exception behavior.
+        """
+        conditions = {
+            hdr: props[prop]
+            for prop, hdr in (
+                ('http-etag', 'If-None-Match'),
+                ('http-last-modified', 'If-Modified-Since'),
+            )
+            if props.get(prop)
+        }
+        if not conditions:
+            # no validators, fall back on comparing properties
+            return super().is_modified(
+                url, props, credential=credential, timeout=timeout)
+        auth = self._get_auth(credential)
+        try:
+            with self._session.head(
+                    url,
+                    headers=self.get_headers(conditions),
+                    auth=auth,
+                    allow_redirects=True,
+                    timeout=timeout,
+            ) as r:
+                # fail visible for any non-OK outcome
+                self._check_status(r, url)
+                modified = r.status_code != 304
+        except requests.exceptions.ReadTimeout as e:
+            raise TimeoutError from e
+        auth.save_entered_credential(
+            context=f"for accessing {url}"
+        )
+        return modified
+
     def delete(self,
                url: str,
                *,
@@ -135,9 +248,9 @@ class HttpUrlOperations(UrlOperations):
         """Delete the target of a http(s)://-URL
 
         """
-        auth = DataladAuth(self.cfg, credential=credential)
+        auth = self._get_auth(credential)
         try:
-            with requests.delete(
+            with self._session.delete(
                     url=url,
                     stream=True,
                     headers=self.get_headers(),
@@ -159,22 +272,48 @@ class HttpUrlOperations(UrlOperations):
                  *,
                  credential: str | None = None,
                  hash: list[str] | None = None,
-                 timeout: float | None = None) -> Dict:
+                 timeout: float | None = None,
+                 resume: bool = False) -> Dict:
         """Download via HTTP GET request
 
         See :meth:`datalad_next.url_operations.UrlOperations.download`
         for parameter documentation and exception behavior.
 
+        If the server supports range requests (``Accept-Ranges: bytes``),
+        and the download target is at least ``datalad.http.segment-threshold``
+        bytes in size, the content is downloaded in
+        ``datalad.http.download-segments`` segments concurrently. Any
+        segment is written to its location in the (preallocated) target
+        file directly. Hashes are computed over the completed leading
+        portion of the file, while subsequent segments are still being
+        downloaded.
+
+        With ``resume=True``, content is downloaded to a ``<to_path>.part``
+        file first, accompanied by a ``<to_path>.part.json`` file with the
+        URL and the version (ETag or Last-Modified) of the download target.
+        It is only renamed to ``to_path`` on completion. If a partial download
+        of the same version of the same URL is found, the download continues
+        at its end (via ``Range`` and ``If-Range`` request headers). Any
+        hashes are computed over the previously downloaded content first.
+        If the server does not support resuming, or the target has changed,
+        the download starts from the beginning. Resumable downloads are never
+        segmented.
+
         Raises
         ------
         UrlOperationsResourceUnknown
           For download targets found absent.
         """
-        # a new manager per request
-        # TODO optimize later to cache credentials per target
-        # similar to requests_toolbelt.auth.handler.AuthHandler
-        auth = DataladAuth(self.cfg, credential=credential)
-        with requests.get(
+        auth = self._get_auth(credential)
+        if resume and to_path is not None:
+            download_props = self._resumable_download(
+                from_url, to_path, auth=auth, hash=hash, timeout=timeout)
+            auth.save_entered_credential(
+                context=f'download from {from_url}'
+            )
+            return download_props
+
+        with self._session.get(
                 from_url,
                 stream=True,
                 headers=self.get_headers(),
@@ -182,13 +321,145 @@ class HttpUrlOperations(UrlOperations):
         ) as r:
             # fail visible for any non-OK outcome
             self._check_status(r, from_url)
-            download_props = self._stream_download_from_request(
-                r, to_path, hash=hash)
+            nsegments = self._get_download_segments(r, to_path)
+            if nsegments < 2:
+                download_props = self._stream_download_from_request(
+                    r, to_path, hash=hash)
+            else:
+                # only a download to a file is segmented
+                assert to_path is not None
+                # the content of the initial response is used for the
+                # first segment, all other segments are requested
+                # individually from the final URL
+                download_props = self._segmented_download(
+                    r,
+                    to_path,
+                    nsegments=nsegments,
+                    credential=credential,
+                    hash=hash,
+                    timeout=timeout,
+                )
         auth.save_entered_credential(
             context=f'download from {from_url}'
         )
         return download_props
 
+    def stat_many(self,
+                  urls: Iterable[str],
+                  *,
+                  credential: str | None = None,
+                  timeout: float | None = None,
+                  ) -> Generator[tuple[str, Dict | Exception], None, None]:
+        """Gather information on any number of http(s):// URL targets
+
+        Requests are performed concurrently, with up to
+        ``datalad.http.pool-maxsize`` requests in flight, over the pooled
+        connections of this handler. The first request is performed on its
+        own, such that any authentication (and credential entry) happens
+        only once, and is reused for all subsequent requests to the same
+        host.
+
+        See :meth:`datalad_next.url_operations.UrlOperations.stat_many`
+        for parameter documentation and return value.
+        """
+        def _stat(url):
+            try:
+                return url, self.stat(
+                    url, credential=credential, timeout=timeout)
+            except (UrlOperationsRemoteError, TimeoutError) as e:
+                return url, e
+
+        yield from _map_concurrently(
+            _stat, urls, self.cfg.obtain('datalad.http.pool-maxsize'))
+
+    def download_many(self,
+                      items: Iterable[tuple[str, Path | None]],
+                      *,
+                      credential: str | None = None,
+                      hash: list[str] | None = None,
+                      timeout: float | None = None,
+                      ) -> Generator[
+                          tuple[str, Path | None, Dict | Exception],
+                          None, None]:
+        """Download any number of http(s):// URL targets
+
+        Downloads are performed concurrently, like the requests of
+        :meth:`stat_many`. Downloads to stdout are never performed
+        concurrently.
+
+        See :meth:`datalad_next.url_operations.UrlOperations.download_many`
+        for parameter documentation and return value.
+        """
+        stdout_lock = threading.Lock()
+
+        def _download(item):
+            from_url, to_path = item
+            try:
+                if to_path is None:
+                    with stdout_lock:
+                        props = self.download(
+                            from_url, to_path, credential=credential,
+                            hash=hash, timeout=timeout)
+                else:
+                    props = self.download(
+                        from_url, to_path, credential=credential,
+                        hash=hash, timeout=timeout)
+                return from_url, to_path, props
+            except (UrlOperationsRemoteError, TimeoutError) as e:
+                return from_url, to_path, e
+
+        yield from _map_concurrently(
+            _download, items, self.cfg.obtain('datalad.http.pool-maxsize'))
+
+    def open_seekable(self,
+                      url: str,
+                      *,
+                      credential: str | None = None,
+                      timeout: float | None = None,
+                      buffer_size: int = 1024 * 1024) -> io.BufferedReader:
+        """Open a read-only, seekable file-like for a http(s):// URL target
+
+        Only servers that support HTTP range requests (``Accept-Ranges:
+        bytes``) can be accessed in this way. Reading from the returned
+        file-like object performs range requests for the requested byte
+        ranges only, hence it is possible to read small portions of
+        large files without downloading them completely.
+
+        This can be used, for example, to open a ZIP archive via
+        ``zipfile.ZipFile`` directly on the remote server.
+
+        Parameters
+        ----------
+        url: str
+          http(s):// URL to open.
+        credential: str, optional
+          The name of a dedicated credential to be used for authentication.
+        timeout: float, optional
+          Timeout in seconds for any individual request.
+        buffer_size: int, optional
+          Minimum number of bytes to request with any individual range
+          request. Larger values reduce the number of requests for
+          sequential reads, smaller values reduce the amount of data
+          transferred for random access.
+
+        Returns
+        -------
+        io.BufferedReader
+          Must be closed by the caller, or used as a context manager.
+
+        Raises
+        ------
+        UrlOperationsRemoteError
+          If the server does not support range requests.
+        UrlOperationsResourceUnknown
+          For targets found absent.
+        """
+        return io.BufferedReader(
+            HttpRangeReader(
+                self, url, credential=credential, timeout=timeout),
+            buffer_size=buffer_size,
+        )
+
     def probe_url(self, url, timeout=10.0, headers=None):
         """Probe a HTTP(S) URL for redirects and authentication needs
 
@@ -245,7 +516,7 @@ class HttpUrlOperations(UrlOperations):
             headers.update(hdrs)
 
         props = {}
-        req = requests.head(
+        req = self._session.head(
             url,
             allow_redirects=True,
             timeout=timeout,
@@ -258,10 +529,296 @@ class HttpUrlOperations(UrlOperations):
         props['status_code'] = req.status_code
         return req.url, props
 
+    def _get_download_segments(self,
+                               r: requests.Response,
+                               to_path: Path | None) -> int:
+        """Determine the number of segments to download a response in"""
+        nsegments = self.cfg.obtain('datalad.http.download-segments')
+        if nsegments < 2 or to_path is None:
+            return 1
+        if r.status_code != 200 \
+                or r.headers.get('accept-ranges', '').lower() != 'bytes' \
+                or r.headers.get('content-encoding', 'identity') != 'identity':
+            # range requests are either unsupported, or ranges would refer
+            # to the encoded content
+            return 1
+        try:
+            size = int(r.headers.get('content-length'))
+        except (ValueError, TypeError):
+            return 1
+        if size < self.cfg.obtain('datalad.http.segment-threshold'):
+            return 1
+        return nsegments
+
+    def _segmented_download(self,
+                            r: requests.Response,
+                            to_path: Path,
+                            *,
+                            nsegments: int,
+                            credential: str | None,
+                            hash: list[str] | None = None,
+                            timeout: float | None = None) -> Dict:
+        url = r.url
+        size = int(r.headers['content-length'])
+        # make sure that all segments come from the same version of the
+        # target, a server must ignore a range request otherwise
+        validator = r.headers.get('etag') \
+            or r.headers.get('last-modified')
+        hasher = self._get_hasher(hash)
+        progress_id = self._get_progress_id(url, str(to_path))
+        segment_size = -(-size // nsegments)
+        segments = [
+            (start, min(start + segment_size, size) - 1)
+            for start in range(0, size, segment_size)
+        ]
+        self._progress_report_start(
+            progress_id,
+            ('Download %s to %s in %i segments', url, to_path, len(segments)),
+            'downloading',
+            size,
+        )
+        progress_lock = threading.Lock()
+        # signals running segment downloads to stop, once any one failed
+        abort = threading.Event()
+
+        def report_progress(n):
+            with progress_lock:
+                self._progress_report_update(
+                    progress_id, ('Downloaded chunk',), n)
+
+        try:
+            # preallocate the target file, segments are written to their
+            # respective location as they come in
+            with open(to_path, 'wb') as fp:
+                fp.truncate(size)
+            with ThreadPoolExecutor(
+                    max_workers=len(segments),
+                    thread_name_prefix='http-segment',
+            ) as executor, open(to_path, 'rb') as hash_fp:
+                pending = {
+                    executor.submit(
+                        self._download_segment,
+                        url,
+                        to_path,
+                        start,
+                        end,
+                        credential=credential,
+                        validator=validator,
+                        timeout=timeout,
+                        report_progress=report_progress,
+                        abort=abort,
+                        response=r if i == 0 else None,
+                    ): i
+                    for i, (start, end) in enumerate(segments)
+                }
+                completed = set()
+                # index of the next segment to feed to the hasher
+                next_hash = 0
+                try:
+                    while pending:
+                        done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+                        for f in done:
+                            i = pending.pop(f)
+                            # reraises any exception of a segment download
+                            f.result()
+                            completed.add(i)
+                        # hash the completed leading portion of the file in
+                        # order
+                        while next_hash in completed:
+                            start, end = segments[next_hash]
+                            hash_fp.seek(start)
+                            remaining = end - start + 1
+                            while remaining:
+                                chunk = hash_fp.read(min(remaining, 65536))
+                                hasher.update(chunk)
+                                remaining -= len(chunk)
+                            next_hash += 1
+                except BaseException:
+                    # the executor waits for all segments on exit, do not
+                    # let it wait for segments that are no longer needed
+                    abort.set()
+                    for f in pending:
+                        f.cancel()
+                    raise
+        except BaseException:
+            # do not leave a seemingly complete file behind
+            to_path.unlink(missing_ok=True)
+            raise
+        finally:
+            self._progress_report_stop(progress_id, ('Finished download',))
+        props: Dict[str, str] = {}
+        props.update(hasher.get_hexdigest())
+        return props
+
+    def _download_segment(self,
+                          url: str,
+                          to_path: Path,
+                          start: int,
+                          end: int,
+                          *,
+                          credential: str | None,
+                          validator: str | None,
+                          timeout: float | None,
+                          report_progress,
+                          abort: threading.Event,
+                          response: requests.Response | None = None,
+                          ) -> None:
+        """Download a byte range into its location in ``to_path``
+
+        If ``response`` is given, the leading part of its content is used,
+        instead of requesting the range. The download stops early, without
+        an error, once ``abort`` is set.
+        """
+        if response is not None:
+            written = self._write_segment(
+                response, to_path, start, end, report_progress, abort)
+        else:
+            headers = {
+                'Range': f'bytes={start}-{end}',
+                # the range refers to the unencoded content
+                'Accept-Encoding': 'identity',
+            }
+            if validator:
+                headers['If-Range'] = validator
+            # an authentication handler must not be used by multiple
+            # threads, but they share any reusable authentication
+            auth = self._get_auth(credential)
+            with self._session.get(
+                    url,
+                    stream=True,
+                    headers=self.get_headers(headers),
+                    auth=auth,
+                    timeout=timeout,
+            ) as r:
+                self._check_status(r, url)
+                if r.status_code != 206:
+                    raise UrlOperationsRemoteError(
+                        url,
+                        message=f'Server did not respond with the requested '
+                                f'range of {url!r}, the target may have '
+                                'changed during download',
+                        status_code=r.status_code,
+                    )
+                written = self._write_segment(
+                    r, to_path, start, end, report_progress, abort)
+        if written < 0:
+            # aborted
+            return
+        if written != end - start + 1:
+            raise UrlOperationsRemoteError(
+                url,
+                message=f'Incomplete download of range {start}-{end} of '
+                        f'{url!r}',
+            )
+
+    @staticmethod
+    def _write_segment(r: requests.Response,
+                       to_path: Path,
+                       start: int,
+                       end: int,
+                       report_progress,
+                       abort: threading.Event) -> int:
+        """Write response content into the byte range of ``to_path``
+
+        Reading stops at the end of the range. Returns the number of bytes
+        written, or -1 if ``abort`` was set.
+        """
+        remaining = end - start + 1
+        with open(to_path, 'r+b') as fp:
+            fp.seek(start)
+            for chunk in r.raw.stream(amt=65536, decode_content=False):
+                if abort.is_set():
+                    return -1
+                chunk = chunk[:remaining]
+                fp.write(chunk)
+                remaining -= len(chunk)
+                report_progress(len(chunk))
+                if not remaining:
+                    break
+        return end - start + 1 - remaining
+
+    def _resumable_download(self,
+                            url: str,
+                            to_path: Path,
+                            *,
+                            auth: DataladAuth,
+                            hash: list[str] | None = None,
+                            timeout: float | None = None) -> Dict:
+        part_path = to_path.with_name(f'{to_path.name}.part')
+        state_path = to_path.with_name(f'{to_path.name}.part.json')
+        state = _read_download_state(state_path)
+        offset = 0
+        headers = {}
+        if state.get('url') == url and state.get('validator') \
+                and part_path.exists():
+            offset = part_path.stat().st_size
+        if offset:
+            headers.update({
+                'Range': f'bytes={offset}-',
+                # only continue, if the target has not changed
+                'If-Range': state['validator'],
+                # the offset refers to the unencoded content
+                'Accept-Encoding': 'identity',
+            })
+        with self._session.get(
+                url,
+                stream=True,
+                headers=self.get_headers(headers),
+                auth=auth,
+                timeout=timeout,
+        ) as r:
+            if offset and r.status_code == 416:
+                # the partial download cannot be continued, e.g. it is
+                # already complete but was not finalized. Start over
+                part_path.unlink()
+                state_path.unlink()
+                return self._resumable_download(
+                    url, to_path, auth=auth, hash=hash, timeout=timeout)
+            # fail visible for any non-OK outcome
+            self._check_status(r, url)
+            hasher = self._get_hasher(hash)
+            resumed = bool(offset) and r.status_code == 206
+            if resumed:
+                lgr.debug('Resuming download of %s at byte %i', url, offset)
+                # the state of a hasher cannot be saved, hash the
+                # existing content again
+                with part_path.open('rb') as fp:
+                    for chunk in iter(lambda: fp.read(65536), b''):
+                        hasher.update(chunk)
+            else:
+                state = dict(
+                    url=url,
+                    validator=_get_range_validator(r),
+                    size=r.headers.get('content-length'),
+                )
+            _write_download_state(state_path, state)
+            try:
+                download_props = self._stream_download_from_request(
+                    r, part_path, hasher=hasher, append=resumed)
+            except BaseException:
+                if state['validator'] is None:
+                    # this cannot be resumed, do not leave anything behind
+                    part_path.unlink(missing_ok=True)
+                    state_path.unlink(missing_ok=True)
+                else:
+                    state['bytes_done'] = part_path.stat().st_size
+                    _write_download_state(state_path, state)
+                raise
+        part_path.replace(to_path)
+        state_path.unlink()
+        return download_props
+
     def _stream_download_from_request(
-            self, r, to_path, hash: list[str] | None = None) -> Dict:
+            self,
+            r,
+            to_path,
+            hash: list[str] | None = None,
+            *,
+            hasher: MultiHash | NoOpHash | None = None,
+            append: bool = False) -> Dict:
         from_url = r.url
-        hasher = self._get_hasher(hash)
+        if hasher is None:
+            hasher = self._get_hasher(hash)
         progress_id = self._get_progress_id(from_url, to_path)
         # try to get download size, it might not be provided, e.g. if
         # chunked transport encoding is used
@@ -286,7 +843,8 @@ class HttpUrlOperations(UrlOperations):
         props: Dict[str, str] = {}
         try:
             # we can only write to file-likes opened in bytes mode
-            fp = sys.stdout.buffer if to_path is None else open(to_path, 'wb')
+            fp = sys.stdout.buffer if to_path is None \
+                else open(to_path, 'ab' if append else 'wb')
             # we need to track how much came down the pipe for progress
             # reporting
             downloaded_bytes = 0
@@ -319,3 +877,172 @@ class HttpUrlOperations(UrlOperations):
             if fp and to_path is not None:
                 fp.close()
             self._progress_report_stop(progress_id, ('Finished download',))
+
+
+def _map_concurrently(func, items: Iterable, max_workers: int) -> Generator:
+    """Like ``map()``, but calls ``func`` in a thread pool
+
+    Results are yielded in the order of ``items``. The first item is
+    processed on its own, before any other. No more than ``2 * max_workers``
+    items are consumed ahead of the yielded results.
+    """
+    items = iter(items)
+    for item in items:
+        # process the first item on its own, to establish authentication
+        yield func(item)
+        break
+    with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='http-many',
+    ) as executor:
+        pending: deque = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _get_range_validator(r: requests.Response) -> str | None:
+    """Return a validator for ``If-Range`` requests, if there is any"""
+    if r.headers.get('accept-ranges', '').lower() != 'bytes' \
+            or r.headers.get('content-encoding', 'identity') != 'identity':
+        return None
+    etag = r.headers.get('etag')
+    # weak ETags must not be used with If-Range
+    if etag and not etag.startswith('W/'):
+        return etag
+    return r.headers.get('last-modified')
+
+
+def _read_download_state(path: Path) -> Dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_download_state(path: Path, state: Dict) -> None:
+    path.write_text(json.dumps(state))
+
+
+class HttpRangeReader(io.RawIOBase):
+    """Seekable, read-only raw file-like for a resource on an HTTP server
+
+    Each ``readinto()`` call is translated into a single HTTP range request.
+    Instances are typically wrapped into an ``io.BufferedReader``, as done
+    by :meth:`HttpUrlOperations.open_seekable`.
+
+    On creation, a probe request for the first byte of the target is
+    performed. It determines the total size of the target, the final
+    URL after any redirects, and whether the server supports range
+    requests at all.
+    """
+    _content_range_regex = re.compile(r'bytes\s+\d+-\d+/(\d+)')
+
+    def __init__(self,
+                 url_ops: HttpUrlOperations,
+                 url: str,
+                 *,
+                 credential: str | None = None,
+                 timeout: float | None = None):
+        super().__init__()
+        self._url_ops = url_ops
+        self._orig_url = url
+        self._timeout = timeout
+        # one authentication handler for all requests of this reader
+        self._auth = url_ops._get_auth(credential)
+        self._pos = 0
+        # the probe also resolves any redirects, all subsequent requests
+        # go to the final URL
+        r = self._get_range(url, 0, 0)
+        self._url = r.url
+        match = self._content_range_regex.match(
+            r.headers.get('content-range', ''))
+        if match is None:
+            raise UrlOperationsRemoteError(
+                url,
+                message=f'Cannot determine size of {url!r} from range '
+                        'request response')
+        self._size = int(match.group(1))
+        self._auth.save_entered_credential(
+            context=f'for accessing {url}'
+        )
+
+    @property
+    def size(self) -> int:
+        """Size of the target in bytes"""
+        return self._size
+
+    @property
+    def url(self) -> str:
+        """Final URL of the target after any redirects"""
+        return self._url
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f'invalid whence ({whence!r})')
+        if pos < 0:
+            raise ValueError(f'negative seek position {pos}')
+        self._pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        if self._pos >= self._size:
+            return 0
+        end = min(self._pos + len(b), self._size) - 1
+        r = self._get_range(self._url, self._pos, end)
+        data = r.content
+        n = len(data)
+        b[:n] = data
+        self._pos += n
+        return n
+
+    def _get_range(self, url: str, start: int, end: int) -> requests.Response:
+        try:
+            with self._url_ops._session.get(
+                    url,
+                    # a server that ignores the range request would
+                    # otherwise send the entire content
+                    stream=True,
+                    headers=self._url_ops.get_headers({
+                        'Range': f'bytes={start}-{end}',
+                        # we need byte ranges of the actual content, not of
+                        # any transport-compressed representation
+                        'Accept-Encoding': 'identity',
+                    }),
+                    auth=self._auth,
+                    timeout=self._timeout,
+            ) as r:
+                # fail visible for any non-OK outcome
+                self._url_ops._check_status(r, self._orig_url)
+                if r.status_code != 206:
+                    raise UrlOperationsRemoteError(
+                        self._orig_url,
+                        message='Server does not support range requests '
+                                f'for {self._orig_url!r}',
+                        status_code=r.status_code,
+                    )
+                # consume the (partial) content before the connection
+                # is released
+                r.content
+        except requests.exceptions.ReadTimeout as e:
+            raise TimeoutError(
+                f"Timeout while reading from {self._orig_url}") from e
+        return r
@@ -5,22 +5,30 @@ from __future__ import annotations
 
 import logging
 import random
+import shlex
 import sys
+import threading
 import time
+from contextlib import contextmanager
 from functools import partial
+from hashlib import md5
+from itertools import chain
 from math import floor
 from pathlib import (
     Path,
     PurePosixPath,
 )
 from queue import (
+    Empty,
     Full,
     Queue,
 )
 from typing import (
     Any,
     Dict,
+    Generator,
     IO,
+    Iterable,
 )
 from urllib.parse import (
     urlparse,
@@ -29,12 +37,16 @@ from urllib.parse import (
 
 from more_itertools import consume
 
+from datalad.interface.common_cfg import definitions as cfg_defs
+
 from datalad_next.consts import COPY_BUFSIZE
 from datalad_next.config import ConfigManager
 from datalad_next.runners import CommandError
 from datalad_next.shell import (
-    FixedLengthResponseGeneratorPosix,
+    CompressedDownloadResponseGeneratorPosix,
+    DownloadResponseGeneratorPosix,
     ShellCommandExecutor,
+    posix,
     shell,
 )
 
@@ -58,6 +70,20 @@ class SshUrlOperations(UrlOperations):
     range of operating systems, including devices that provide these commands
     via the 'busybox' software.
 
+    Instances can be used by multiple threads concurrently. Each operation
+    is performed with a separate remote shell, taken from a pool of shells
+    per host. The size of this pool is limited by the
+    ``datalad.ssh.shells-per-host`` configuration setting. Shells are only
+    opened when no idle shell is available, operations exceeding the limit
+    wait for a shell to become idle. Other code can execute its own commands
+    in a shell of the pool, reserved with :meth:`reserved_shell_for`.
+
+    Transfers can be compressed, if the ``datalad.ssh.compression``
+    configuration (or ``datalad.ssh.<hostname>.compression`` for a particular
+    host) is set. The remote host compresses or decompresses with ``zstd``
+    or ``gzip``, and hashes and sizes are always reported for the
+    uncompressed content.
+
     .. note::
        Any instance of ``SshUrlOperations`` must be deleted before ending the
        program, otherwise python might not exit. The reason is, that
@@ -69,12 +95,16 @@ class SshUrlOperations(UrlOperations):
     """
     def __init__(self, *, cfg: ConfigManager | None = None):
         super().__init__(cfg=cfg)
-        self.ssh_shells: dict[tuple[str, ...], tuple[ShellCommandExecutor, Any]] = dict()
+        self.ssh_shells: dict[tuple[str, ...], _SshShellPool] = dict()
+        self._ssh_shells_lock = threading.Lock()
+        # shells handed out by `_acquire_shell()`, and the pool they
+        # belong to
+        self._busy_shells: dict[ShellCommandExecutor, _SshShellPool] = dict()
 
     def __del__(self):
-        for ssh_executor, context in self.ssh_shells.values():
-            ssh_executor.close()
-            context.__exit__(None, None, None)
+        for pool in self.ssh_shells.values():
+            for ssh_executor, context in pool.all_shells():
+                _close_shell(ssh_executor, context)
 
     @staticmethod
     def _check_return_code(return_code: int | None, url: str, msg: str = ''):
@@ -90,37 +120,173 @@ class SshUrlOperations(UrlOperations):
 
     def ssh_shell_for(self,
                       url: str) -> ShellCommandExecutor:
-        """Get a ShellCommandExecutor for the url (cached or newly created)"""
+        """Get a ShellCommandExecutor for the url (cached or newly created)
+
+        The same shell is returned for all calls for the same host. It is
+        not used by the operations of this class, but it is not reserved for
+        a single caller either. Use :meth:`reserved_shell_for` to obtain a
+        shell for exclusive use, e.g. from multiple threads.
+        """
+        while True:
+            pool = self._get_pool(url)
+            with pool.condition:
+                if pool.closed:
+                    continue
+                if pool.shared is not None:
+                    return pool.shared[0]
+            ssh_executor, context = self._open_shell(url)
+            with pool.condition:
+                if not pool.closed and pool.shared is None:
+                    pool.shared = (ssh_executor, context)
+                    return ssh_executor
+            # another thread was faster, or the pool was closed meanwhile
+            _close_shell(ssh_executor, context)
+
+    @contextmanager
+    def reserved_shell_for(
+            self,
+            url: str,
+    ) -> Generator[ShellCommandExecutor, None, None]:
+        """Context manager for a ShellCommandExecutor reserved for the caller
+
+        The shell is taken from the pool of shells for the url's host (or
+        newly created), and returned to the pool when the context is left.
+        If the maximum number of shells for the host
+        (``datalad.ssh.shells-per-host``) is in use, entering the context
+        blocks until a shell is returned. If the context is left with an
+        exception, the shell is closed, because it may be in the middle of
+        a command.
+        """
+        ssh = self._acquire_shell(url)
+        try:
+            yield ssh
+        except BaseException as e:
+            # the shell may be in the middle of a command, do not reuse it
+            self._discard_shell(ssh, e)
+            raise
+        self._release_shell(ssh)
+
+    def _get_pool(self, url: str) -> _SshShellPool:
+        key = tuple(ssh_url2openargs(url, self.cfg)[0])
+        with self._ssh_shells_lock:
+            pool = self.ssh_shells.get(key)
+            if pool is None:
+                pool = _SshShellPool(
+                    self.cfg.obtain('datalad.ssh.shells-per-host'))
+                self.ssh_shells[key] = pool
+        return pool
+
+    def _open_shell(self, url: str) -> tuple[ShellCommandExecutor, Any]:
         open_args = ssh_url2openargs(url, self.cfg)[0]
-        key = tuple(open_args)
-        if key not in self.ssh_shells:
-            context = shell(['ssh'] + open_args)
-            try:
-                ssh_executor = context.__enter__()
-            except CommandError as e:
-                context.__exit__(None, None, None)
-                raise UrlOperationsRemoteError(url) from e
-            self.ssh_shells[key] = (ssh_executor, context)
-        return self.ssh_shells[key][0]
+        context = shell(['ssh'] + open_args)
+        try:
+            ssh_executor = context.__enter__()
+        except CommandError as e:
+            context.__exit__(None, None, None)
+            raise UrlOperationsRemoteError(url) from e
+        return ssh_executor, context
+
+    def _acquire_shell(self, url: str) -> ShellCommandExecutor:
+        # reserve a shell of the pool, see `reserved_shell_for()`
+        while True:
+            pool = self._get_pool(url)
+            with pool.condition:
+                while not pool.closed and not pool.idle \
+                        and len(pool.contexts) + pool.opening >= pool.size:
+                    pool.condition.wait()
+                if pool.closed:
+                    # all shells of the host were closed meanwhile, start over
+                    continue
+                if pool.idle:
+                    ssh_executor = pool.idle.pop()
+                    self._busy_shells[ssh_executor] = pool
+                    return ssh_executor
+                # open a new shell, outside the lock
+                pool.opening += 1
+            break
+
+        try:
+            ssh_executor, context = self._open_shell(url)
+        except BaseException:
+            with pool.condition:
+                pool.opening -= 1
+                pool.condition.notify()
+            raise
+        with pool.condition:
+            pool.opening -= 1
+            pool.contexts[ssh_executor] = context
+        self._busy_shells[ssh_executor] = pool
+        return ssh_executor
+
+    def _release_shell(self, ssh_executor: ShellCommandExecutor):
+        # hand back a shell obtained from `_acquire_shell()` for reuse
+        pool = self._busy_shells.pop(ssh_executor, None)
+        if pool is None:
+            return
+        with pool.condition:
+            if not pool.closed:
+                pool.idle.append(ssh_executor)
+                pool.condition.notify()
+                return
+            context = pool.contexts.pop(ssh_executor)
+        _close_shell(ssh_executor, context)
+
+    def _discard_shell(self,
+                       ssh_executor: ShellCommandExecutor,
+                       exc: BaseException):
+        # terminate a shell obtained from `_acquire_shell()` after `exc`
+        # was raised, instead of returning it to the pool
+        pool = self._busy_shells.pop(ssh_executor, None)
+        if pool is None:
+            return
+        with pool.condition:
+            context = pool.contexts.pop(ssh_executor)
+            pool.condition.notify()
+        _close_shell(ssh_executor, context, exc)
 
     def close_shell_for(self, url: str):
-        """Close the ShellCommandExecutor for the url and remove it"""
+        """Close all ShellCommandExecutors for the url and remove them
+
+        This includes the shell returned by :meth:`ssh_shell_for`. Reserved
+        shells that are currently in use are closed when they are released.
+        """
         open_args = ssh_url2openargs(url, self.cfg)[0]
         key = tuple(open_args)
-        if key in self.ssh_shells:
-            ssh_executor, context = self.ssh_shells.pop(key)
-            ssh_executor.close()
-            context.__exit__(None, None, None)
+        with self._ssh_shells_lock:
+            pool = self.ssh_shells.pop(key, None)
+        if pool is None:
+            return
+        with pool.condition:
+            pool.closed = True
+            idle = [(s, pool.contexts.pop(s)) for s in pool.idle]
+            pool.idle.clear()
+            if pool.shared is not None:
+                idle.append(pool.shared)
+                pool.shared = None
+            pool.condition.notify_all()
+        for ssh_executor, context in idle:
+            _close_shell(ssh_executor, context)
 
     def stat(self,
              url: str,
              *,
              credential: str | None = None,
-             timeout: float | None = None) -> Dict:
+             timeout: float | None = None,
+             hash: list[str] | None = None) -> Dict:
         """Gather information on a URL target, without downloading it
 
         See :meth:`datalad_next.url_operations.UrlOperations.stat`
         for parameter documentation and exception behavior.
+
+        Parameters
+        ----------
+        hash: list(algorithm_names), optional
+          If given, the target's content is hashed on the remote host with
+          the respective tools (e.g. ``sha256sum``), and the hexdigests are
+          reported in the returned properties (like with :meth:`download`),
+          without transferring any content. Supported algorithms are
+          listed in
+          :data:`datalad_next.shell.operations.posix.hash_commands`.
         """
         # Check whether a readable file exists at the path. If not signal a
         # dedicated 244 return code. This allows the user to distinguish the
@@ -136,11 +302,95 @@ class SshUrlOperations(UrlOperations):
                 ret 244
             fi"""
 
+        if hash:
+            unsupported = set(hash).difference(posix.hash_commands)
+            if unsupported:
+                raise ValueError(
+                    f'unsupported hash algorithm(s): {sorted(unsupported)}')
         cmd = self.format_cmd(stat_cmd, url)
-        ssh = self.ssh_shell_for(url)
-        result = ssh(cmd)
+        with self.reserved_shell_for(url) as ssh:
+            if not hash:
+                result = ssh(cmd)
+            else:
+                # hashing is pipelined with the stat command, a single
+                # round-trip suffices
+                pending = ssh.submit(cmd)
+                hashes = posix.hash_files(
+                    ssh, [PurePosixPath(urlparse(url).path)], hash)
+                result = pending.result()
         self._check_return_code(result.returncode, url, result.stderr.decode())
-        return {'content-length': int(result.stdout)}
+        props: Dict[str, Any] = {'content-length': int(result.stdout)}
+        if hash:
+            if not hashes:
+                raise UrlOperationsRemoteError(
+                    url, message=f'cannot compute {hash} hash on remote host')
+            props.update(hashes.popitem()[1])
+        return props
+
+    # maximum number of paths to stat with a single remote command
+    _stat_many_batch_size = 256
+
+    def stat_many(self,
+                  urls: Iterable[str],
+                  *,
+                  credential: str | None = None,
+                  timeout: float | None = None,
+                  ) -> Generator[tuple[str, Dict | Exception], None, None]:
+        """Gather information on any number of ssh:// URL targets
+
+        The sizes of all targets on the same host are determined with a
+        single remote command (per batch of up to 256 paths), instead of one
+        command execution round-trip per URL.
+
+        See :meth:`datalad_next.url_operations.UrlOperations.stat_many`
+        for parameter documentation and return value.
+        """
+        urls = list(urls)
+        # URL indices by remote shell
+        groups: Dict[tuple[str, ...], list[int]] = {}
+        for i, url in enumerate(urls):
+            key = tuple(ssh_url2openargs(url, self.cfg)[0])
+            groups.setdefault(key, []).append(i)
+        results: list = [None] * len(urls)
+        for idx in groups.values():
+            for start in range(0, len(idx), self._stat_many_batch_size):
+                batch = idx[start:start + self._stat_many_batch_size]
+                for i, res in zip(
+                        batch,
+                        self._stat_batch([urls[i] for i in batch])):
+                    results[i] = (urls[i], res)
+        yield from results
+
+    def _stat_batch(self, urls: list[str]) -> list[Dict | Exception]:
+        # report one line per path, with the size of a readable file, or
+        # '-' otherwise
+        paths = ' '.join(shlex.quote(urlparse(url).path) for url in urls)
+        cmd = (
+            f'for p in {paths}; do '
+            'if test -r "$p"; then '
+            'LC_ALL=C ls -dln -- "$p" | awk \'{print $5; exit}\'; '
+            'else echo -; fi; done'
+        )
+        try:
+            with self.reserved_shell_for(urls[0]) as ssh:
+                result = ssh(cmd)
+            self._check_return_code(
+                result.returncode, urls[0], result.stderr.decode())
+            sizes = result.stdout.decode().split()
+            if len(sizes) != len(urls):
+                raise UrlOperationsRemoteError(
+                    urls[0],
+                    message='unexpected output of batch stat command: '
+                            f'{result.stdout!r}',
+                )
+        except UrlOperationsRemoteError as e:
+            # a failure of the whole batch applies to all URLs
+            return [e] * len(urls)
+        return [
+            UrlOperationsResourceUnknown(url) if size == '-'
+            else {'content-length': int(size)}
+            for url, size in zip(urls, sizes)
+        ]
 
     def delete(self,
                url: str,
@@ -179,8 +429,8 @@ class SshUrlOperations(UrlOperations):
             fi"""
 
         cmd = self.format_cmd(delete_cmd, url)
-        ssh = self.ssh_shell_for(url)
-        result = ssh(cmd)
+        with self.reserved_shell_for(url) as ssh:
+            result = ssh(cmd)
         self._check_return_code(result.returncode, url, result.stderr.decode())
         return {}
 
@@ -193,73 +443,100 @@ class SshUrlOperations(UrlOperations):
                  # to gain file access
                  credential: str | None = None,
                  hash: list[str] | None = None,
-                 timeout: float | None = None) -> Dict:
+                 timeout: float | None = None,
+                 # unused, downloads always start from the beginning
+                 resume: bool = False) -> Dict:
         """Download a file by streaming it through an SSH connection.
 
-        On the server-side, the file size is determined and sent. Afterwards
-        the file content is sent via `cat` to the SSH client.
+        On the server-side, the file size is determined and sent, immediately
+        followed by the file content via `cat`. Both are sent in response to
+        a single command, hence a download costs only one command execution
+        round-trip.
 
         See :meth:`datalad_next.url_operations.UrlOperations.download`
         for parameter documentation and exception behavior.
         """
         hasher = self._get_hasher(hash)
         progress_id = self._get_progress_id(from_url, str(to_path))
-
-        # get the size of the file to download
-        stat = self.stat(from_url, credential=credential, timeout=timeout)
-        expected_size = stat['content-length']
-
-        # get a shell command executor and a fixed length response generator
-        ssh = self.ssh_shell_for(from_url)
-        response_generator = FixedLengthResponseGeneratorPosix(
-            ssh.stdout,
-            expected_size
-        )
-
-        dst_fp = sys.stdout.buffer \
-            if to_path is None \
-            else open(to_path, 'wb')
-
-        # Localize variable access to minimize overhead
-        dst_fp_write = dst_fp.write
-
-        # We already know that file exists, so we can just cat it.
-        cmd = self.format_cmd('cat {fpath}', from_url)
-        result_generator = ssh.start(
-            cmd,
-            response_generator=response_generator
-        )
-        # We do not use the `shell.operations.posix.download`-method here
-        # because we need access to every individual chunk in order to calculate
-        # the hash on the fly.
-        for chunk in self._with_progress(
-                result_generator,
-                progress_id=progress_id,
-                label='downloading',
-                expected_size=expected_size,
-                start_log_msg=('Download %s to %s', from_url, to_path),
-                end_log_msg=('Finished download',),
-                update_log_msg=('Downloaded chunk',)
-        ):
-            # write data
-            dst_fp_write(chunk)
-            # compute hash simultaneously
-            hasher.update(chunk)
-
-        if dst_fp and to_path is not None:
-            dst_fp.close()
+        cmd = shlex.quote(urlparse(from_url).path)
+
+        with self.reserved_shell_for(from_url) as ssh:
+            compression = self._get_compression(from_url, ssh)
+            # a response generator that reads the size header, and exactly
+            # this number of bytes (or a compressed stream) thereafter
+            response_generator = DownloadResponseGeneratorPosix(ssh.stdout) \
+                if compression is None \
+                else CompressedDownloadResponseGeneratorPosix(
+                    ssh.stdout, compression)
+            result_generator = ssh.start(
+                cmd,
+                response_generator=response_generator,
+            )
+            try:
+                # the first chunk tells whether the file exists, and its size
+                chunks: Iterable[bytes] = chain(
+                    (next(result_generator),), result_generator)
+            except StopIteration:
+                # an empty file, or no readable file at all
+                chunks = ()
+            # only create a download target for readable files, the
+            # response generator signals an unreadable file with 23
+            if response_generator.returncode != 23:
+                self._receive(
+                    chunks,
+                    to_path,
+                    hasher,
+                    progress_id=progress_id,
+                    expected_size=response_generator.length,
+                    log_msg=('Download %s to %s', from_url, to_path),
+                )
 
         self._check_return_code(
-            result_generator.returncode,
+            244 if response_generator.returncode == 23
+            else response_generator.returncode,
             from_url,
-            ''.join(result_generator.stderr_deque)
+            b''.join(result_generator.stderr_deque).decode(),
         )
 
         return {
-            **stat,
+            'content-length': response_generator.length,
             **hasher.get_hexdigest(),
         }
 
+    def _receive(self,
+                 chunks: Iterable[bytes],
+                 to_path: Path | None,
+                 hasher,
+                 *,
+                 progress_id: str,
+                 expected_size: int | None,
+                 log_msg: tuple):
+        dst_fp = sys.stdout.buffer \
+            if to_path is None \
+            else open(to_path, 'wb')
+        # Localize variable access to minimize overhead
+        dst_fp_write = dst_fp.write
+        try:
+            # We do not use the `shell.operations.posix.download`-method
+            # here because we need access to every individual chunk in
+            # order to calculate the hash on the fly.
+            for chunk in self._with_progress(
+                    chunks,
+                    progress_id=progress_id,
+                    label='downloading',
+                    expected_size=expected_size,
+                    start_log_msg=log_msg,
+                    end_log_msg=('Finished download',),
+                    update_log_msg=('Downloaded chunk',)
+            ):
+                # write data
+                dst_fp_write(chunk)
+                # compute hash simultaneously
+                hasher.update(chunk)
+        finally:
+            if to_path is not None:
+                dst_fp.close()
+
     def upload(self,
                from_path: Path | None,
                to_url: str,
@@ -269,13 +546,33 @@ class SshUrlOperations(UrlOperations):
                timeout: float | None = None) -> Dict:
         """Upload a file by streaming it through an SSH connection.
 
-        It, more or less, runs `ssh <host> 'cat > <path>'` or
-        `ssh <host> 'head -c <file-size> > <path>'` on the remote side.
+        It, more or less, runs `ssh <host> 'head -c <file-size> > <path>'` on
+        the remote side. If the size of the source is not known upfront
+        (``from_path=None``), the data is sent in chunks that are each
+        prefixed with their length, and a remote shell loop reads them via
+        `head -c` until a zero-length chunk signals the end of the stream.
+        Either way, the SSH connection remains usable for subsequent
+        operations.
+
+        If ``datalad.ssh.delta-upload`` is enabled, and the target file
+        exists already, only the changed parts of the file are sent (see
+        :meth:`_perform_delta_upload`).
 
         See :meth:`datalad_next.url_operations.UrlOperations.upload`
         for parameter documentation and exception behavior.
         """
 
+        if from_path is not None \
+                and self._get_host_config(to_url, 'delta-upload'):
+            props = self._perform_delta_upload(
+                from_path=from_path,
+                to_url=to_url,
+                hash_names=hash,
+                timeout=timeout,
+            )
+            if props is not None:
+                return props
+
         if from_path is None:
             source_name = '<STDIN>'
             return self._perform_upload(
@@ -321,76 +618,57 @@ class SshUrlOperations(UrlOperations):
         #
         upload_queue: Queue = Queue(maxsize=2)
 
-        if expected_size:
-            read_cmd = f"head -c {expected_size}"
-        else:
-            read_cmd = "cat"
-
-        cmd = self.format_cmd(
-            # copy the file to its destination location with a randomized
-            # name, and move it to its final location after upload. This
-            # way, upload appears atomic, i.e. no half uploaded file will
-            # be seen at the destination URL
-            # leave special exit code when writing or moving fails, but not
-            # the general SSH access
-            "ret() {{ return $1; }}; ( mkdir -p '{fdir}' "
-            f"&& {read_cmd} "
-            "> '{fpath}.transfer-{nonce}' "
-            "&& mv '{fpath}.transfer-{nonce}' '{fpath}' ) || ret 243",
-            to_url,
-        )
-
         progress_id = self._get_progress_id(source_name, to_url)
 
-        ssh = self.ssh_shell_for(to_url)
-        result_generator = ssh.start(
-            cmd,
-            stdin=self._with_progress(
-                iter(upload_queue.get, None),
-                progress_id=progress_id,
-                label='uploading',
-                expected_size=expected_size,
-                start_log_msg=('Upload %s to %s', source_name, to_url),
-                end_log_msg=('Finished upload',),
-                update_log_msg=('Uploaded chunk',)
-            )
+        upload_stream = self._with_progress(
+            iter(upload_queue.get, None),
+            progress_id=progress_id,
+            label='uploading',
+            expected_size=expected_size,
+            start_log_msg=('Upload %s to %s', source_name, to_url),
+            end_log_msg=('Finished upload',),
+            update_log_msg=('Uploaded chunk',)
         )
+        with self.reserved_shell_for(to_url) as ssh:
+            compression = self._get_compression(to_url, ssh)
+            cmd = self._get_upload_cmd(to_url, expected_size, compression)
+            if expected_size is None or compression is not None:
+                upload_stream = posix.frame_chunks(
+                    upload_stream if compression is None
+                    else posix.compress_chunks(upload_stream, compression))
+            result_generator = ssh.start(cmd, stdin=upload_stream)
 
-        try:
-            upload_size = 0
-            for chunk in iter(partial(src_fp.read, COPY_BUFSIZE), b''):
-
-                # we are just putting stuff in the queue, and rely on
-                # its maxsize to cause it to block the next call to
-                # have the progress reports be anyhow valid, we also
-                # rely on put-timeouts to implement timeout.
-                upload_queue.put(chunk, timeout=timeout)
-
-                # compute hash simultaneously
-                hasher.update(chunk)
-                upload_size += len(chunk)
-
-            upload_queue.put(None, timeout=timeout)
-
-        except Full:
-            # we had a timeout while uploading
-            raise TimeoutError(f'timeout while executing: {cmd}')
+            try:
+                upload_size = 0
+                for chunk in iter(partial(src_fp.read, COPY_BUFSIZE), b''):
+
+                    # we are just putting stuff in the queue, and rely on
+                    # its maxsize to cause it to block the next call to
+                    # have the progress reports be anyhow valid, we also
+                    # rely on put-timeouts to implement timeout.
+                    upload_queue.put(chunk, timeout=timeout)
+
+                    # compute hash simultaneously
+                    hasher.update(chunk)
+                    upload_size += len(chunk)
+
+                upload_queue.put(None, timeout=timeout)
+
+            except Full:
+                # we had a timeout while uploading. Let the stdin-feeding
+                # thread of the shell finish, before the shell is discarded
+                _end_upload_queue(upload_queue)
+                raise TimeoutError(f'timeout while executing: {cmd}')
+            except BaseException:
+                _end_upload_queue(upload_queue)
+                raise
 
-        if expected_size:
             consume(result_generator)
-        else:
-            # If the remote shell reads from stdin, its stdin has to be close
-            # for the upload-command to terminate
-            if expected_size is None:
-                ssh.close()
-            consume(result_generator)
-            # stdin of the shell was closed, it cannot be used anymore.
-            self.close_shell_for(to_url)
 
         self._check_return_code(
             result_generator.returncode,
             to_url,
-            ''.join(result_generator.stderr_deque)
+            b''.join(result_generator.stderr_deque).decode(),
         )
 
         return {
@@ -401,6 +679,202 @@ class SshUrlOperations(UrlOperations):
             'content-length': upload_size
         }
 
+    # size of the blocks that are compared in delta uploads
+    _delta_block_size = 1024 * 1024
+
+    def _perform_delta_upload(self,
+                              from_path: Path,
+                              to_url: str,
+                              hash_names: list[str] | None,
+                              timeout: float | None) -> dict | None:
+        """Upload only the blocks of a file that differ from the target file
+
+        The MD5 digests of all blocks of the existing target file are
+        computed on the remote host (with GNU ``split --filter``), and
+        compared with the blocks of the local file. Unchanged blocks are
+        copied from the target file on the remote host (with ``dd``), only
+        changed blocks are sent. The result is verified by its MD5 digest
+        on the remote host, before it replaces the target file.
+
+        Blocks are compared at fixed offsets. Hence, content that is
+        changed in place or appended is not sent again, but content after
+        an insertion or deletion is.
+
+        Returns ``None``, if the target file does not exist, or the remote
+        host does not support the computation of block digests.
+        """
+        block_size = self._delta_block_size
+        with self.reserved_shell_for(to_url) as ssh:
+            result = ssh(self.format_cmd(
+                "test -f '{fpath}' && LC_ALL=C split "
+                f"-b {block_size} --filter=md5sum -- '{{fpath}}'",
+                to_url,
+            ))
+        if result.returncode != 0:
+            lgr.debug('Cannot perform delta upload to %s: %s',
+                      to_url, result.stderr.decode())
+            return None
+        target_digests = [
+            line.split(maxsplit=1)[0]
+            for line in result.stdout.decode().splitlines()
+        ]
+
+        # reconstruct the file from copied blocks (`c <start> <count>`) and
+        # literal data (`l <size>`), until `e <md5 digest of the file>`.
+        # leave special exit code when writing or moving fails, but not
+        # the general SSH access
+        cmd = self.format_cmd(
+            "ret() {{ return $1; }}; ( t='{fpath}.transfer-{nonce}'; "
+            ": > \"$t\" || t=/dev/null; d=; "
+            "while IFS=' ' read -r op a b; do case \"$op\" in "
+            f"c) dd if='{{fpath}}' bs={block_size} skip=\"$a\" "
+            "count=\"$b\" 2> /dev/null >> \"$t\";; "
+            "l) head -c \"$a\" >> \"$t\";; "
+            "*) d=\"$a\"; break;; esac; done; "
+            "[ \"$t\" != /dev/null ] && {{ "
+            "[ \"$(md5sum < \"$t\")\" = \"$d  -\" ] && mv \"$t\" '{fpath}' "
+            "|| {{ rm -f \"$t\"; false; }}; }} ) || ret 243",
+            to_url,
+        )
+
+        hasher = self._get_hasher(hash_names)
+        file_md5 = md5()
+        # see `_perform_upload()` for the purpose of the queue
+        upload_queue: Queue = Queue(maxsize=2)
+        progress_id = self._get_progress_id(str(from_path), to_url)
+        with self.reserved_shell_for(to_url) as ssh, from_path.open('rb') as src_fp:
+            result_generator = ssh.start(
+                cmd, stdin=iter(upload_queue.get, None))
+            try:
+                upload_size = 0
+                # run of unchanged blocks to copy: (first block, count)
+                copy = (0, 0)
+                for i, block in enumerate(self._with_progress(
+                        iter(partial(src_fp.read, block_size), b''),
+                        progress_id=progress_id,
+                        label='uploading',
+                        expected_size=from_path.stat().st_size,
+                        start_log_msg=(
+                            'Delta upload %s to %s', from_path, to_url),
+                        end_log_msg=('Finished upload',),
+                        update_log_msg=('Uploaded chunk',),
+                )):
+                    hasher.update(block)
+                    file_md5.update(block)
+                    upload_size += len(block)
+                    if i < len(target_digests) \
+                            and md5(block).hexdigest() == target_digests[i]:
+                        if copy[1] and copy[0] + copy[1] == i:
+                            copy = (copy[0], copy[1] + 1)
+                            continue
+                        copy = (i, 1)
+                        continue
+                    if copy[1]:
+                        upload_queue.put(
+                            b'c %d %d\n' % copy, timeout=timeout)
+                        copy = (0, 0)
+                    upload_queue.put(b'l %d\n' % len(block), timeout=timeout)
+                    upload_queue.put(block, timeout=timeout)
+                if copy[1]:
+                    upload_queue.put(b'c %d %d\n' % copy, timeout=timeout)
+                upload_queue.put(
+                    b'e %s\n' % file_md5.hexdigest().encode(),
+                    timeout=timeout)
+                upload_queue.put(None, timeout=timeout)
+            except Full:
+                # we had a timeout while uploading
+                _end_upload_queue(upload_queue)
+                raise TimeoutError(f'timeout while executing: {cmd}')
+            except BaseException:
+                _end_upload_queue(upload_queue)
+                raise
+
+            consume(result_generator)
+
+        self._check_return_code(
+            result_generator.returncode,
+            to_url,
+            b''.join(result_generator.stderr_deque).decode(),
+        )
+        return {
+            **hasher.get_hexdigest(),
+            'content-length': upload_size
+        }
+
+    def _get_upload_cmd(self,
+                        to_url: str,
+                        expected_size: int | None,
+                        compression: str | None) -> str:
+        # copy the file to its destination location with a randomized
+        # name, and move it to its final location after upload. This
+        # way, upload appears atomic, i.e. no half uploaded file will
+        # be seen at the destination URL
+        # leave special exit code when writing or moving fails, but not
+        # the general SSH access
+        if expected_size is not None and compression is None:
+            return self.format_cmd(
+                "ret() {{ return $1; }}; ( mkdir -p '{fdir}' "
+                f"&& head -c {expected_size} "
+                "> '{fpath}.transfer-{nonce}' "
+                "&& mv '{fpath}.transfer-{nonce}' '{fpath}' ) || ret 243",
+                to_url,
+            )
+        else:
+            # read length-prefixed chunks until an empty chunk. All chunks
+            # are consumed, even if the destination cannot be written, such
+            # that no data is left to be interpreted by the shell
+            sink = '>> "$t"' if compression is None else (
+                # if decompression fails, consume the rest of the data
+                f'| {{{{ {posix.compression_commands[compression][1]} '
+                '>> "$t" || {{ cat > /dev/null; false; }}; }}'
+            )
+            return self.format_cmd(
+                "ret() {{ return $1; }}; ( t='{fpath}.transfer-{nonce}'; "
+                "{{ mkdir -p '{fdir}' && : > \"$t\"; }} || t=/dev/null; "
+                f"{posix.read_frames_command} {sink} "
+                "&& [ \"$t\" != /dev/null ] && mv \"$t\" '{fpath}' ) "
+                "|| ret 243",
+                to_url,
+            )
+
+    def _get_compression(self,
+                         url: str,
+                         ssh: ShellCommandExecutor) -> str | None:
+        """Determine the compression method for a transfer, if any
+
+        The configuration for the URL's host takes precedence over the
+        general configuration. The compression methods that the host
+        supports are determined once per host.
+        """
+        method = self._get_host_config(url, 'compression')
+        if method == 'none':
+            return None
+        pool = self._busy_shells[ssh]
+        if pool.compression_methods is None:
+            pool.compression_methods = posix.get_compression_methods(ssh)
+        if method == 'auto':
+            return pool.compression_methods[0] \
+                if pool.compression_methods else None
+        if method not in pool.compression_methods:
+            lgr.debug(
+                'Compression method %r not available for %s, '
+                'transferring uncompressed', method, url)
+            return None
+        return method
+
+    def _get_host_config(self, url: str, name: str) -> Any:
+        """Query a ``datalad.ssh.*`` setting for the host of a URL
+
+        A setting ``datalad.ssh.<hostname>.<name>`` for the particular host
+        takes precedence over the general ``datalad.ssh.<name>``.
+        """
+        value = self.cfg.get(
+            f'datalad.ssh.{urlparse(url).hostname}.{name}', None)
+        if value is None:
+            return self.cfg.obtain(f'datalad.ssh.{name}')
+        # the host setting is subject to the constraint of the general one
+        return cfg_defs[f'datalad.ssh.{name}']['type'](value)
+
     def format_cmd(self,
                    cmd: str,
                    url: str) -> str:
@@ -433,6 +907,63 @@ class _SshCommandBuilder:
         return payload_cmd.format(**self.substitutions)
 
 
+class _SshShellPool:
+    """Persistent shells connected to a single host"""
+    def __init__(self, size: int):
+        # maximum number of shells
+        self.size = size
+        self.condition = threading.Condition()
+        # shells that are not in use
+        self.idle: list[ShellCommandExecutor] = []
+        # contexts of all open shells, idle or in use
+        self.contexts: dict[ShellCommandExecutor, Any] = dict()
+        # number of shells that are being opened
+        self.opening = 0
+        # set when the pool was removed by `close_shell_for()`
+        self.closed = False
+        # shell (and context) returned by `ssh_shell_for()`, not part of
+        # the pool
+        self.shared: tuple[ShellCommandExecutor, Any] | None = None
+        # compression methods supported by the host, determined on demand
+        self.compression_methods: list[str] | None = None
+
+    def all_shells(self) -> list[tuple[ShellCommandExecutor, Any]]:
+        """Report all open shells, with their contexts"""
+        shells = list(self.contexts.items())
+        if self.shared is not None:
+            shells.append(self.shared)
+        return shells
+
+
+def _close_shell(ssh_executor: ShellCommandExecutor,
+                 context: Any,
+                 exc: BaseException | None = None):
+    ssh_executor.close()
+    if exc is None:
+        # let the shell exit
+        context.__exit__(None, None, None)
+    else:
+        # the shell may be stuck in a command, terminate it instead of
+        # waiting for it to exit
+        context.__exit__(type(exc), exc, exc.__traceback__)
+
+
+def _end_upload_queue(upload_queue: Queue):
+    # Put the end-marker into the queue that feeds the stdin of an aborted
+    # upload command, without blocking. Otherwise, the stdin-feeding thread
+    # of the shell would wait for the next chunk forever, and the shell
+    # could not be closed. The content of the queue is not needed anymore.
+    while True:
+        try:
+            upload_queue.put_nowait(None)
+            return
+        except Full:
+            try:
+                upload_queue.get_nowait()
+            except Empty:
+                pass
+
+
 def ssh_url2openargs(
     url: str,
     cfg: ConfigManager,
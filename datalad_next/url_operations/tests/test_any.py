@@ -45,6 +45,10 @@ def test_any_url_operations(tmp_path):
     props = ops.download(test_url, download_path, hash=['sha256'])
     assert props['sha256'] == '71de4622cf536ed4aa9b65fc3701f4fc5a198ace2fa0bda234fd71924267f696'
     assert props['content-length'] == 9 == test_path.stat().st_size
+    # a handler that cannot resume performs a complete download
+    download_path.unlink()
+    props = ops.download(test_url, download_path, resume=True)
+    assert download_path.read_text() == 'surprise!'
 
     # remove source and try again
     test_path.unlink()
@@ -57,3 +61,31 @@ def test_any_url_operations(tmp_path):
 
     # and it could have been figured out before
     assert ops.is_supported_url('weird://stuff') == False
+
+
+def test_any_url_operations_many(tmp_path, http_server):
+    (tmp_path / 'local').write_text('local')
+    (http_server.path / 'remote').write_text('remote')
+    urls = [
+        (tmp_path / 'local').as_uri(),
+        f'{http_server.url}remote',
+        f'{http_server.url}nothere',
+        (tmp_path / 'nothere').as_uri(),
+    ]
+    ops = AnyUrlOperations()
+    res = list(ops.stat_many(urls))
+    # results come in the order of the input
+    assert [r[0] for r in res] == urls
+    assert res[0][1]['content-length'] == 5
+    assert res[1][1]['content-length'] == 6
+    assert isinstance(res[2][1], UrlOperationsResourceUnknown)
+    assert isinstance(res[3][1], UrlOperationsResourceUnknown)
+
+    items = [(url, tmp_path / f'dl{i}') for i, url in enumerate(urls)]
+    res = list(ops.download_many(items, hash=['md5']))
+    assert [r[:2] for r in res] == items
+    assert (tmp_path / 'dl0').read_text() == 'local'
+    assert (tmp_path / 'dl1').read_text() == 'remote'
+    assert 'md5' in res[1][2]
+    assert isinstance(res[2][2], UrlOperationsResourceUnknown)
+    assert isinstance(res[3][2], UrlOperationsResourceUnknown)
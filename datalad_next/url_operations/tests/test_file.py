@@ -118,3 +118,64 @@ def test_file_url_upload_errors(tmp_path):
     fops = FileUrlOperations()
     with pytest.raises(UrlOperationsRemoteError) as e:
         fops.upload(source, 'file:///tmp//')
+
+
+@pytest.mark.parametrize('scandir_threshold', [1, 100])
+def test_file_url_stat_many(tmp_path, monkeypatch, scandir_threshold):
+    monkeypatch.setattr(
+        FileUrlOperations, '_stat_many_scandir_threshold', scandir_threshold)
+    (tmp_path / 'sub').mkdir()
+    for p in ('one', 'two', 'sub/three'):
+        (tmp_path / p).write_text(p)
+    urls = [(tmp_path / p).as_uri()
+            for p in ('one', 'nothere', 'sub/three', 'two', 'nodir/four')]
+    res = list(FileUrlOperations().stat_many(urls))
+    assert [r[0] for r in res] == urls
+    assert res[0][1] == {'content-length': 3}
+    assert isinstance(res[1][1], UrlOperationsResourceUnknown)
+    assert res[2][1] == {'content-length': 9}
+    assert res[3][1] == {'content-length': 3}
+    assert isinstance(res[4][1], UrlOperationsResourceUnknown)
+
+
+@pytest.mark.parametrize('method', ['clone', 'copy_file_range', 'sendfile',
+                                    'python'])
+def test_file_url_kernel_copy(tmp_path, monkeypatch, method):
+    import hashlib
+    import os
+    import datalad_next.url_operations.file as file_mod
+
+    # small chunks to exercise hashing across multiple copy operations
+    monkeypatch.setattr(file_mod, '_KERNEL_COPY_CHUNKSIZE', 1000)
+    calls = []
+
+    def unsupported(*args):
+        raise OSError(file_mod.errno.ENOSYS, 'not supported')
+
+    if method != 'clone':
+        monkeypatch.setattr(file_mod, '_clone_file', lambda *args: False)
+    if method in ('sendfile', 'python'):
+        monkeypatch.setattr(file_mod, '_copy_file_range', unsupported)
+    if method == 'python':
+        monkeypatch.setattr(file_mod, '_sendfile', unsupported)
+    for m in ('_copy_file_range', '_sendfile'):
+        orig = getattr(file_mod, m)
+
+        def spy(*args, orig=orig):
+            calls.append(orig.__name__)
+            return orig(*args)
+        monkeypatch.setattr(file_mod, m, spy)
+
+    payload = os.urandom(10500)
+    src = tmp_path / 'src'
+    src.write_bytes(payload)
+    ops = FileUrlOperations()
+    props = ops.download(src.as_uri(), tmp_path / 'dst', hash=['md5'])
+    assert (tmp_path / 'dst').read_bytes() == payload
+    assert props['md5'] == hashlib.md5(payload).hexdigest()
+    assert props['content-length'] == len(payload)
+    if method in ('copy_file_range', 'sendfile'):
+        assert calls and calls[-1] == f'_{method}'
+    props = ops.upload(src, (tmp_path / 'up').as_uri())
+    assert (tmp_path / 'up').read_bytes() == payload
+    assert props['content-length'] == len(payload)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import gzip
+import hashlib
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
 import pytest
 import requests
+import threading
 
 from datalad_next.tests import skipif_no_network
 
@@ -155,3 +161,265 @@ def test_delete_timeout(httpbin):
     url_ops = HttpUrlOperations()
     with pytest.raises(TimeoutError):
         url_ops.delete(f'{url_base}/delay/2', timeout=1.0)
+
+
+def test_open_seekable(credman, webdav_credential, webdav_server):
+    credman.set(**webdav_credential)
+    payload = bytes(range(256)) * 100
+    (webdav_server.path / 'test.bin').write_bytes(payload)
+    ops = HttpUrlOperations()
+    with ops.open_seekable(
+            f'{webdav_server.url}/test.bin',
+            credential=webdav_credential['name'],
+            buffer_size=1000,
+    ) as fp:
+        assert fp.seekable()
+        assert fp.raw.size == len(payload)
+        assert fp.read(10) == payload[:10]
+        fp.seek(-10, 2)
+        assert fp.read() == payload[-10:]
+        fp.seek(5000)
+        assert fp.read(3000) == payload[5000:8000]
+        assert fp.tell() == 8000
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.open_seekable(
+            f'{webdav_server.url}/nothere',
+            credential=webdav_credential['name'],
+        )
+
+
+def test_open_seekable_norange(http_server):
+    # the standard test server does not support range requests
+    (http_server.path / 'test.bin').write_bytes(b'123')
+    with pytest.raises(UrlOperationsRemoteError):
+        HttpUrlOperations().open_seekable(f'{http_server.url}test.bin')
+
+
+def test_is_modified(http_server):
+    fpath = http_server.path / 'test.txt'
+    fpath.write_text('123')
+    url = f'{http_server.url}test.txt'
+    ops = HttpUrlOperations()
+    props = ops.stat(url)
+    assert 'http-last-modified' in props
+    # conditional request, the server reports no modification
+    assert ops.is_modified(url, props) is False
+    # without validators, the comparison falls back on stat()
+    assert ops.is_modified(url, {'content-length': 3}) is False
+    assert ops.is_modified(url, {'content-length': 4}) is True
+    assert ops.is_modified(url, {}) is True
+    # an older state is modified
+    assert ops.is_modified(
+        url,
+        {'http-last-modified': 'Mon, 01 Jan 2001 00:00:00 GMT'},
+    ) is True
+    fpath.unlink()
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.is_modified(url, props)
+
+
+def test_session_config(datalad_cfg):
+    datalad_cfg.set('datalad.http.retries', '5', scope='global')
+    ops = HttpUrlOperations()
+    # one session for all requests
+    assert ops._session is ops._session
+    adapter = ops._session.get_adapter('https://example.com')
+    assert adapter.max_retries.total == 5
+    # read timeouts are not retried, but reported (see test_delete_timeout)
+    assert adapter.max_retries.read is False
+    assert adapter is ops._session.get_adapter('http://example.com')
+
+
+def test_auth_reuse(credman, http_credential, http_server_with_basicauth,
+                    tmp_path, monkeypatch):
+    srvurl = http_server_with_basicauth.url
+    (http_server_with_basicauth.path / 'test.txt').write_text('test')
+    credman.set(**dict(http_credential, realm=f'{srvurl}Protected'))
+    ops = HttpUrlOperations()
+    # the test server only supports GET requests with authentication
+    ops.download(f'{srvurl}test.txt', tmp_path / 'dl1')
+    assert ops._auth_cache
+
+    # subsequent requests authenticate right away, no credential lookup
+    # is needed
+    from datalad_next.utils.requests_auth import DataladAuth
+
+    def no_lookup(*args, **kwargs):
+        raise AssertionError('unexpected credential lookup')
+
+    monkeypatch.setattr(DataladAuth, '_get_credential', no_lookup)
+    ops.download(f'{srvurl}test.txt', tmp_path / 'dl2')
+    assert (tmp_path / 'dl2').read_text() == 'test'
+
+
+def test_segmented_download(credman, datalad_cfg, webdav_credential,
+                            webdav_server, tmp_path):
+    credman.set(**webdav_credential)
+    datalad_cfg.set('datalad.http.download-segments', '3', scope='global')
+    datalad_cfg.set('datalad.http.segment-threshold', '1000', scope='global')
+    payload = bytes(range(256)) * 100
+    (webdav_server.path / 'test.bin').write_bytes(payload)
+    ops = HttpUrlOperations()
+    props = ops.download(
+        f'{webdav_server.url}/test.bin',
+        tmp_path / 'test.bin',
+        credential=webdav_credential['name'],
+        hash=['md5', 'sha256'],
+    )
+    assert (tmp_path / 'test.bin').read_bytes() == payload
+    assert props['md5'] == hashlib.md5(payload).hexdigest()
+    assert props['sha256'] == hashlib.sha256(payload).hexdigest()
+
+    # below the threshold a single stream is used
+    (webdav_server.path / 'small.bin').write_bytes(payload[:999])
+    props = ops.download(
+        f'{webdav_server.url}/small.bin',
+        tmp_path / 'small.bin',
+        credential=webdav_credential['name'],
+        hash=['md5'],
+    )
+    assert props['md5'] == hashlib.md5(payload[:999]).hexdigest()
+
+
+def test_segmented_download_failure(tmp_path, monkeypatch):
+    ops = HttpUrlOperations()
+    stopped = []
+
+    def download_segment(url, to_path, start, end, *, abort, **kwargs):
+        if start == 0:
+            raise UrlOperationsRemoteError(url, message='segment failed')
+        # the other segments would take long to complete
+        assert abort.wait(timeout=30)
+        stopped.append(start)
+
+    monkeypatch.setattr(ops, '_download_segment', download_segment)
+    r = requests.Response()
+    r.url = 'http://example.com/test.bin'
+    r.headers['content-length'] = '3000'
+    with pytest.raises(UrlOperationsRemoteError):
+        ops._segmented_download(
+            r, tmp_path / 'test.bin', nsegments=3, credential=None)
+    # running segments were told to stop
+    assert sorted(stopped) == [1000, 2000]
+    assert not (tmp_path / 'test.bin').exists()
+
+
+def test_segmented_download_requests(tmp_path, datalad_cfg, monkeypatch):
+    datalad_cfg.set('datalad.http.download-segments', '3', scope='global')
+    datalad_cfg.set('datalad.http.segment-threshold', '1000', scope='global')
+    payload = bytes(range(256)) * 100
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        # a server that supports range requests
+        def do_GET(self):
+            requested.append(self.headers.get('Range'))
+            start, end = 0, len(payload) - 1
+            if self.headers.get('Range'):
+                start, end = (
+                    int(i) for i in
+                    self.headers['Range'].split('=')[1].split('-'))
+                self.send_response(206)
+                self.send_header(
+                    'Content-Range', f'bytes {start}-{end}/{len(payload)}')
+            else:
+                self.send_response(200)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            self.wfile.write(payload[start:end + 1])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ops = HttpUrlOperations()
+    auths = []
+    orig_get_auth = ops._get_auth
+
+    def get_auth(credential):
+        auths.append(orig_get_auth(credential))
+        return auths[-1]
+
+    monkeypatch.setattr(ops, '_get_auth', get_auth)
+    try:
+        props = ops.download(
+            f'http://127.0.0.1:{server.server_port}/test.bin',
+            tmp_path / 'test.bin',
+            hash=['md5'],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert (tmp_path / 'test.bin').read_bytes() == payload
+    assert props['md5'] == hashlib.md5(payload).hexdigest()
+    # the initial request provides the first segment, only the other
+    # segments are requested separately
+    assert sorted(requested, key=str) == [
+        None, 'bytes=17068-25599', 'bytes=8534-17067']
+    # each segment thread uses its own authentication handler
+    assert len(set(map(id, auths))) == 3
+
+
+def test_resume_download(credman, webdav_credential, webdav_server,
+                         tmp_path, monkeypatch):
+    credman.set(**webdav_credential)
+    payload = bytes(range(256)) * 1000
+    (webdav_server.path / 'test.bin').write_bytes(payload)
+    url = f'{webdav_server.url}/test.bin'
+    dpath = tmp_path / 'test.bin'
+    ops = HttpUrlOperations()
+
+    # interrupt a download after the first chunk
+    nupdates = []
+
+    def interrupt(*args):
+        nupdates.append(args)
+        if len(nupdates) > 1:
+            raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(ops, '_progress_report_update', interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            ops.download(url, dpath, credential=webdav_credential['name'],
+                         resume=True)
+    part_path = tmp_path / 'test.bin.part'
+    assert not dpath.exists()
+    assert 0 < part_path.stat().st_size < len(payload)
+    # mangle the partial download to be able to tell that it is kept
+    prefix = bytes(part_path.stat().st_size)
+    part_path.write_bytes(prefix)
+
+    props = ops.download(url, dpath, credential=webdav_credential['name'],
+                         hash=['md5'], resume=True)
+    content = prefix + payload[len(prefix):]
+    assert dpath.read_bytes() == content
+    # the hash covers the partial download from before
+    assert props['md5'] == hashlib.md5(content).hexdigest()
+    assert not part_path.exists()
+    assert not (tmp_path / 'test.bin.part.json').exists()
+
+    # a changed target is downloaded completely
+    dpath.unlink()
+    part_path.write_bytes(prefix)
+    (tmp_path / 'test.bin.part.json').write_text(
+        f'{{"url": "{url}", "validator": "\\"outdated\\""}}')
+    ops.download(url, dpath, credential=webdav_credential['name'],
+                 resume=True)
+    assert dpath.read_bytes() == payload
+
+
+def test_stat_many(http_server, datalad_cfg):
+    # force more requests than workers
+    datalad_cfg.set('datalad.http.pool-maxsize', '2', scope='global')
+    for i in range(10):
+        (http_server.path / f'file{i}').write_text('x' * i)
+    urls = [f'{http_server.url}file{i}' for i in range(10)]
+    urls.insert(5, f'{http_server.url}nothere')
+    res = list(HttpUrlOperations().stat_many(urls))
+    assert [r[0] for r in res] == urls
+    assert [r[1]['content-length'] for r in res if isinstance(r[1], dict)] \
+        == list(range(10))
+    assert isinstance(res[5][1], UrlOperationsResourceUnknown)
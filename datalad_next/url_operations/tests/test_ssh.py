@@ -1,8 +1,19 @@
+import hashlib
 import io
+import os
 import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
 
 import pytest
 
+from datalad_next.shell import (
+    CompressedDownloadResponseGeneratorPosix,
+    ShellCommandExecutor,
+    shell,
+)
 from datalad_next.tests import (
     skip_if_on_windows,
 )
@@ -100,7 +111,7 @@ def test_ssh_url_upload_timeout(tmp_path, monkeypatch):
     payload_path = tmp_path / 'payload'
     payload_path.write_text(payload)
 
-    def mocked_ssh_shell_for(*args, **kwargs):
+    def mocked_acquire_shell(*args, **kwargs):
 
         class XShell:
             def __init__(self, *args, **kwargs):
@@ -115,8 +126,8 @@ def test_ssh_url_upload_timeout(tmp_path, monkeypatch):
         import datalad_next.url_operations.ssh
         mp_ctx.setattr(
             datalad_next.url_operations.ssh.SshUrlOperations,
-            'ssh_shell_for',
-            mocked_ssh_shell_for
+            '_acquire_shell',
+            mocked_acquire_shell
         )
         mp_ctx.setattr(datalad_next.url_operations.ssh, 'COPY_BUFSIZE', 1)
         with pytest.raises(TimeoutError):
@@ -175,3 +186,330 @@ def test_ssh_delete(sshserver):
     ops.delete(test_dir_url)
     with pytest.raises(UrlOperationsResourceUnknown):
         ops.delete(test_dir_url)
+
+
+@skip_if_on_windows
+def test_ssh_stat_many(sshserver, tmp_path):
+    ssh_url, ssh_local_path = sshserver
+
+    (ssh_local_path / 'file1.txt').write_text('content')
+    (ssh_local_path / 'file2.txt').write_text('more content')
+    urls = [f'{ssh_url}/file1.txt', f'{ssh_url}/nothere',
+            f'{ssh_url}/file2.txt']
+    ops = SshUrlOperations()
+    res = list(ops.stat_many(urls))
+    assert [r[0] for r in res] == urls
+    assert res[0][1] == {'content-length': 7}
+    assert isinstance(res[1][1], UrlOperationsResourceUnknown)
+    assert res[2][1] == {'content-length': 12}
+
+    res = list(ops.download_many(
+        [(url, tmp_path / f'dl{i}') for i, url in enumerate(urls)]))
+    assert isinstance(res[1][2], UrlOperationsResourceUnknown)
+    assert (tmp_path / 'dl2').read_text() == 'more content'
+
+
+def _use_local_shell(monkeypatch) -> list:
+    # run a local shell instead of connecting to a remote host, and
+    # report the arguments of all shells opened
+    import datalad_next.url_operations.ssh
+    opened = []
+
+    def local_shell(args):
+        opened.append(args)
+        return shell(['bash'])
+
+    monkeypatch.setattr(datalad_next.url_operations.ssh, 'shell', local_shell)
+    return opened
+
+
+@skip_if_on_windows
+def test_ssh_shell_pool(tmp_path, monkeypatch, datalad_cfg):
+    datalad_cfg.set('datalad.ssh.shells-per-host', '2', scope='global')
+    for i in range(8):
+        (tmp_path / f'file{i}').write_text('x' * i)
+
+    opened = _use_local_shell(monkeypatch)
+    ops = SshUrlOperations()
+    urls = [f'ssh://localhost{tmp_path}/file{i}' for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        res = list(executor.map(
+            lambda url: ops.download(url, Path(f'{urlparse(url).path}.dl')),
+            urls * 3,
+        ))
+    assert [r['content-length'] for r in res] == list(range(8)) * 3
+    assert (tmp_path / 'file5.dl').read_text() == 'xxxxx'
+    # concurrent operations share no more than the configured number of
+    # shells
+    assert 1 <= len(opened) <= 2
+    pool = ops.ssh_shells[('localhost',)]
+    assert len(pool.idle) == len(opened)
+
+    # a reserved shell is not handed out again, until released
+    with ops.reserved_shell_for(urls[0]) as ssh:
+        assert ssh not in pool.idle
+        assert ops.stat(urls[1]) == {'content-length': 1}
+    assert ssh in pool.idle
+
+    # errors keep the shell in the pool
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.stat(f'ssh://localhost{tmp_path}/nothere')
+    assert len(pool.idle) == len(opened)
+
+    # the shell for external use is shared, and not part of the pool
+    shared = ops.ssh_shell_for(urls[0])
+    assert ops.ssh_shell_for(urls[1]) is shared
+    assert shared not in pool.contexts
+    assert shared(f'cat {tmp_path}/file3').stdout == b'xxx'
+
+    ops.close_shell_for(urls[0])
+    assert ('localhost',) not in ops.ssh_shells
+    assert not pool.contexts
+    assert pool.shared is None
+    # and a new shell is opened on demand
+    assert ops.stat(urls[2]) == {'content-length': 2}
+    assert len(ops.ssh_shells[('localhost',)].contexts) == 1
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_stat_hash(tmp_path, monkeypatch):
+    _use_local_shell(monkeypatch)
+    (tmp_path / 'file').write_text('surprise!')
+    ops = SshUrlOperations()
+    url = f'ssh://localhost{tmp_path}/file'
+    assert ops.stat(url, hash=['sha256', 'md5']) == {
+        'content-length': 9,
+        'sha256': '71de4622cf536ed4aa9b65fc3701f4fc5a198ace2fa0bda234fd71924267f696',
+        'md5': ops.download(url, tmp_path / 'dl', hash=['md5'])['md5'],
+    }
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.stat(f'ssh://localhost{tmp_path}/missing', hash=['md5'])
+    with pytest.raises(ValueError):
+        ops.stat(url, hash=['bogus'])
+    # the shell is still usable
+    assert ops.stat(url) == {'content-length': 9}
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_compression(tmp_path, monkeypatch, datalad_cfg):
+    _use_local_shell(monkeypatch)
+    commands = []
+    orig_start = ShellCommandExecutor.start
+
+    def start(self, command, **kwargs):
+        commands.append((command, kwargs.get('response_generator')))
+        return orig_start(self, command, **kwargs)
+
+    monkeypatch.setattr(ShellCommandExecutor, 'start', start)
+
+    datalad_cfg.set('datalad.ssh.compression', 'gzip', scope='global')
+    content = b'0123456789abcdef' * 100000
+    (tmp_path / 'file').write_bytes(content)
+    ops = SshUrlOperations()
+    props = ops.download(
+        f'ssh://localhost{tmp_path}/file', tmp_path / 'dl', hash=['md5'])
+    assert (tmp_path / 'dl').read_bytes() == content
+    assert props == {
+        'content-length': len(content),
+        'md5': hashlib.md5(content).hexdigest(),
+    }
+    assert isinstance(
+        commands[-1][1], CompressedDownloadResponseGeneratorPosix)
+
+    props = ops.upload(
+        tmp_path / 'file', f'ssh://localhost{tmp_path}/sub/up', hash=['md5'])
+    assert (tmp_path / 'sub' / 'up').read_bytes() == content
+    assert props == {
+        'content-length': len(content),
+        'md5': hashlib.md5(content).hexdigest(),
+    }
+    assert 'gzip -dc' in commands[-1][0]
+
+    # the connection remains usable after errors
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.download(f'ssh://localhost{tmp_path}/missing', tmp_path / 'x')
+    # a destination underneath a file cannot be created
+    with pytest.raises(UrlOperationsRemoteError):
+        ops.upload(tmp_path / 'file', f'ssh://localhost{tmp_path}/file/up')
+    assert ops.stat(f'ssh://localhost{tmp_path}/file') == {
+        'content-length': len(content)}
+
+    # the configuration for a host takes precedence
+    datalad_cfg.set('datalad.ssh.localhost.compression', 'none',
+                    scope='global')
+    ops.download(f'ssh://localhost{tmp_path}/file', tmp_path / 'dl2')
+    assert (tmp_path / 'dl2').read_bytes() == content
+    assert not isinstance(
+        commands[-1][1], CompressedDownloadResponseGeneratorPosix)
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_delta_upload(tmp_path, monkeypatch, datalad_cfg):
+    _use_local_shell(monkeypatch)
+    sent = []
+    orig_start = ShellCommandExecutor.start
+
+    def start(self, command, stdin=None, **kwargs):
+        def count(chunks):
+            for chunk in chunks:
+                sent[-1] += len(chunk)
+                yield chunk
+
+        sent.append(0)
+        return orig_start(
+            self, command,
+            stdin=count(stdin) if stdin is not None else None,
+            **kwargs)
+
+    monkeypatch.setattr(ShellCommandExecutor, 'start', start)
+    datalad_cfg.set('datalad.ssh.delta-upload', 'true', scope='global')
+    ops = SshUrlOperations()
+    ops._delta_block_size = 4096
+    url = f'ssh://localhost{tmp_path}/target'
+
+    # no target yet, a complete upload
+    content = os.urandom(4096 * 10 + 100)
+    (tmp_path / 'source').write_bytes(content)
+    ops.upload(tmp_path / 'source', url)
+    assert (tmp_path / 'target').read_bytes() == content
+
+    # change a block in place, and append
+    content = content[:5000] + b'x' * 10 + content[5010:] + os.urandom(5000)
+    (tmp_path / 'source').write_bytes(content)
+    props = ops.upload(tmp_path / 'source', url, hash=['md5'])
+    assert props == {
+        'content-length': len(content),
+        'md5': hashlib.md5(content).hexdigest(),
+    }
+    assert (tmp_path / 'target').read_bytes() == content
+    # one changed block, the changed last block, and an appended block
+    assert sent[-1] < 4 * 4096
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['source', 'target']
+
+    # shrink
+    content = content[:4096 * 3 + 17]
+    (tmp_path / 'source').write_bytes(content)
+    ops.upload(tmp_path / 'source', url)
+    assert (tmp_path / 'target').read_bytes() == content
+    assert sent[-1] < 100
+
+    # the configuration for a host takes precedence
+    datalad_cfg.set('datalad.ssh.localhost.delta-upload', 'false',
+                    scope='global')
+    ops.upload(tmp_path / 'source', url)
+    assert sent[-1] == len(content)
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_download_single_command(tmp_path, monkeypatch):
+    _use_local_shell(monkeypatch)
+    commands = []
+    orig_start = ShellCommandExecutor.start
+
+    def start(self, command, **kwargs):
+        commands.append(command)
+        return orig_start(self, command, **kwargs)
+
+    monkeypatch.setattr(ShellCommandExecutor, 'start', start)
+
+    (tmp_path / 'empty').write_text('')
+    (tmp_path / 'file').write_text('surprise!')
+    ops = SshUrlOperations()
+    # the shell was opened with its own command
+    with ops.reserved_shell_for(f'ssh://localhost{tmp_path}'):
+        pass
+    commands.clear()
+
+    props = ops.download(
+        f'ssh://localhost{tmp_path}/file', tmp_path / 'dl', hash=['sha256'])
+    assert props == {
+        'content-length': 9,
+        'sha256': '71de4622cf536ed4aa9b65fc3701f4fc5a198ace2fa0bda234fd71924267f696',
+    }
+    assert (tmp_path / 'dl').read_text() == 'surprise!'
+    assert len(commands) == 1
+
+    props = ops.download(f'ssh://localhost{tmp_path}/empty', tmp_path / 'edl')
+    assert props == {'content-length': 0}
+    assert (tmp_path / 'edl').read_text() == ''
+
+    with pytest.raises(UrlOperationsResourceUnknown):
+        ops.download(f'ssh://localhost{tmp_path}/nothere', tmp_path / 'ndl')
+    # no download target is created for a missing file
+    assert not (tmp_path / 'ndl').exists()
+    assert len(commands) == 3
+    # and the shell remains usable
+    assert ops.stat(f'ssh://localhost{tmp_path}/file') == {
+        'content-length': 9}
+    assert len(ops.ssh_shells[('localhost',)].contexts) == 1
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_upload_unknown_size(tmp_path, monkeypatch):
+    opened = _use_local_shell(monkeypatch)
+    import datalad_next.url_operations.ssh
+    # send the data in many small chunks
+    monkeypatch.setattr(datalad_next.url_operations.ssh, 'COPY_BUFSIZE', 7)
+    payload = b'some\nbinary\x00payload\n0\n' * 10
+
+    class StdinBufferMock:
+        def __init__(self, byte_stream: bytes):
+            self.buffer = io.BytesIO(byte_stream)
+
+    ops = SshUrlOperations()
+    for i in range(3):
+        monkeypatch.setattr('sys.stdin', StdinBufferMock(payload[i:]))
+        props = ops.upload(None, f'ssh://localhost{tmp_path}/sub/up{i}')
+        assert props['content-length'] == len(payload) - i
+        assert (tmp_path / 'sub' / f'up{i}').read_bytes() == payload[i:]
+
+    # a failure to write the destination is reported
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setattr('sys.stdin', StdinBufferMock(payload))
+    with pytest.raises(UrlOperationsRemoteError):
+        ops.upload(None, f'ssh://localhost{tmp_path}/file/up')
+
+    # the shell was used for all uploads, and remains usable
+    assert len(opened) == 1
+    assert ops.stat(f'ssh://localhost{tmp_path}/sub/up0') == {
+        'content-length': len(payload)}
+    del ops
+
+
+@skip_if_on_windows
+def test_ssh_upload_timeout_shell(tmp_path, monkeypatch, datalad_cfg):
+    _use_local_shell(monkeypatch)
+    ops = SshUrlOperations()
+    ops._delta_block_size = 4096
+    url = f'ssh://localhost{tmp_path}/target'
+    # more than fits into the pipe to the shell
+    (tmp_path / 'source').write_bytes(os.urandom(1024 * 1024))
+    (tmp_path / 'target').write_bytes(b'')
+    orig_format_cmd = ops.format_cmd
+
+    def format_cmd(cmd, url):
+        # a remote command that stalls, without reading its input
+        if 'read -r op' in cmd:
+            return 'exec sleep 60'
+        return orig_format_cmd(cmd, url)
+
+    monkeypatch.setattr(
+        ops, '_get_upload_cmd', lambda *args: 'exec sleep 60')
+    monkeypatch.setattr(ops, 'format_cmd', format_cmd)
+    for delta in ('false', 'true'):
+        datalad_cfg.set('datalad.ssh.delta-upload', delta, scope='global')
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            ops.upload(tmp_path / 'source', url, timeout=1)
+        # the stalled shell was terminated, not waited for
+        assert time.time() - start < 30
+        assert not ops.ssh_shells[('localhost',)].contexts
+    # a new shell is opened for subsequent operations
+    assert ops.stat(f'ssh://localhost{tmp_path}/source') == {
+        'content-length': 1024 * 1024}
+    del ops
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import Dict
 from urllib.parse import urlparse
 
@@ -102,15 +103,38 @@ class DataladAuth(requests.auth.AuthBase):
     In addition to programmatic specification and automated lookup, manual
     credential entry using interactive prompts is also supported.
 
-    At present, this implementation is not thread-safe.
+    An ``auth_cache`` mapping can be shared across handler instances (e.g.,
+    all handlers used by one ``HttpUrlOperations`` instance). Authentication
+    that succeeded for an authentication realm is recorded in it, together
+    with the protection space it was used for: all paths at or below the
+    directory of the authenticated URL (see RFC 7617, section 2.2). Any
+    subsequent request to the same host and within a known protection space
+    is authenticated right away, saving the round-trip for the
+    authentication challenge. Requests to other paths on the same host
+    only receive credentials after an authentication challenge.
+
+    Credential lookup, interactive entry, and saving are performed by one
+    thread at a time, across all instances. The authenticated requests
+    themselves run concurrently. Any thread that waited on another to
+    authenticate for the same realm reuses the outcome from the
+    ``auth_cache``. Beyond that, an instance must not be used by
+    multiple threads.
     """
     _supported_auth_schemes = {
         'basic': 'user_password',
         'digest': 'user_password',
         'bearer': 'token',
     }
-
-    def __init__(self, cfg: ConfigManager, credential: str | None = None):
+    # serializes credential lookup and entry, and thereby any prompting
+    _credential_lock = threading.Lock()
+    # authentication in progress (with a looked-up credential) per
+    # auth cache and realm, guarded by `_credential_lock`
+    _pending_auth: Dict[tuple, threading.Event] = {}
+
+    def __init__(self,
+                 cfg: ConfigManager,
+                 credential: str | None = None,
+                 auth_cache: Dict | None = None):
         """
         Parameters
         ----------
@@ -118,10 +142,14 @@ class DataladAuth(requests.auth.AuthBase):
           Is passed to CredentialManager() as `cfg`-parameter.
         credential: str, optional
           Name of a particular credential to be used for any operations.
+        auth_cache: dict, optional
+          Mapping to record successful authentication in, and to look up
+          authentication for new requests from.
         """
         self._credman = CredentialManager(cfg)
         self._credential = credential
         self._entered_credential = None
+        self._auth_cache = auth_cache
 
     def save_entered_credential(self, suggested_name: str | None = None,
                                 context: str | None = None) -> Dict | None:
@@ -136,18 +164,25 @@ class DataladAuth(requests.auth.AuthBase):
         if self._entered_credential is None:
             # nothing to do
             return None
-        return self._credman.set(
-            name=None,
-            _lastused=True,
-            _suggested_name=suggested_name,
-            _context=context,
-            **self._entered_credential
-        )
+        with DataladAuth._credential_lock:
+            return self._credman.set(
+                name=None,
+                _lastused=True,
+                _suggested_name=suggested_name,
+                _context=context,
+                **self._entered_credential
+            )
 
     def __call__(self, r):
         # TODO support being called from multiple threads
         #self.init_per_thread_state()
 
+        if self._auth_cache is not None:
+            # reuse authentication that already worked for this
+            # protection space
+            auth = self._get_cached_auth(r.url)
+            if auth is not None:
+                r = auth(r)
         # register hooks to be executed from a response to this
         # request is available
         # Redirect: reset credentials to avoid leakage to other server
@@ -273,11 +308,57 @@ class DataladAuth(requests.auth.AuthBase):
             return r
         # which auth schemes does the server support?
         auth_schemes = parse_www_authenticate(r.headers['www-authenticate'])
+        realm = get_auth_realm(r.url, auth_schemes)
+        # wait for any other thread authenticating for this realm, and
+        # reuse its outcome
+        pending_key = None if self._auth_cache is None \
+            else (id(self._auth_cache),) \
+            + self._get_auth_target(r.url)[0] + (realm,)
+        done = None
+        while True:
+            with DataladAuth._credential_lock:
+                pending = DataladAuth._pending_auth.get(pending_key)
+                if pending is None:
+                    auth = self._get_reusable_auth(r, realm)
+                    if auth is None:
+                        auth = self._get_challenge_auth(r, auth_schemes)
+                        if auth is None:
+                            # we got nothing, leave things as they are
+                            return r
+                        if pending_key is not None:
+                            done = threading.Event()
+                            DataladAuth._pending_auth[pending_key] = done
+                    break
+            pending.wait()
+        # the lock is not held for the authenticated request itself
+        try:
+            return self._authenticated_rerequest(
+                r, auth, realm=realm, **kwargs)
+        finally:
+            if done is not None:
+                with DataladAuth._credential_lock:
+                    del DataladAuth._pending_auth[pending_key]
+                done.set()
+
+    def _get_reusable_auth(self, r, realm) -> requests.auth.AuthBase | None:
+        if self._auth_cache is None \
+                or 'Authorization' in r.request.headers:
+            return None
+        # another request authenticated for this realm already,
+        # possibly while this one was waiting for its turn
+        return self._get_realm_auth(r.url, realm)
+
+    def _get_challenge_auth(self, r, auth_schemes
+                            ) -> requests.auth.AuthBase | None:
+        """Return an authentication handler to meet a challenge
+
+        Returns ``None`` if no credential could be obtained. Must be called
+        with the ``_credential_lock`` held.
+        """
         ascheme, credname, cred = self._get_credential(r.url, auth_schemes)
 
         if cred is None or 'secret' not in cred:
-            # we got nothing, leave things as they are
-            return r
+            return None
 
         # TODO add safety check. if a credential somehow contains
         # information on its scope (i.e. only for github.com)
@@ -302,18 +383,11 @@ class DataladAuth(requests.auth.AuthBase):
                 ascheme = 'bearer'
 
         if ascheme == 'basic':
-            return self._authenticated_rerequest(
-                r,
-                requests.auth.HTTPBasicAuth(cred['user'], cred['secret']),
-                **kwargs)
+            return requests.auth.HTTPBasicAuth(cred['user'], cred['secret'])
         elif ascheme == 'digest':
-            return self._authenticated_rerequest(
-                r,
-                requests.auth.HTTPDigestAuth(cred['user'], cred['secret']),
-                **kwargs)
+            return requests.auth.HTTPDigestAuth(cred['user'], cred['secret'])
         elif ascheme == 'bearer':
-            return self._authenticated_rerequest(
-                r, HTTPBearerTokenAuth(cred['secret']), **kwargs)
+            return HTTPBearerTokenAuth(cred['secret'])
         else:
             raise NotImplementedError(
                 'Only unsupported HTTP auth schemes offered '
@@ -344,6 +418,7 @@ class DataladAuth(requests.auth.AuthBase):
             self,
             response: requests.models.Response,
             auth: requests.auth.AuthBase,
+            realm: str | None = None,
             **kwargs
     ) -> requests.models.Response:
         """Helper to rerun a request, but with authentication added"""
@@ -352,8 +427,58 @@ class DataladAuth(requests.auth.AuthBase):
         _r = response.connection.send(prep, **kwargs)
         _r.history.append(response)
         _r.request = prep
+        if self._auth_cache is not None and _r.status_code < 400:
+            self._cache_auth(prep.url, realm, auth)
         return _r
 
+    def _get_cached_auth(self, url: str) -> requests.auth.AuthBase | None:
+        assert self._auth_cache is not None
+        target, path = self._get_auth_target(url)
+        # use the most specific protection space
+        match = max(
+            (
+                (prefix, auth)
+                for key, (auth, prefixes) in list(self._auth_cache.items())
+                if key[:3] == target
+                for prefix in prefixes
+                if path.startswith(prefix)
+            ),
+            key=lambda m: len(m[0]),
+            default=None,
+        )
+        return match[1] if match else None
+
+    def _get_realm_auth(self,
+                        url: str,
+                        realm: str) -> requests.auth.AuthBase | None:
+        assert self._auth_cache is not None
+        target, _ = self._get_auth_target(url)
+        auth, _ = self._auth_cache.get(target + (realm,), (None, None))
+        return auth
+
+    def _cache_auth(
+            self,
+            url: str,
+            realm: str | None,
+            auth: requests.auth.AuthBase,
+    ) -> None:
+        assert self._auth_cache is not None
+        target, path = self._get_auth_target(url)
+        key = target + (realm,)
+        _, prefixes = self._auth_cache.get(key, (None, frozenset()))
+        # replace, rather than modify a record, other threads may be
+        # reading it
+        self._auth_cache[key] = (
+            auth,
+            prefixes | {path.rpartition('/')[0] + '/'},
+        )
+
+    def _get_auth_target(self, url: str) -> tuple[tuple, str]:
+        p = urlparse(url)
+        # an explicitly given credential must not be replaced by one
+        # that was found for another handler
+        return (self._credential, p.scheme, p.netloc), p.path or '/'
+
 
 def _get_renewed_request(r: requests.models.Response
                          ) -> requests.models.PreparedRequest:
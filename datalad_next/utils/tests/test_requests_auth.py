@@ -1,6 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
 import requests
 
-from ..requests_auth import DataladAuth
+from ..requests_auth import (
+    DataladAuth,
+    HTTPBearerTokenAuth,
+)
 
 
 def test_token_credential_uses_bearer_with_basic_only_challenge():
@@ -10,6 +16,7 @@ def test_token_credential_uses_bearer_with_basic_only_challenge():
     response.headers['www-authenticate'] = 'Basic realm=""'
 
     auth = DataladAuth.__new__(DataladAuth)
+    auth._auth_cache = None
 
     def get_credential(url, auth_schemes):
         assert url == response.url
@@ -34,3 +41,78 @@ def test_token_credential_uses_bearer_with_basic_only_challenge():
 
     assert rerequest['response'] is response
     assert renewed_request.headers['Authorization'] == 'Bearer sekrit'
+
+
+def test_auth_cache_protection_space():
+    cache = {}
+    auth = DataladAuth.__new__(DataladAuth)
+    auth._credential = None
+    auth._auth_cache = cache
+    basic = requests.auth.HTTPBasicAuth('user', 'pass')
+    auth._cache_auth('https://example.com/data/sub/file', 'realm1', basic)
+    # same directory, or below
+    assert auth._get_cached_auth('https://example.com/data/sub/other') \
+        is basic
+    assert auth._get_cached_auth('https://example.com/data/sub/d/f') \
+        is basic
+    # anywhere else on the host, or on another host
+    assert auth._get_cached_auth('https://example.com/data/file') is None
+    assert auth._get_cached_auth('https://example.com/') is None
+    assert auth._get_cached_auth('https://other.com/data/sub/file') is None
+    # the most specific protection space wins
+    token = HTTPBearerTokenAuth('sekrit')
+    auth._cache_auth('https://example.com/data/sub/d/f', 'realm2', token)
+    assert auth._get_cached_auth('https://example.com/data/sub/d/g') \
+        is token
+    assert auth._get_cached_auth('https://example.com/data/sub/f') is basic
+    # records are made per realm
+    auth._cache_auth('https://example.com/data/file', 'realm1', basic)
+    assert len(cache) == 2
+    assert auth._get_cached_auth('https://example.com/data/x') is basic
+    # not reused for an explicitly given credential
+    auth._credential = 'mycred'
+    assert auth._get_cached_auth('https://example.com/data/sub/d/g') \
+        is None
+
+
+def test_concurrent_authentication(monkeypatch):
+    cache = {}
+    lookups = []
+
+    def get_credential(self, url, auth_schemes):
+        lookups.append(url)
+        # give other threads a chance to race
+        time.sleep(0.1)
+        return 'basic', None, {'user': 'user', 'secret': 'sekrit'}
+
+    def authenticated_rerequest(self, response, auth, realm=None, **kwargs):
+        # the credential lock is not held for the request
+        assert DataladAuth._credential_lock.acquire(timeout=5)
+        DataladAuth._credential_lock.release()
+        # other threads must wait for the outcome, rather than looking up
+        # a credential themselves
+        time.sleep(0.1)
+        self._cache_auth(response.url, realm, auth)
+        return auth
+
+    monkeypatch.setattr(DataladAuth, '_get_credential', get_credential)
+    monkeypatch.setattr(
+        DataladAuth, '_authenticated_rerequest', authenticated_rerequest)
+
+    def request(i):
+        response = requests.Response()
+        response.status_code = 401
+        response.url = f'https://example.com/data/file{i}'
+        response.headers['www-authenticate'] = 'Basic realm="data"'
+        response.request = requests.Request(
+            'GET', response.url).prepare()
+        auth = DataladAuth.__new__(DataladAuth)
+        auth._credential = None
+        auth._auth_cache = cache
+        return auth.handle_401(response)
+
+    with ThreadPoolExecutor(4) as executor:
+        auths = list(executor.map(request, range(4)))
+    # one credential lookup, all requests use its outcome
+    assert len(lookups) == 1
+    assert all(a is auths[0] for a in auths)
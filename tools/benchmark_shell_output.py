@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Measure the throughput of command output received via a persistent shell
+
+The output of ``head -c <size> /dev/zero``, executed in a local ``bash``
+via :func:`datalad_next.shell.shell`, is read with a variable-length and a
+fixed-length response generator. This is the path that all data takes that
+is downloaded via SSH. This is repeated with output that consists of ``-``
+characters, which are also the start of the end-marker of variable-length
+responses. Reported are the achieved throughput and the CPU time spent in
+this process per GiB of output.
+
+Usage::
+
+    python tools/benchmark_shell_output.py [<size in MiB> [<repetitions>]]
+"""
+
+import sys
+import time
+
+from datalad_next.shell import (
+    FixedLengthResponseGeneratorPosix,
+    VariableLengthResponseGeneratorPosix,
+    shell,
+)
+
+
+COMMANDS = {
+    'zeros': 'head -c {size} /dev/zero',
+    'dashes': "head -c {size} /dev/zero | tr '\\0' -",
+}
+
+
+def run(ssh, size, rg_class, command):
+    rg = rg_class(ssh.stdout) \
+        if rg_class is VariableLengthResponseGeneratorPosix \
+        else rg_class(ssh.stdout, size)
+    start, cpu_start = time.perf_counter(), time.process_time()
+    received = 0
+    for chunk in ssh.start(
+            command.format(size=size), response_generator=rg):
+        received += len(chunk)
+    duration = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    assert received == size, (received, size)
+    assert rg.returncode == 0
+    return duration, cpu
+
+
+def main(size_mib=1024, repetitions=3):
+    size = size_mib * 1024 ** 2
+    with shell(['bash']) as ssh:
+        for label, command in COMMANDS.items():
+            for rg_class in (VariableLengthResponseGeneratorPosix,
+                             FixedLengthResponseGeneratorPosix):
+                duration, cpu = min(
+                    run(ssh, size, rg_class, command)
+                    for _ in range(repetitions))
+                print(
+                    f'{label:6s} {rg_class.__name__:40s} '
+                    f'{size_mib / duration:8.1f} MiB/s '
+                    f'{cpu / size * 1024 ** 3:6.2f} s CPU/GiB'
+                )
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:]))